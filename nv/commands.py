@@ -60,15 +60,27 @@ from NeoVintageous.nv.mappings import mappings_is_incomplete
 from NeoVintageous.nv.mappings import mappings_resolve
 from NeoVintageous.nv.marks import get_mark
 from NeoVintageous.nv.marks import set_mark
+from NeoVintageous.nv.plugin_sneak import sneak_jump_to_label
 from NeoVintageous.nv.polyfill import spell_select
 from NeoVintageous.nv.polyfill import split_by_newlines
 from NeoVintageous.nv.polyfill import toggle_side_bar
+from NeoVintageous.nv.profiler import STAGE_COMMAND_HANDLING
+from NeoVintageous.nv.profiler import STAGE_EVALUATE_STATE
+from NeoVintageous.nv.profiler import STAGE_MAPPING_RESOLUTION
+from NeoVintageous.nv.profiler import STAGE_SELECTION_FIX
+from NeoVintageous.nv.profiler import profile_clock
+from NeoVintageous.nv.profiler import profile_command
+from NeoVintageous.nv.profiler import profile_key_begin
+from NeoVintageous.nv.profiler import profile_key_end
+from NeoVintageous.nv.profiler import profile_stage
 from NeoVintageous.nv.rc import open_rc
 from NeoVintageous.nv.rc import reload_rc
+from NeoVintageous.nv.regexes import register_regex
 from NeoVintageous.nv.registers import registers_get_for_paste
 from NeoVintageous.nv.registers import registers_op_change
 from NeoVintageous.nv.registers import registers_op_delete
 from NeoVintageous.nv.registers import registers_op_yank
+from NeoVintageous.nv.search import add_incremental_search_highlighting
 from NeoVintageous.nv.search import add_search_highlighting
 from NeoVintageous.nv.search import clear_search_highlighting
 from NeoVintageous.nv.search import find_search_occurrences
@@ -76,6 +88,7 @@ from NeoVintageous.nv.search import find_word_search_occurrences
 from NeoVintageous.nv.search import get_search_occurrences
 from NeoVintageous.nv.search import process_search_pattern
 from NeoVintageous.nv.search import process_word_search_pattern
+from NeoVintageous.nv.search import show_search_count
 from NeoVintageous.nv.settings import append_sequence
 from NeoVintageous.nv.settings import get_action_count
 from NeoVintageous.nv.settings import get_count
@@ -114,6 +127,7 @@ from NeoVintageous.nv.settings import toggle_ctrl_keys
 from NeoVintageous.nv.settings import toggle_super_keys
 from NeoVintageous.nv.state import evaluate_state
 from NeoVintageous.nv.state import get_action
+from NeoVintageous.nv.state import get_definition_instantiations
 from NeoVintageous.nv.state import get_motion
 from NeoVintageous.nv.state import init_state
 from NeoVintageous.nv.state import is_runnable
@@ -122,6 +136,10 @@ from NeoVintageous.nv.state import reset_command_data
 from NeoVintageous.nv.state import set_action
 from NeoVintageous.nv.state import set_motion
 from NeoVintageous.nv.state import update_status_line
+from NeoVintageous.nv.trace import TRACE_KEY
+from NeoVintageous.nv.trace import TRACE_NOTATION
+from NeoVintageous.nv.trace import trace_enter
+from NeoVintageous.nv.trace import trace_exit
 from NeoVintageous.nv.ui import ui_bell
 from NeoVintageous.nv.ui import ui_highlight_yank
 from NeoVintageous.nv.ui import ui_highlight_yank_clear
@@ -499,16 +517,25 @@ class nv_feed_key(WindowCommand):
 
     def run(self, key, repeat_count=None, do_eval=True, check_user_mappings=True):
         start_time = time.time()
+        instantiations = get_definition_instantiations()
         _log.info('key evt: %s count=%s eval=%s mappings=%s', key, repeat_count, do_eval, check_user_mappings)  # noqa: E501
 
+        profile_key_begin()
+        trace_enter(self.window, TRACE_KEY, key, repeat_count, check_user_mappings)
+
         try:
             self._feed_key(key, repeat_count, do_eval, check_user_mappings)
         except Exception as e:
             print('NeoVintageous: An error occurred during key press handle:')
             _log.exception(str(e))
             clean_views()
+        finally:
+            trace_exit()
+
+        profile_key_end(key)
 
-        _log.info('key processed in %s secs', '{:.4f}'.format(time.time() - start_time))
+        _log.info('key processed in %s secs (%s definition instantiations)',
+                  '{:.4f}'.format(time.time() - start_time), get_definition_instantiations() - instantiations)
 
     def _feed_key(self, key, repeat_count=None, do_eval=True, check_user_mappings=True):
         # Args:
@@ -526,8 +553,13 @@ class nv_feed_key(WindowCommand):
 
         _log.debug('mode: %s', mode)
 
+        start = profile_clock()
         if _is_selection_malformed(self.view, mode):
             mode = _fix_malformed_selection(self.view, mode)
+        profile_stage(STAGE_SELECTION_FIX, start)
+
+        if sneak_jump_to_label(self.view, mode, key):
+            return
 
         if key.lower() == '<esc>':
             if mode == SELECT:
@@ -554,16 +586,20 @@ class nv_feed_key(WindowCommand):
             _log.debug('collecting input!')
 
             if motion and motion.accept_input:
+                profile_command(motion.__class__.__name__)
                 motion.accept(key)
                 # Processed motion needs to reserialised and stored.
                 set_motion(self.view, motion)
             else:
+                profile_command(action.__class__.__name__)
                 action.accept(key)
                 # Processed action needs to reserialised and stored.
                 set_action(self.view, action)
 
             if is_runnable(self.view) and do_eval:
+                start = profile_clock()
                 evaluate_state(self.view)
+                profile_stage(STAGE_EVALUATE_STATE, start)
                 reset_command_data(self.view)
 
             return
@@ -572,7 +608,11 @@ class nv_feed_key(WindowCommand):
         # (count), or " (register character), we need to skip the count handler
         # and go straight to resolving the mapping, otherwise it won't resolve.
         # See https://github.com/NeoVintageous/NeoVintageous/issues/434.
-        if not mappings_can_resolve(get_mode(self.view), get_partial_sequence(self.view) + key):
+        start = profile_clock()
+        can_resolve = mappings_can_resolve(get_mode(self.view), get_partial_sequence(self.view) + key)
+        profile_stage(STAGE_MAPPING_RESOLUTION, start)
+
+        if not can_resolve:
             if repeat_count:
                 set_action_count(self.view, str(repeat_count))
 
@@ -583,12 +623,17 @@ class nv_feed_key(WindowCommand):
 
         set_partial_sequence(self.view, get_partial_sequence(self.view) + key)
 
+        start = profile_clock()
+
         if check_user_mappings and mappings_is_incomplete(get_mode(self.view), get_partial_sequence(self.view)):
+            profile_stage(STAGE_MAPPING_RESOLUTION, start)
             _log.debug('found incomplete mapping')
 
             return
 
         command = mappings_resolve(self.view, check_user_mappings=check_user_mappings)
+        profile_stage(STAGE_MAPPING_RESOLUTION, start)
+        profile_command(command.lhs if isinstance(command, Mapping) else command.__class__.__name__)
 
         if isinstance(command, ViOpenNameSpace):
             return
@@ -704,6 +749,7 @@ class nv_feed_key(WindowCommand):
         #   ValueError: If too many motions.
         #   ValueError: If too many actions.
         #   ValueError: Unexpected command type.
+        start = profile_clock()
         _is_runnable = is_runnable(self.view)
 
         if isinstance(command, ViMotionDef):
@@ -734,8 +780,12 @@ class nv_feed_key(WindowCommand):
         if get_mode(self.view) == OPERATOR_PENDING:
             set_partial_sequence(self.view, '')
 
+        profile_stage(STAGE_COMMAND_HANDLING, start)
+
         if do_eval:
+            start = profile_clock()
             evaluate_state(self.view)
+            profile_stage(STAGE_EVALUATE_STATE, start)
 
     def _handle_count(self, key: str, repeat_count: int) -> bool:
         # NOTE motion/action counts need to be cast to strings because they need
@@ -793,6 +843,14 @@ def _fix_malformed_selection(view, mode: str) -> str:
 class nv_process_notation(WindowCommand):
 
     def run(self, keys, repeat_count=None, check_user_mappings=True):
+        trace_enter(self.window, TRACE_NOTATION, keys, repeat_count, check_user_mappings)
+
+        try:
+            self._process_notation(keys, repeat_count, check_user_mappings)
+        finally:
+            trace_exit()
+
+    def _process_notation(self, keys, repeat_count=None, check_user_mappings=True):
         # Args:
         #   keys (str): Key sequence to be run.
         #   repeat_count (int): Count to be applied when repeating through the
@@ -813,14 +871,13 @@ class nv_process_notation(WindowCommand):
         # This ensures that undoing will leave the caret where the  first
         # editing action started. For example, 'lldl' would skip 'll' in the
         # undo history, but store the full sequence for '.' to use.
+        # Keys are fed directly to the feed key command rather than through
+        # window.run_command(), which is a full command dispatch per key.
+        feed_key = nv_feed_key(self.window).run
+
         leading_motions = ''
         for key in tokenize_keys(keys):
-            self.window.run_command('nv_feed_key', {
-                'key': key,
-                'do_eval': False,
-                'repeat_count': repeat_count,
-                'check_user_mappings': check_user_mappings
-            })
+            feed_key(key, repeat_count=repeat_count, do_eval=False, check_user_mappings=check_user_mappings)
 
             if get_action(self.view):
                 # The last key press has caused an action to be primed. That
@@ -857,22 +914,31 @@ class nv_process_notation(WindowCommand):
         if not (get_motion(self.view) and not get_action(self.view)):
             with gluing_undo_groups(self.view):
                 try:
+                    # Consecutive INSERT mode characters are coalesced into one
+                    # insert command. Newlines and tabs are inserted on their
+                    # own so that auto indentation and tab translation apply.
+                    characters = []
+
                     for key in tokenize_keys(keys):
                         if key.lower() == '<esc>':
+                            self._insert(characters)
                             # XXX: We should pass a mode here?
                             enter_normal_mode(self.window)
                             continue
 
-                        elif get_mode(self.view) not in (INSERT, REPLACE):
-                            self.window.run_command('nv_feed_key', {
-                                'key': key,
-                                'repeat_count': repeat_count,
-                                'check_user_mappings': check_user_mappings
-                            })
+                        mode = get_mode(self.view)
+                        if mode not in (INSERT, REPLACE):
+                            self._insert(characters)
+                            feed_key(key, repeat_count=repeat_count, check_user_mappings=check_user_mappings)
                         else:
-                            self.window.run_command('insert', {
-                                'characters': translate_char(key)
-                            })
+                            char = translate_char(key)
+                            if mode == INSERT and char not in ('\n', '\t'):
+                                characters.append(char)
+                            else:
+                                self._insert(characters)
+                                self.window.run_command('insert', {'characters': char})
+
+                    self._insert(characters)
 
                     if not must_collect_input(self.view, get_motion(self.view), get_action(self.view)):
                         return
@@ -908,6 +974,11 @@ class nv_process_notation(WindowCommand):
 
         self._collect_input()
 
+    def _insert(self, characters: list) -> None:
+        if characters:
+            self.window.run_command('insert', {'characters': ''.join(characters)})
+            del characters[:]
+
     def _collect_input(self) -> None:
         try:
             motion = get_motion(self.view)
@@ -1001,6 +1072,11 @@ class nv_view(TextCommand):
     def _insert_action(self, edit, text: str):
         self.view.insert(edit, 0, text)
 
+    def _replace_regions_action(self, edit, regions: list):
+        # The regions are (begin, end, text) in order and not overlapping.
+        for begin, end, text in reversed(regions):
+            self.view.replace(edit, Region(begin, end), text)
+
     def _replace_line_action(self, edit, replacement: str):
         pt = next_non_blank(self.view, self.view.line(self.view.sel()[0].b).a)
         self.view.replace(edit, Region(pt, self.view.line(pt).b), replacement)
@@ -1397,7 +1473,7 @@ class nv_enter_normal_mode(TextCommand):
                     for s in reversed(list(self.view.sel())):
                         line = self.view.line(s.b)
                         line_str = self.view.substr(line)
-                        if re.match('^\\s+$', line_str):
+                        if line_str.isspace():
                             self.view.erase(edit, line)
                             col = self.view.rowcol(line.b)[1]
                             set_xpos(self.view, col + 1)
@@ -1942,7 +2018,7 @@ class nv_vi_big_d(TextCommand):
             for sel in self.view.sel():
                 line = self.view.line(sel.b)
                 if line.size() > 0:
-                    pt = self.view.find('^\\s*', line.begin()).end()
+                    pt = next_non_blank(self.view, line.begin())
                     new_sels.append(pt)
                     if pt != line.begin():
                         update = True
@@ -2636,8 +2712,7 @@ class nv_vi_z(TextCommand):
 
 class nv_vi_modify_numbers(TextCommand):
 
-    DIGIT_PAT = re.compile('(\\D+?)?(-)?(\\d+)(\\D+)?')
-    NUM_PAT = re.compile('\\d')
+    NUM_PAT = register_regex('commands.number', '\\d')
 
     def get_editable_data(self, pt):
         sign = -1 if (self.view.substr(pt - 1) == '-') else 1
@@ -3295,12 +3370,13 @@ class nv_vi_slash(TextCommand):
                               flags=flags,
                               times=count)
 
-        clear_search_highlighting(self.view)
-
         if not match:
+            clear_search_highlighting(self.view)
             return status_message('E486: Pattern not found: %s', pattern)
 
-        add_search_highlighting(self.view, find_search_occurrences(self.view, pattern, flags), [match])
+        # The highlighting is updated in place rather than cleared first, so
+        # only the regions that changed since the previous key are redrawn.
+        add_incremental_search_highlighting(self.view, pattern, flags, match)
         show_if_not_visible(self.view, match)
 
     def on_cancel(self):
@@ -3351,6 +3427,7 @@ class nv_vi_slash_impl(TextCommand):
         target = get_insertion_point_at_a(match)
         regions_transformer(self.view, f)
         add_search_highlighting(self.view, find_search_occurrences(self.view, pattern, flags))
+        show_search_count(self.view, pattern, flags)
 
 
 class nv_vi_l(TextCommand):
@@ -3950,6 +4027,7 @@ class nv_vi_star(TextCommand):
         jumplist_update(self.view)
 
         add_search_highlighting(self.view, find_word_search_occurrences(self.view, pattern, flags))
+        show_search_count(self.view, pattern, flags)
 
         if save:
             set_last_buffer_search(self.view, word)
@@ -3997,6 +4075,7 @@ class nv_vi_octothorp(TextCommand):
         jumplist_update(self.view)
 
         add_search_highlighting(self.view, find_word_search_occurrences(self.view, pattern, flags))
+        show_search_count(self.view, pattern, flags)
 
         if save:
             set_last_buffer_search(self.view, word)
@@ -4388,6 +4467,7 @@ class nv_vi_question_mark_impl(TextCommand):
         target = get_insertion_point_at_a(match)
         regions_transformer(self.view, f)
         add_search_highlighting(self.view, find_search_occurrences(self.view, pattern, flags))
+        show_search_count(self.view, pattern, flags)
 
 
 class nv_vi_question_mark(TextCommand):
@@ -4427,12 +4507,13 @@ class nv_vi_question_mark(TextCommand):
                                       flags=flags,
                                       times=count)
 
-        clear_search_highlighting(self.view)
-
         if not match:
+            clear_search_highlighting(self.view)
             return status_message('E486: Pattern not found: %s', pattern)
 
-        add_search_highlighting(self.view, find_search_occurrences(self.view, pattern, flags), [match])
+        # The highlighting is updated in place rather than cleared first, so
+        # only the regions that changed since the previous key are redrawn.
+        add_incremental_search_highlighting(self.view, pattern, flags, match)
         show_if_not_visible(self.view, match)
 
     def on_cancel(self):
@@ -19,12 +19,18 @@ from sublime import OP_EQUAL
 from sublime import OP_NOT_EQUAL
 from sublime_plugin import EventListener
 
+from NeoVintageous.nv.mappings import mappings_on_close
 from NeoVintageous.nv.modeline import do_modeline
 from NeoVintageous.nv.options import get_option
+from NeoVintageous.nv.plugin_sneak import sneak_on_close
+from NeoVintageous.nv.search import search_on_close
+from NeoVintageous.nv.search import search_on_post_text_command
+from NeoVintageous.nv.session import get_view_state
 from NeoVintageous.nv.session import session_on_close
 from NeoVintageous.nv.settings import get_mode
 from NeoVintageous.nv.settings import get_setting
 from NeoVintageous.nv.state import init_state
+from NeoVintageous.nv.trace import trace_text_command
 from NeoVintageous.nv.utils import fix_eol_cursor
 from NeoVintageous.nv.utils import is_view
 from NeoVintageous.nv.utils import update_xpos
@@ -53,9 +59,70 @@ def _check_query_context_value(value: bool, operator: int, operand: bool, match_
     return False
 
 
+def _get_query_context(view) -> tuple:
+    # Key bindings gated on the query contexts below are checked on every key
+    # press, so the answers are cached per view as a tuple of:
+    #
+    #   (command_mode, is_view, handle_keys)
+    #
+    # where handle_keys is the "handle_keys" setting resolved for the current
+    # mode. The cache is invalidated by set_mode() and by changes to the view
+    # settings that the answers depend on, see _QUERY_CONTEXT_SETTINGS.
+    state = get_view_state(view)
+    context = state.query_context
+    if context is None:
+        context = state.query_context = _create_query_context(view, state)
+
+    return context
+
+
+# The view settings that the query contexts depend on.
+_QUERY_CONTEXT_SETTINGS = ('command_mode', 'is_widget', '__vi_external_disable', 'vintageous_handle_keys')
+
+
+def _get_query_context_settings(settings) -> tuple:
+    return tuple(settings.get(name) for name in _QUERY_CONTEXT_SETTINGS)
+
+
+def _create_query_context(view, state) -> tuple:
+    settings = view.settings()
+
+    handle_keys = {}
+    raw_handle_keys = get_setting(view, 'handle_keys')
+    if raw_handle_keys:
+        # Keys for a specific mode are in the format "{mode}_{key}" e.g.
+        # "n_<C-w>", "v_<C-w>" meaning NORMAL, VISUAL respectively. No prefix
+        # implies all modes and takes precedence. See mode_to_char() for a
+        # list of valid mode prefixes.
+        cur_mode_char = mode_to_char(state.mode)
+        if cur_mode_char:
+            prefix = cur_mode_char + '_'
+            for key, value in raw_handle_keys.items():
+                if key.startswith(prefix):
+                    handle_keys[key[len(prefix):]] = bool(value)
+
+        for key, value in raw_handle_keys.items():
+            handle_keys[key] = bool(value)
+
+    query_context_settings = _get_query_context_settings(settings)
+
+    def _on_change() -> None:
+        # The hook is called for any setting change, most of which don't
+        # change the answers e.g. the settings written on every key press.
+        if _get_query_context_settings(settings) != query_context_settings:
+            state.query_context = None
+
+    settings.clear_on_change('NeoVintageous.events')
+    settings.add_on_change('NeoVintageous.events', _on_change)
+
+    return (bool(settings.get('command_mode')), is_view(view), handle_keys)
+
+
 def _is_command_mode(view, operator: int = OP_EQUAL, operand: bool = True, match_all: bool = False) -> bool:
+    command_mode, view_enabled, _ = _get_query_context(view)
+
     return _check_query_context_value(
-        (view.settings().get('command_mode') and is_view(view)),
+        (command_mode and view_enabled),
         operator,
         operand,
         match_all
@@ -66,8 +133,10 @@ def _is_insert_mode(view, operator: int, operand: bool, match_all: bool) -> bool
     # TODO This currently returns true for all non-normal modes e.g. Replace
     # mode. Fixing this will break things, for example <Esc> in replace mode
     # would break, a few things need to be reworked to fix this.
+    command_mode, view_enabled, _ = _get_query_context(view)
+
     return _check_query_context_value(
-        (not view.settings().get('command_mode') and is_view(view)),
+        (not command_mode and view_enabled),
         operator,
         operand,
         match_all
@@ -76,7 +145,7 @@ def _is_insert_mode(view, operator: int, operand: bool, match_all: bool) -> bool
 
 def _command_or_insert(view, operator: int, operand: bool, match_all: bool) -> bool:
     return _check_query_context_value(
-        is_view(view),
+        _get_query_context(view)[1],
         operator,
         operand,
         match_all
@@ -105,25 +174,8 @@ def _winaltkeys(view, operator: int, operand: str, match_all: bool) -> bool:
 
 
 def _handle_key(view, operator: int, operand: str, match_all: bool) -> bool:
-    handle_keys = get_setting(view, 'handle_keys')
-    if handle_keys:
-        try:
-            # Check if the key (no mode prefix; all modes) should be handled.
-            return bool(handle_keys[operand])
-        except KeyError:
-            # Check if the key should be handled only for a specific mode.
-            # The format is "{mode}_{key}" e.g. "n_<C-w>", "v_<C-w>"
-            # meaning NORMAL, VISUAL respectively. No prefix implies all
-            # modes. See mode_to_char() for a list of valid mode prefixes.
-            cur_mode_char = mode_to_char(get_mode(view))
-            if cur_mode_char:
-                try:
-                    return bool(handle_keys['%s_%s' % (cur_mode_char, operand)])
-                except KeyError:
-                    pass
-
     # By default all keys are handled.
-    return True
+    return _get_query_context(view)[2].get(operand, True)
 
 
 _query_contexts = {
@@ -165,6 +217,8 @@ class NeoVintageousEvents(EventListener):
         # The listener may return a (command, arguments) tuple to rewrite the
         # command, or None to run the command unmodified.
 
+        trace_text_command(view, command, args)
+
         if command == 'drag_select':
 
             # Updates the mode based on mouse events. For example, a double
@@ -214,6 +268,8 @@ class NeoVintageousEvents(EventListener):
                     if args['event']['button'] == 1:
                         update_xpos(view)
 
+        search_on_post_text_command(view)
+
     def on_load(self, view):
         if is_view(view) and get_option(view, 'modeline'):
             do_modeline(view)
@@ -226,6 +282,9 @@ class NeoVintageousEvents(EventListener):
 
     def on_close(self, view):
         session_on_close(view)
+        mappings_on_close(view)
+        search_on_close(view)
+        sneak_on_close(view)
 
     def on_activated(self, view):
 
@@ -16,23 +16,23 @@
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
 from functools import wraps
+from operator import itemgetter
 import inspect
 import logging
 import os
 import re
 import sys
+import time
 import traceback
 
-from sublime import DIALOG_CANCEL
-from sublime import DIALOG_YES
 from sublime import ENCODED_POSITION
 from sublime import FORCE_GROUP
 from sublime import LITERAL
 from sublime import Region
+from sublime import cache_path
 from sublime import find_resources
 from sublime import load_resource
 from sublime import set_timeout
-from sublime import yes_no_cancel_dialog
 
 from NeoVintageous.nv import shell
 from NeoVintageous.nv import variables
@@ -40,6 +40,7 @@ from NeoVintageous.nv.cmdline import CmdlineOutput
 from NeoVintageous.nv.ex.nodes import RangeNode
 from NeoVintageous.nv.ex.parser import parse_command_line
 from NeoVintageous.nv.ex.parser import resolve_address
+from NeoVintageous.nv.ex_routes import match_route
 from NeoVintageous.nv.goto import goto_line
 from NeoVintageous.nv.history import history
 from NeoVintageous.nv.mappings import mappings_add
@@ -47,23 +48,30 @@ from NeoVintageous.nv.mappings import mappings_remove
 from NeoVintageous.nv.options import get_option
 from NeoVintageous.nv.options import set_option
 from NeoVintageous.nv.options import toggle_option
+from NeoVintageous.nv.pattern import UnsupportedPatternError
+from NeoVintageous.nv.pattern import compile_pattern
+from NeoVintageous.nv.pattern import translate_pattern
 from NeoVintageous.nv.polyfill import is_file_read_only
 from NeoVintageous.nv.polyfill import is_view_read_only
+from NeoVintageous.nv.polyfill import iter_find_in_range
 from NeoVintageous.nv.polyfill import save
 from NeoVintageous.nv.polyfill import spell_add
 from NeoVintageous.nv.polyfill import spell_undo
 from NeoVintageous.nv.polyfill import view_find
-from NeoVintageous.nv.polyfill import view_find_all_in_range
 from NeoVintageous.nv.polyfill import view_to_region
+from NeoVintageous.nv.profiler import profiler_report
+from NeoVintageous.nv.profiler import profiler_reset
+from NeoVintageous.nv.profiler import profiler_start
+from NeoVintageous.nv.profiler import profiler_stop
 from NeoVintageous.nv.registers import registers_get_all
 from NeoVintageous.nv.registers import registers_set
 from NeoVintageous.nv.search import clear_search_highlighting
-from NeoVintageous.nv.search import is_smartcase_pattern
 from NeoVintageous.nv.settings import get_cmdline_cwd
 from NeoVintageous.nv.settings import get_ex_global_last_pattern
 from NeoVintageous.nv.settings import get_ex_shell_last_command
 from NeoVintageous.nv.settings import get_ex_substitute_last_pattern
 from NeoVintageous.nv.settings import get_ex_substitute_last_replacement
+from NeoVintageous.nv.settings import get_last_buffer_search
 from NeoVintageous.nv.settings import get_mode
 from NeoVintageous.nv.settings import get_setting
 from NeoVintageous.nv.settings import reset_setting
@@ -73,12 +81,14 @@ from NeoVintageous.nv.settings import set_ex_shell_last_command
 from NeoVintageous.nv.settings import set_ex_substitute_last_pattern
 from NeoVintageous.nv.settings import set_ex_substitute_last_replacement
 from NeoVintageous.nv.settings import set_setting
+from NeoVintageous.nv.trace import is_tracing
+from NeoVintageous.nv.trace import trace_start
+from NeoVintageous.nv.trace import trace_stop
 from NeoVintageous.nv.ui import ui_bell
-from NeoVintageous.nv.utils import adding_regions
 from NeoVintageous.nv.utils import has_dirty_buffers
 from NeoVintageous.nv.utils import has_newline_at_eof
+from NeoVintageous.nv.utils import hide_panel
 from NeoVintageous.nv.utils import next_non_blank
-from NeoVintageous.nv.utils import regions_transformer
 from NeoVintageous.nv.utils import row_at
 from NeoVintageous.nv.utils import set_selection
 from NeoVintageous.nv.vim import INSERT
@@ -254,11 +264,11 @@ def ex_delete(view, edit, register: str, line_range: RangeNode, global_lines=Non
     if r == Region(-1, -1):
         r = view.full_line(0)
 
-    rs = [r]
-
     # If :global called us, ignore the parsed range.
     if global_lines:
-        rs = [Region(a, b) for (a, b) in global_lines]
+        return _delete_global_lines(view, edit, register, global_lines)
+
+    rs = [r]
 
     def _select(view, regions: list, register: str) -> None:
         view.sel().clear()
@@ -276,10 +286,7 @@ def ex_delete(view, edit, register: str, line_range: RangeNode, global_lines=Non
             registers_set(view, register, [text])
 
     # Save stuff to be deleted in register
-    if global_lines:
-        _select(view, [Region(r.a, r.b - 1) for r in rs], register)
-    else:
-        _select(view, [Region(r.a, r.b) for r in rs], register)
+    _select(view, [Region(r.a, r.b) for r in rs], register)
 
     # Build regions to be selected after deletion
     deleted_so_far = 0
@@ -299,6 +306,44 @@ def ex_delete(view, edit, register: str, line_range: RangeNode, global_lines=Non
     enter_normal_mode(view)
 
 
+# Each edit of a view is an API call, so above this number of edits a change
+# is made by a single replace from the first to the last of the edits.
+_MAX_EDITS = 1000
+
+
+def _delete_global_lines(view, edit, register: str, lines: list) -> None:
+    # Deletes the lines marked by :global all at once. Consecutive lines are
+    # erased as a single region, and too many regions are replaced by the
+    # text between them.
+    spans = []  # type: list
+    for a, b in lines:
+        if spans and spans[-1][1] == a:
+            spans[-1][1] = b
+        else:
+            spans.append([a, b])
+
+    begin = spans[0][0]
+    text = view.substr(Region(begin, spans[-1][1]))
+
+    if register:
+        deleted = ''.join(text[a - begin:b - begin] for a, b in spans)
+        if not deleted.endswith('\n'):
+            deleted = deleted + '\n'
+
+        registers_set(view, register, [deleted])
+
+    if len(spans) > _MAX_EDITS:
+        kept = [text[b - begin:spans[i + 1][0] - begin] for i, (a, b) in enumerate(spans[:-1])]
+        view.replace(edit, Region(begin, spans[-1][1]), ''.join(kept))
+    else:
+        for a, b in reversed(spans):
+            view.erase(edit, Region(a, b))
+
+    # The cursor is put where the last of the lines was deleted.
+    set_selection(view, spans[-1][0] - sum(b - a for a, b in spans[:-1]))
+    enter_normal_mode(view)
+
+
 def ex_double_ampersand(view, edit, flags, count: int, line_range: RangeNode, **kwargs) -> None:
     ex_substitute(view=view, edit=edit, flags=flags, count=count, line_range=line_range, **kwargs)
 
@@ -376,16 +421,19 @@ def ex_file(view, **kwargs) -> None:
     status_message('%s' % msg)
 
 
-def ex_global(window, view, pattern: str, line_range: RangeNode, cmd='print', **kwargs) -> None:
+def ex_global(window, view, edit, pattern: str, line_range: RangeNode, cmd='print', **kwargs) -> None:
     if not pattern:
         pattern = get_ex_global_last_pattern()
         if not pattern:
             return status_message('E35: No previous regular expression')
 
-    cmd = parse_command_line(cmd).command
-    # The cooperates_with_global flag indicates if a command supports :global.
-    if not cmd.cooperates_with_global:
-        return status_message('command "%s" does not support :global', cmd.target)
+    try:
+        cmdline = parse_command_line(cmd)
+    except Exception as e:
+        return ui_bell(str(e))
+
+    if cmdline.command and cmdline.command.target == 'global':
+        return status_message('E147: Cannot do :global recursive')
 
     # The default line specifier for most commands is the cursor position, but
     # the commands :write and :global have the whole file (1,$) as default.
@@ -394,30 +442,165 @@ def ex_global(window, view, pattern: str, line_range: RangeNode, cmd='print', **
     else:
         region = line_range.resolve(view)
 
-    matches = view_find_all_in_range(view, pattern, region.a, region.b - 1)
-    if not matches:
-        return status_message('Pattern not found: %s', pattern)
-
-    matches = [view.full_line(r.begin()) for r in matches]
-    matches = [[r.a, r.b] for r in matches]
-
     # Handle `:g!`/`:global!`
     # The `!` is translated into `kwargs['forceit'] == True` and means we should
     # pick all lines _not_ matching the pattern.
-    if kwargs.get('forceit', False):
-        inv_pos = region.a
-        new_matches = []
-        for a, b in matches:
-            new_matches.append([inv_pos, a])
-            inv_pos = b
-        new_matches.append([inv_pos, region.b])
-        matches = new_matches
-
-    cmd.params['global_lines'] = matches
-
-    do_ex_command(window, cmd.target, cmd.params)
+    lines = _find_global_lines(view, pattern, region, kwargs.get('forceit', False))
+    if not lines:
+        return status_message('Pattern not found: %s', pattern)
+
     set_ex_global_last_pattern(pattern)
 
+    # The cooperates_with_global flag indicates if a command supports :global,
+    # in which case it is run once for all of the lines e.g. :g/pat/d deletes
+    # all of the lines at once, otherwise it is run for each of the lines.
+    if cmdline.command and cmdline.command.cooperates_with_global and cmdline.line_range.is_empty:
+        return _do_global_ex_cmd(window, view, edit, cmdline, global_lines=lines)
+
+    _do_global_ex_cmd_lines(window, view, edit, cmdline, cmd, lines)
+
+
+def _find_global_lines(view, pattern: str, region: Region, invert: bool) -> list:
+    # The matches are streamed and each line is only marked once, no matter
+    # how many times the pattern matches it. Returns a list of [a, b] of the
+    # full lines.
+    text = view.substr(region)
+    matches = []  # type: list
+    for match in iter_find_in_range(view, pattern, region.a, region.b - 1):
+        begin = match.begin() - region.a
+        if not matches or matches[-1][1] <= begin + region.a:
+            end = text.find('\n', begin) + 1 or len(text)
+            begin = text.rfind('\n', 0, begin) + 1
+            matches.append([region.a + begin, region.a + end])
+
+    if not invert or not matches:
+        return matches
+
+    lines = []
+    begin = 0
+    for a, b in matches + [[region.b, region.b]]:
+        while begin < a - region.a:
+            end = text.find('\n', begin) + 1 or len(text)
+            lines.append([region.a + begin, region.a + end])
+            begin = end
+
+        begin = b - region.a
+
+    return lines
+
+
+def _do_global_ex_cmd(window, view, edit, cmdline, **kwargs) -> None:
+    # Runs a parsed ex command within the edit of :global, so that all of the
+    # changes made by :global are a single undo step.
+    ex_cmd = _get_ex_cmd(cmdline.command.target)
+
+    args = dict(cmdline.command.params)
+    if 'forceit' not in args:
+        args['forceit'] = cmdline.command.forced
+
+    if 'edit' in inspect.signature(ex_cmd).parameters:
+        args['edit'] = edit
+
+    args.update(kwargs)
+
+    ex_cmd(window=window, view=view, line_range=cmdline.line_range, **args)
+
+
+# The lines marked by :global are tracked by regions, in groups of this number
+# of lines, because the marks of a group are reread after each change.
+_GLOBAL_MARKS_PER_GROUP = 100
+
+# The progress of :global runs on more than this number of lines is reported
+# after every _GLOBAL_PROGRESS_GROUPS groups of marks.
+_GLOBAL_PROGRESS_LINES = 10000
+_GLOBAL_PROGRESS_GROUPS = 10
+
+
+def _do_global_ex_cmd_lines(window, view, edit, cmdline, cmd: str, lines: list) -> None:
+    # Runs the command on each of the lines. First all of the lines are marked
+    # with regions, so that the marks move with the changes made by the
+    # command, and then, like in Vim, the mark of the first marked line is
+    # removed and the command is run with the cursor on that line, until there
+    # are no marks left. A marked line that is deleted is skipped, because its
+    # mark, the first character of the line, is empty. The lines moved by
+    # :move are erased and inserted again, so their marks are moved with them.
+    keys = []
+    for i in range(0, len(lines), _GLOBAL_MARKS_PER_GROUP):
+        key = '_nv_global_%d' % len(keys)
+        view.add_regions(key, [Region(a, a + 1) for a, b in lines[i:i + _GLOBAL_MARKS_PER_GROUP]])
+        keys.append(key)
+
+    def run() -> None:
+        if not cmdline.command or cmd[:1].isupper():
+            do_ex_cmdline(window, ':' + cmd)
+        else:
+            _do_global_ex_cmd(window, view, edit, cmdline)
+
+    is_move = bool(cmdline.command) and cmdline.command.target == 'move' and not cmd[:1].isupper()
+
+    try:
+        for index, key in enumerate(keys):
+            marks = view.get_regions(key)
+            change_count = view.change_count()
+            while True:
+                # The marks only need to be reread after the buffer changes.
+                if view.change_count() != change_count:
+                    marks = view.get_regions(key)
+                    change_count = view.change_count()
+
+                marks = [mark for mark in marks if not mark.empty()]
+                if not marks:
+                    break
+
+                mark = marks.pop(0)
+                view.add_regions(key, marks)
+                set_selection(view, view.line(mark.a).a)
+
+                moved = _find_global_moved_marks(view, cmdline, keys[index:]) if is_move else []
+                run()
+                if moved and view.change_count() != change_count:
+                    _add_global_moved_marks(view, moved)
+
+            view.erase_regions(key)
+
+            # The message of the command itself is kept after the last group.
+            done = index + 1
+            if len(lines) > _GLOBAL_PROGRESS_LINES and done % _GLOBAL_PROGRESS_GROUPS == 0 and done < len(keys):
+                status_message('global: %s of %s lines', done * _GLOBAL_MARKS_PER_GROUP, len(lines))
+    finally:
+        for key in keys:
+            view.erase_regions(key)
+
+
+def _find_global_moved_marks(view, cmdline, keys: list) -> list:
+    # Returns the marks of the lines that :move is about to move, as a list of
+    # (key, offset) tuples, where the offset is relative to the moved lines.
+    # The mark of the current line has already been removed, so there is
+    # nothing to find when only the current line is moved e.g. :g/^/m0.
+    try:
+        source = cmdline.line_range.resolve(view)
+    except ValueError:
+        return []
+
+    if source == view.full_line(view.sel()[0].b):
+        return []
+
+    moved = []
+    for key in keys:
+        for mark in view.get_regions(key):
+            if not mark.empty() and source.contains(mark):
+                moved.append((key, mark.a - source.a))
+
+    return moved
+
+
+def _add_global_moved_marks(view, moved: list) -> None:
+    # :move leaves the cursor at the start of the moved lines.
+    pt = view.sel()[0].begin()
+    for key, offset in moved:
+        marks = view.get_regions(key) + [Region(pt + offset, pt + offset + 1)]
+        view.add_regions(key, sorted(marks, key=Region.begin))
+
 
 _help_tags_cache = {}  # type: dict
 
@@ -634,6 +817,42 @@ def ex_nohlsearch(view, **kwargs) -> None:
     clear_search_highlighting(view)
 
 
+def ex_nvprofile(window, action: str = 'report', **kwargs) -> None:
+    if action not in ('start', 'stop', 'reset', 'report'):
+        return status_message('E475: Invalid argument: %s' % action)
+
+    if action == 'start':
+        profiler_start()
+        status_message('profiler started')
+    elif action == 'stop':
+        profiler_stop()
+        status_message('profiler stopped')
+    elif action == 'reset':
+        profiler_reset()
+        status_message('profiler reset')
+    elif action == 'report':
+        output = CmdlineOutput(window)
+        output.write(profiler_report())
+        output.show()
+
+
+def ex_nvtrace(view, action: str = None, file_name: str = None, **kwargs) -> None:
+    if action == 'start':
+        trace_start(view)
+        status_message('trace started')
+    elif action == 'stop':
+        if not is_tracing():
+            return status_message('no trace is being recorded')
+
+        if not file_name:
+            file_name = os.path.join(cache_path(), 'NeoVintageous', 'traces', time.strftime('%Y%m%d-%H%M%S') + '.jsonl')  # noqa: E501
+
+        count = trace_stop(os.path.expanduser(file_name))
+        status_message('trace saved to %s (%d events)' % (file_name, count))
+    else:
+        status_message('trace is %s' % ('being recorded' if is_tracing() else 'not being recorded'))
+
+
 def ex_noremap(lhs: str = None, rhs: str = None, **kwargs) -> None:
     if not (lhs and rhs):
         return status_message('Listing key mappings is not implemented')
@@ -886,22 +1105,168 @@ def ex_snoremap(lhs: str = None, rhs: str = None, **kwargs) -> None:
     mappings_add(SELECT, lhs, rhs)
 
 
-def ex_sort(view, options: str = '', **kwargs) -> None:
-    case_sensitive = True if 'i' not in options else False
+def ex_sort(view, edit, line_range: RangeNode, options: str = '', pattern: str = None,
+            forceit: bool = False, **kwargs) -> None:
+    invalid = set(options) - set('bfinorux')
+    if invalid:
+        return status_message('E475: Invalid argument: %s' % ''.join(sorted(invalid)))
 
-    view.run_command('mark_undo_groups_for_gluing')
-    view.run_command('sort_lines', {'case_sensitive': case_sensitive})
+    number_options = [option for option in options if option in 'bfnox']
+    if len(number_options) > 1:
+        return status_message('E474: Invalid argument')
 
-    if 'u' in options:
-        view.run_command('permute_lines', {'operation': 'unique'})
+    regex = None
+    if pattern is not None:
+        # An empty pattern means the last search pattern.
+        if not pattern:
+            pattern = get_last_buffer_search(view)
+            if not pattern:
+                return status_message('E35: No previous regular expression')
+
+        try:
+            search_pattern, search_flags = translate_pattern(
+                pattern,
+                bool(get_option(view, 'ignorecase')),
+                bool(get_option(view, 'smartcase')),
+                bool(get_option(view, 'magic')),
+                python=True
+            )
+
+            regex = compile_pattern(search_pattern, search_flags)
+        except UnsupportedPatternError as e:
+            return status_message(str(e))
+        except Exception as e:
+            return status_message('[regex error]: {} ... in pattern {}'.format(str(e), pattern))
+
+    # The default line specifier for :sort is the whole file (1,$).
+    if line_range.is_empty:
+        region = view_to_region(view)
+    else:
+        region = line_range.resolve(view)
+
+    text = view.substr(region)
+    eol = '\n' if text.endswith('\n') else ''
+    lines = text[:-1].split('\n') if eol else text.split('\n')
+    count = len(lines)
 
-    def f(view, s: Region) -> Region:
-        return Region(next_non_blank(view, s.begin()))
+    lines = _sort_lines(lines, options, number_options[0] if number_options else None, regex, forceit)
 
-    regions_transformer(view, f)
+    new_text = '\n'.join(lines) + eol
+    if new_text != text:
+        view.replace(edit, region, new_text)
+
+    set_selection(view, next_non_blank(view, region.begin()))
     enter_normal_mode(view)
     view.show(view.sel()[-1], False)
-    view.run_command('glue_marked_undo_groups')
+
+    deleted = count - len(lines)
+    if deleted > _REPORT:
+        status_message('%d fewer lines' % deleted)
+
+
+def _sort_lines(lines: list, options: str, number_option: str, regex, reverse: bool) -> list:
+    ignorecase = 'i' in options
+
+    # The keys are extracted in one pass over the lines and then the lines are
+    # sorted on the precomputed keys. The sort is stable, so lines with equal
+    # keys keep their order.
+    keys = lines
+    if regex:
+        keys = list(map(_sort_pattern_text(regex, 'r' in options), keys))
+
+    if number_option:
+        keys = list(map(_SORT_NUMBER_KEYS[number_option], keys))
+    elif ignorecase:
+        keys = list(map(str.lower, keys))
+
+    if keys is lines:
+        lines = sorted(lines)
+    else:
+        lines = [line for key, line in sorted(zip(keys, lines), key=itemgetter(0))]
+
+    if reverse:
+        lines.reverse()
+
+    # Only keep the first of a sequence of identical lines, ignoring case when
+    # the "i" option is given, regardless of the keys that they are sorted on.
+    if 'u' in options:
+        unique = []
+        last = None
+        for line in lines:
+            key = line.lower() if ignorecase else line
+            if key != last:
+                unique.append(line)
+                last = key
+
+        lines = unique
+
+    return lines
+
+
+def _sort_pattern_text(regex, use_match: bool):
+    # With a pattern the lines are sorted on the text after the match, or on
+    # the matched text with the "r" option. Lines without a match sort on an
+    # empty text, so they keep their order before the lines that match.
+    search = regex.search
+
+    def text(line: str) -> str:
+        match = search(line)
+        if match is None:
+            return ''
+
+        return match.group() if use_match else line[match.end():]
+
+    return text
+
+
+def _sort_number_key(regex, to_int):
+    # Sort on the first number in the text. One leading "-" is included in the
+    # number. Lines without a number sort before the lines with one.
+    search = regex.search
+
+    def key(text: str) -> tuple:
+        match = search(text)
+        if match is None:
+            return (False, 0)
+
+        value = to_int(match.group(1))
+
+        return (True, -value if match.group().startswith('-') else value)
+
+    return key
+
+
+def _octal_to_int(digits: str) -> int:
+    # A number is only octal when it starts with a zero, the same as Vim.
+    if digits[0] == '0' and '8' not in digits and '9' not in digits:
+        return int(digits, 8)
+
+    return int(digits)
+
+
+_SORT_FLOAT_PATTERN = re.compile(
+    '\\s*\\+?\\s*([-+]?(?:\\d+\\.?\\d*(?:[eE][-+]?\\d+)?|\\.\\d+(?:[eE][-+]?\\d+)?|inf(?:inity)?))',
+    re.IGNORECASE
+)
+
+
+def _sort_float_key(text: str) -> float:
+    # The float is read from the start of the text, the same as str2float(), so
+    # any other text is zero. Empty lines sort before any number.
+    match = _SORT_FLOAT_PATTERN.match(text)
+    if match is None:
+        return float('-inf') if not text.strip() else 0.0
+
+    return float(match.group(1))
+
+
+_SORT_NUMBER_KEYS = {
+    'b': _sort_number_key(re.compile('-?(?:0[bB](?=[01]))?([01]+)'), lambda digits: int(digits, 2)),
+    'f': _sort_float_key,
+    'n': _sort_number_key(re.compile('-?(\\d+)'), int),
+    'o': _sort_number_key(re.compile('-?(\\d+)'), _octal_to_int),
+    'x': _sort_number_key(re.compile('-?(?:0[xX](?=[0-9a-fA-F]))?([0-9a-fA-F]+)'), lambda digits: int(digits, 16)),
+}
 
 
 def ex_split(window, file: str = None, **kwargs) -> None:
@@ -934,19 +1299,25 @@ def ex_substitute(view, edit, line_range: RangeNode,
     if replacement is None:
         return status_message('No substitute replacement string')
 
+    # A "~" in the pattern matches the previous substitute string.
+    last_replacement = get_ex_substitute_last_replacement() if '~' in pattern else None
+
     set_ex_substitute_last_pattern(pattern)
     set_ex_substitute_last_replacement(replacement)
 
-    computed_flags = 0
-
-    computed_flags |= re.MULTILINE
-
-    if (get_option(view, 'ignorecase') or 'i' in flags) and 'I' not in flags:
-        if not is_smartcase_pattern(view, pattern):
-            computed_flags |= re.IGNORECASE
-
     try:
-        compiled_pattern = re.compile(pattern, flags=computed_flags)
+        search_pattern, search_flags = translate_pattern(
+            pattern,
+            bool((get_option(view, 'ignorecase') or 'i' in flags) and 'I' not in flags),
+            bool(get_option(view, 'smartcase')),
+            bool(get_option(view, 'magic')),
+            last_replacement,
+            python=True
+        )
+
+        compiled_pattern = compile_pattern(search_pattern, search_flags)
+    except UnsupportedPatternError as e:
+        return status_message(str(e))
     except Exception as e:
         return status_message('[regex error]: {} ... in pattern {}'.format(str(e), pattern))
 
@@ -957,74 +1328,253 @@ def ex_substitute(view, edit, line_range: RangeNode,
     replace_count = 0 if (flags and 'g' in flags) else 1
 
     if 'c' in flags:
+        matches = _find_substitute_matches(view, target_region, compiled_pattern, replacement, replace_count)
+        if not matches:
+            return status_message('E486: Pattern not found: {}'.format(pattern))
 
-        def _replace_confirming(view, edit, pattern: str, compiled_pattern,
-                                replacement: str, replace_count: int, target_region: Region) -> None:
+        return _SubstituteConfirm(view, matches, replacement).prompt()
 
-            last_row = row_at(view, target_region.b - 1)
-            start = target_region.begin()
+    substitutions, lines, last_line = _substitute(
+        view, edit, target_region, compiled_pattern, replacement, replace_count)
+    if not substitutions:
+        return status_message('E486: Pattern not found: {}'.format(pattern))
 
-            while True:
-                if start >= view.size():
-                    break
+    # Put cursor on first non-whitespace char of the last substituted line.
+    set_selection(view, next_non_blank(view, last_line))
 
-                match = view.find(pattern, start)
+    if substitutions > _REPORT:
+        status_message(_format_substitute_report(substitutions, lines))
 
-                # no match or match out of range -- stop
-                if (match == Region(-1)) or (row_at(view, match.a) > last_row):
-                    view.show(view.sel()[0].begin())
-                    return
+    enter_normal_mode(view)
 
-                size_before = view.size()
 
-                with adding_regions(view, 's_confirm', [match], 'comment'):
-                    view.show(match.a, True)
-                    response = yes_no_cancel_dialog('Replace with "%s"?' % replacement)
-                    if response == DIALOG_CANCEL:
-                        break
+# The number of substitutions or lines above which they are reported, the same
+# as the default value of the Vim 'report' option.
+_REPORT = 2
 
-                    if response == DIALOG_YES:
-                        text = view.substr(match)
-                        substituted = re.sub(compiled_pattern, replacement, text, count=replace_count)
-                        view.replace(edit, match, substituted)
 
-                start = match.b + (view.size() - size_before) + 1
+def _format_substitute_report(substitutions: int, lines: int) -> str:
+    return '%d substitution%s on %d line%s' % (
+        substitutions, '' if substitutions == 1 else 's', lines, '' if lines == 1 else 's')
 
-        return _replace_confirming(view, edit, pattern, compiled_pattern, replacement, replace_count, target_region)
 
-    lines = view.lines(target_region)
-    if not lines:
-        return status_message('E486: Pattern not found: {}'.format(pattern))
+def _iter_substitute_lines(regex, text: str):
+    # Yields the (begin, end) of the lines of a text of whole lines that have
+    # a match, in one pass over the text. The lines are substituted on their
+    # own, as if the text were split into lines, so a match that runs into the
+    # next line may not be a match of the line.
+    size = len(text)
+    last_eol = size - 1 if text.endswith('\n') else size
+    pos = 0
+    while pos <= last_eol:
+        match = regex.search(text, pos)
+        if not match or match.start() > last_eol:
+            return
 
-    new_lines = []
-    dirty = False
-    for line in lines:
-        line_str = view.substr(line)
-        new_line_str = re.sub(compiled_pattern, replacement, line_str, count=replace_count)
-        new_lines.append(new_line_str)
-        if new_line_str != line_str:
-            dirty = True
+        begin = text.rfind('\n', 0, match.start()) + 1
+        end = text.find('\n', match.start())
+        if end == -1:
+            end = size
 
-    new_region_text = '\n'.join(new_lines)
-    if view.size() > line.end():
-        new_region_text += '\n'
+        yield begin, end
 
-    if not dirty:
-        return status_message('E486: Pattern not found: {}'.format(pattern))
+        pos = end + 1
 
-    # Reposition cursor before replacing target region so that the cursor
-    # will auto adjust in sync with the replacement.
-    set_selection(view, line.begin())
 
-    view.replace(edit, target_region, new_region_text)
+def _substitute(view, edit, region: Region, regex, replacement: str, replace_count: int) -> tuple:
+    # Substitutes the matches in the region of whole lines, in one pass over
+    # the text of the region. Only the changed lines are replaced, in reverse order so the
+    # lines before them don't move, and consecutive changed lines are merged
+    # into a single replace. When there are too many spans of changed lines
+    # to replace one by one, they are all merged into one span from the first
+    # to the last changed line.
+    #
+    # Returns a tuple of the number of substitutions, the number of lines
+    # with substitutions, and the start point of the last of those lines.
+    text = view.substr(region)
+
+    substitutions = 0
+    lines = 0
+    last_line = 0
+    delta = 0
+
+    # The new text of the changed lines, and the unchanged text between them.
+    # The spans are (begin, end, index, index_end) tuples, where the parts of
+    # the span are parts[index:index_end].
+    parts = []  # type: list
+    spans = []  # type: list
+    span_begin = span_end = span_index = -1
+    merge_all = False
+
+    for begin, end in _iter_substitute_lines(regex, text):
+        line = text[begin:end]
+        new_line, count = regex.subn(replacement, line, replace_count)
+        if not count:
+            continue
 
-    # TODO Refactor set position cursor after operation into reusable api.
-    # Put cursor on first non-whitespace char of current line.
-    line = view.line(view.sel()[0].b)
-    if line.size() > 0:
-        set_selection(view, view.find('^\\s*', line.begin()).end())
+        substitutions += count
+        lines += 1
+        last_line = begin + delta
 
-    enter_normal_mode(view)
+        if new_line == line:
+            continue
+
+        delta += len(new_line) - len(line)
+
+        if span_index != -1 and not merge_all and begin > span_end + 1:
+            spans.append((span_begin, span_end, span_index, len(parts)))
+            span_index = -1
+
+            if len(spans) > _MAX_EDITS:
+                span_begin = spans[0][0]
+                span_index = 0
+                parts = _join_substitute_spans(text, spans, parts)
+                spans = []
+                merge_all = True
+
+        if span_index == -1:
+            span_begin = begin
+            span_index = len(parts)
+        else:
+            parts.append(text[span_end:begin])
+
+        parts.append(new_line)
+        span_end = end
+
+    if span_index != -1:
+        spans.append((span_begin, span_end, span_index, len(parts)))
+
+    for begin, end, index, index_end in reversed(spans):
+        view.replace(edit, Region(region.a + begin, region.a + end), ''.join(parts[index:index_end]))
+
+    return substitutions, lines, region.a + last_line
+
+
+def _join_substitute_spans(text: str, spans: list, parts: list) -> list:
+    # Returns the parts of the spans, and the text between them.
+    joined = []
+    prev_end = spans[0][0]
+    for begin, end, index, index_end in spans:
+        joined.append(text[prev_end:begin])
+        joined.extend(parts[index:index_end])
+        prev_end = end
+
+    return joined
+
+
+def _find_substitute_matches(view, region: Region, regex, replacement: str, replace_count: int) -> list:
+    # Returns the (begin, end, replacement, line) of the matches to substitute
+    # in the region of whole lines, where line is the start of the line.
+    text = view.substr(region)
+    matches = []
+    for begin, end in _iter_substitute_lines(regex, text):
+        line = region.a + begin
+        for match in regex.finditer(text[begin:end]):
+            matches.append((line + match.start(), line + match.end(), match.expand(replacement), line))
+            if replace_count:
+                break
+
+    return matches
+
+
+class _SubstituteConfirm():
+
+    # Asks to confirm each of the matches to substitute, see :s_c. The matches
+    # are found once, and the answers offset the remaining matches by the
+    # change in size of the substituted matches:
+    #
+    #   y   Substitute this match.
+    #   l   Substitute this match and then quit ("last").
+    #   n   Skip this match.
+    #   a   Substitute this and all remaining matches.
+    #   q   Quit substituting, also <Esc>.
+
+    def __init__(self, view, matches: list, replacement: str):
+        self.view = view
+        self.window = view.window()
+        self.matches = matches
+        self.replacement = replacement
+        self.index = 0
+        self.offset = 0
+        self.substitutions = 0
+        self.lines = 0
+        self.line = -1
+        self.line_offset = 0
+        self.waiting = False
+
+    def prompt(self) -> None:
+        if self.index >= len(self.matches):
+            return self.finish()
+
+        begin, end = self.matches[self.index][:2]
+        region = Region(begin + self.offset, end + self.offset)
+        self.view.add_regions('s_confirm', [region], 'comment')
+        self.view.show(region.a, True)
+
+        self.waiting = True
+        panel = self.window.show_input_panel(
+            'replace with %s (y/n/a/q/l)?' % self.replacement, '', None, self.on_change, self.on_cancel)
+        panel.set_name('Command-line mode')
+
+    def on_change(self, text: str) -> None:
+        key = text[-1:]
+        if self.waiting and key in ('y', 'l', 'n', 'a', 'q'):
+            # Hiding the panel cancels it, which isn't an answer.
+            self.waiting = False
+            hide_panel(self.window)
+            self.answer(key)
+
+    def on_cancel(self) -> None:
+        if self.waiting:
+            self.waiting = False
+            self.answer('q')
+
+    def answer(self, key: str) -> None:
+        if key == 'y':
+            self.substitute(self.matches[self.index:self.index + 1])
+            self.index += 1
+            self.prompt()
+        elif key == 'l':
+            self.substitute(self.matches[self.index:self.index + 1])
+            self.finish()
+        elif key == 'n':
+            self.index += 1
+            self.prompt()
+        elif key == 'a':
+            self.substitute(self.matches[self.index:])
+            self.finish()
+        else:
+            self.finish()
+
+    def substitute(self, matches: list) -> None:
+        # The matches are replaced in a single edit, in reverse order, so they
+        # are only offset by the previous substitutions.
+        offset = self.offset
+        regions = []
+        for begin, end, replacement, line in matches:
+            if line != self.line:
+                self.line = line
+                self.line_offset = self.offset
+                self.lines += 1
+
+            regions.append((begin + offset, end + offset, replacement))
+            self.offset += len(replacement) - (end - begin)
+            self.substitutions += 1
+
+        self.view.run_command('nv_view', {'action': 'replace_regions', 'regions': regions})
+
+    def finish(self) -> None:
+        self.index = len(self.matches)
+        self.view.erase_regions('s_confirm')
+
+        if self.substitutions:
+            # Put cursor on first non-whitespace char of the last substituted line.
+            set_selection(self.view, next_non_blank(self.view, self.line + self.line_offset))
+
+            if self.substitutions > _REPORT:
+                status_message(_format_substitute_report(self.substitutions, self.lines))
+
+        enter_normal_mode(self.view)
 
 
 def ex_sunmap(lhs: str, **kwargs) -> None:
@@ -1459,6 +2009,21 @@ def _parse_user_cmdline_split(line: str):
     return command
 
 
+def _is_user_cmdline(line: str) -> bool:
+    # User commands begin with an uppercase letter, except for the ex commands
+    # that do too e.g. :NVProfile.
+    if not line[1].isupper():
+        return False
+
+    route = match_route(line, 1)
+    if route:
+        end = route[0].end()
+
+        return line[end:end + 1].isalpha()
+
+    return True
+
+
 def do_ex_cmdline(window, line: str) -> None:
     # Execute ex command as a string (what a user would enter at the cmdline).
     #
@@ -1500,7 +2065,7 @@ def do_ex_cmdline(window, line: str) -> None:
     if line[0] != ':':
         raise RuntimeError('cmdline must start with a colon')
 
-    if line[1].isupper():
+    if _is_user_cmdline(line):
         # Run user command. User commands begin with an uppercase letter.
         user_commands = _parse_user_cmdline(line)
         if not user_commands:
@@ -16,6 +16,12 @@
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
 from collections import OrderedDict
+import re
+
+try:
+    from re import _parser as sre_parse  # type: ignore
+except ImportError:
+    import sre_parse  # type: ignore
 
 from NeoVintageous.nv.ex.tokens import TokenCommand
 
@@ -312,6 +318,18 @@ def _ex_route_nnoremap(state) -> TokenCommand:
     return _create_map_route(state, 'nnoremap')
 
 
+def _ex_route_nvprofile(state) -> TokenCommand:
+    command = _create_route(state, 'nvprofile')
+
+    return _resolve(state, command, r'\s+(?P<action>\S+)\s*$')
+
+
+def _ex_route_nvtrace(state) -> TokenCommand:
+    command = _create_route(state, 'nvtrace')
+
+    return _resolve(state, command, r'\s+(?P<action>start|stop)(?:\s+(?P<file_name>\S.*?))?\s*$')
+
+
 def _ex_route_nohlsearch(state) -> TokenCommand:
     return _create_route(state, 'nohlsearch')
 
@@ -456,8 +474,30 @@ def _ex_route_sunmap(state) -> TokenCommand:
 
 
 def _ex_route_sort(state) -> TokenCommand:
-    command = _create_route(state, 'sort', addressable=True)
-    _resolve(state, command, r'\s*(?P<options>[iu]+)')
+    command = _create_route(state, 'sort', forcable=True, addressable=True)
+
+    options = ''
+    while True:
+        options += state.match(r'\s*([a-zA-Z]*)\s*').group(1)
+
+        c = state.consume()
+        if c == state.EOF:
+            break
+
+        if c == '"':
+            state.match(r'.*$')
+            break
+
+        # Any other character delimits a pattern e.g. /pattern/.
+        match = state.expect_match(
+            r'((?:\\.|[^\\])*?)' + re.escape(c),
+            lambda: ValueError('E654: missing delimiter after search pattern: ' + state.source)
+        )
+
+        command.params['pattern'] = match.group(1)
+
+    if options:
+        command.params['options'] = options
 
     return command
 
@@ -710,7 +750,7 @@ def _ex_route_yank(state) -> TokenCommand:
     return command
 
 
-# TODO: compile regexes. ??
+# The routes are tried in order, see match_route().
 ex_routes = OrderedDict()  # type: dict
 ex_routes[r'!(?=.+)'] = _ex_route_shell_out
 ex_routes[r'&&?'] = _ex_route_double_ampersand
@@ -742,6 +782,8 @@ ex_routes[r'nn(?:oremap)?'] = _ex_route_nnoremap
 ex_routes[r'noh(?:lsearch)?'] = _ex_route_nohlsearch
 ex_routes[r'no(?:remap)?'] = _ex_route_noremap
 ex_routes[r'nun(?:map)?'] = _ex_route_nunmap
+ex_routes[r'NVProfile'] = _ex_route_nvprofile
+ex_routes[r'NVTrace'] = _ex_route_nvtrace
 ex_routes[r'ono(?:remap)?'] = _ex_route_onoremap
 ex_routes[r'on(?:ly)?'] = _ex_route_only
 ex_routes[r'ou(nmap)?'] = _ex_route_ounmap
@@ -783,3 +825,90 @@ ex_routes[r'wq(?=[^a-zA-Z]|$)?'] = _ex_route_wq
 ex_routes[r'xa(?:ll)?'] = _ex_route_wqall
 ex_routes[r'x(?:it)?'] = _ex_route_exit
 ex_routes[r'y(?:ank)?'] = _ex_route_yank
+
+
+def _first_chars(items):
+    # Returns the set of characters that a parsed route can start with, or None
+    # if it can start with any character as far as is known.
+    if not items:
+        return None
+
+    op, av = items[0]
+
+    if op is sre_parse.LITERAL:
+        return {chr(av)}
+
+    if op is sre_parse.SUBPATTERN:
+        return _first_chars(av[-1])
+
+    if op is sre_parse.BRANCH:
+        chars = set()  # type: set
+        for branch in av[1]:
+            branch_chars = _first_chars(branch)
+            if branch_chars is None:
+                return None
+
+            chars |= branch_chars
+
+        return chars
+
+    if op is sre_parse.IN and all(item_op is sre_parse.LITERAL for item_op, item_av in av):
+        return {chr(item_av) for item_op, item_av in av}
+
+    return None
+
+
+def _compile_routes(routes: dict) -> dict:
+    # Compiles the routes into one regex for each character that a route can
+    # start with. The regex is an alternation of the routes, in order, as named
+    # groups. The first alternative that matches wins, which is the same as
+    # trying each of the routes in turn. The routes that can start with any
+    # character are in every bucket, and the only routes of the '' bucket.
+    #
+    # Returns:
+    #   dict: Char -> (regex or None if there are no routes, group name ->
+    #       route function).
+    buckets = OrderedDict()  # type: dict
+    buckets[''] = []
+    any_char_routes = []
+    for index, (pattern, function) in enumerate(routes.items()):
+        route = ('r%d' % index, pattern, function)
+        chars = _first_chars(sre_parse.parse(pattern))
+        if chars is None:
+            any_char_routes.append(route)
+            for bucket in buckets.values():
+                bucket.append(route)
+        else:
+            for char in chars:
+                if char not in buckets:
+                    buckets[char] = list(any_char_routes)
+
+                buckets[char].append(route)
+
+    compiled = {}
+    for char, bucket in buckets.items():
+        if bucket:
+            regex = re.compile('|'.join('(?P<%s>%s)' % (name, pattern) for name, pattern, function in bucket))
+        else:
+            regex = None
+
+        compiled[char] = (regex, {name: function for name, pattern, function in bucket})
+
+    return compiled
+
+
+_compiled_routes = _compile_routes(ex_routes)
+
+
+def match_route(source: str, position: int = 0):
+    # Returns the (match, route function) of the first route that matches the
+    # source at the position, or None.
+    regex, functions = _compiled_routes.get(source[position:position + 1], _compiled_routes[''])
+    if regex is None:
+        return None
+
+    match = regex.match(source, position)
+    if match:
+        return match, functions[match.lastgroup]
+
+    return None
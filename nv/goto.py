@@ -134,7 +134,7 @@ def _goto_modification(action: str, view, mode: str, count: int) -> None:
             view.run_command('git_gutter_' + action + '_change', {'count': count, 'wrap': False})
             line = view.line(view.sel()[0].b)
             if line.size() > 0:
-                pt = view.find('^\\s*', line.begin()).end()
+                pt = next_non_blank(view, line.begin())
                 if pt != line.begin():
                     set_selection(view, pt)
 
@@ -55,11 +55,104 @@ class Mapping:
         self.rhs = rhs
 
 
-def _find_partial_matches(mode: str, lhs: str) -> list:
-    return [x for x in _mappings[mode] if x.startswith(lhs)]
+class _MappingTrie:
+    # A token-level prefix tree of the lhs of the mappings in a mode.
+    #
+    # Each node is a dict of key token -> child node. A node that terminates a
+    # mapping stores the mapping lhs under the None key. Nodes are pruned when
+    # the last mapping passing through them is removed, which means that a
+    # node exists if and only if at least one mapping starts with the tokens
+    # leading to it, so partial match queries are O(sequence length).
+
+    __slots__ = ('root', 'nodes')
+
+    def __init__(self):
+        self.root = {}  # type: dict
+        self.nodes = 0
+
+    def add(self, tokens: tuple, lhs: str) -> None:
+        node = self.root
+        for token in tokens:
+            try:
+                node = node[token]
+            except KeyError:
+                node[token] = child = {}
+                node = child
+                self.nodes += 1
+
+        node[None] = lhs
+
+    def remove(self, tokens: tuple) -> None:
+        path = []
+        node = self.root
+        for token in tokens:
+            path.append((node, token))
+            node = node.get(token)
+            if node is None:
+                return
+
+        node.pop(None, None)
+
+        for parent, token in reversed(path):
+            if parent[token]:
+                break
+
+            del parent[token]
+            self.nodes -= 1
+
+    def find(self, tokens: tuple):
+        node = self.root
+        for token in tokens:
+            node = node.get(token)
+            if node is None:
+                return None
+
+        return node
+
+    def collect(self, node: dict) -> list:
+        matches = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            for token, child in node.items():
+                if token is None:
+                    matches.append(child)
+                else:
+                    stack.append(child)
+
+        return matches
+
+
+_tries = {mode: _MappingTrie() for mode in _mappings}  # type: dict
+
+_stats = {
+    'full_lookups': 0,
+    'partial_lookups': 0,
+    'partial_scans': 0,
+}
+
+
+def _tokenize_seq(seq: str):
+    try:
+        return tuple(tokenize_keys(seq))
+    except ValueError:
+        return None
+
+
+def _has_partial_match(mode: str, lhs: str) -> bool:
+    _stats['partial_lookups'] += 1
+    tokens = _tokenize_seq(lhs)
+    if tokens is None:
+        _stats['partial_scans'] += 1
+        return any(x.startswith(lhs) for x in _mappings[mode])
+
+    node = _tries[mode].find(tokens)
+
+    return bool(node)
 
 
 def _find_full_match(mode: str, lhs: str):
+    _stats['full_lookups'] += 1
     if lhs in _mappings[mode]:
         return _mappings[mode][lhs]
 
@@ -73,16 +166,38 @@ def _normalise_lhs(lhs: str) -> str:
 
 
 def mappings_add(mode: str, lhs: str, rhs: str) -> None:
-    _mappings[mode][_normalise_lhs(lhs)] = rhs
+    lhs = _normalise_lhs(lhs)
+    _mappings[mode][lhs] = rhs
+    _tries[mode].add(_tokenize_seq(lhs) or tuple(lhs), lhs)
 
 
 def mappings_remove(mode: str, lhs: str) -> None:
-    del _mappings[mode][_normalise_lhs(lhs)]
+    lhs = _normalise_lhs(lhs)
+    del _mappings[mode][lhs]
+    _tries[mode].remove(_tokenize_seq(lhs) or tuple(lhs))
 
 
 def mappings_clear() -> None:
     for mode in _mappings:
         _mappings[mode] = {}
+        _tries[mode] = _MappingTrie()
+
+
+def mappings_stats() -> dict:
+    # Returns:
+    #   dict: The number of mappings and trie nodes per mode, and the number
+    #       of lookups performed since the last reset.
+    stats = dict(_stats)
+    stats['modes'] = {
+        mode: {'mappings': len(_mappings[mode]), 'nodes': _tries[mode].nodes} for mode in _mappings
+    }
+
+    return stats
+
+
+def mappings_stats_reset() -> None:
+    for name in _stats:
+        _stats[name] = 0
 
 
 def mappings_is_incomplete(mode: str, seq: str) -> bool:
@@ -90,11 +205,7 @@ def mappings_is_incomplete(mode: str, seq: str) -> bool:
     if full_match:
         return False
 
-    partial_matches = _find_partial_matches(mode, seq)
-    if partial_matches:
-        return True
-
-    return False
+    return _has_partial_match(mode, seq)
 
 
 def mappings_can_resolve(mode: str, sequence: str) -> bool:
@@ -102,11 +213,7 @@ def mappings_can_resolve(mode: str, sequence: str) -> bool:
     if full_match:
         return True
 
-    partial_matches = _find_partial_matches(mode, sequence)
-    if partial_matches:
-        return True
-
-    return False
+    return _has_partial_match(mode, sequence)
 
 
 def _seq_to_mapping(mode: str, seq: str):
@@ -115,6 +222,89 @@ def _seq_to_mapping(mode: str, seq: str):
         return Mapping(seq, full_match)
 
 
+# The command resolution tables. A resolution table is a dict per mode of the
+# core command definitions with the definitions of the enabled plugins applied
+# on top of them. A table is built once per distinct set of enabled plugins.
+_resolution_tables = {}  # type: dict
+
+# The set of enabled plugins per view. An entry is updated by a settings change
+# hook, so that the plugin enable settings are not read per key press.
+_view_enabled_plugins = {}  # type: dict
+
+_plugin_names = []  # type: list
+
+
+def _get_plugin_name(command) -> str:
+    return command.__class__.__module__[24:]
+
+
+def _get_plugin_names() -> list:
+    if not _plugin_names:
+        _plugin_names.extend(sorted({
+            _get_plugin_name(command) for commands in plugin.mappings.values() for command in commands.values()
+        }))
+
+    return _plugin_names
+
+
+def _read_enabled_plugins(view) -> tuple:
+    return tuple(name for name in _get_plugin_names() if get_setting(view, 'enable_%s' % name))
+
+
+def _get_enabled_plugins(view) -> tuple:
+    view_id = view.id()
+    try:
+        return _view_enabled_plugins[view_id]
+    except KeyError:
+        pass
+
+    settings = view.settings()
+    enabled = _view_enabled_plugins[view_id] = _read_enabled_plugins(view)
+
+    def _on_change() -> None:
+        # The hook is called for any setting change e.g. the mode, so the entry
+        # is only replaced when the enabled plugins have changed.
+        if view_id in _view_enabled_plugins:
+            enabled = _read_enabled_plugins(view)
+            if enabled != _view_enabled_plugins[view_id]:
+                _view_enabled_plugins[view_id] = enabled
+
+    settings.clear_on_change('NeoVintageous.mappings')
+    settings.add_on_change('NeoVintageous.mappings', _on_change)
+
+    return enabled
+
+
+def _get_resolution_table(enabled_plugins: tuple) -> dict:
+    try:
+        return _resolution_tables[enabled_plugins]
+    except KeyError:
+        pass
+
+    table = {mode: dict(commands) for mode, commands in keys.mappings.items()}
+    for mode, commands in plugin.mappings.items():
+        mode_table = table.setdefault(mode, {})
+        for seq, command in commands.items():
+            if command and _get_plugin_name(command) in enabled_plugins:
+                mode_table[seq] = command
+
+    _resolution_tables[enabled_plugins] = table
+
+    return table
+
+
+def mappings_reset_resolution_tables() -> None:
+    # The tables are built from the plugin definitions that are loaded, so they
+    # are reset when the plugin is (re)loaded.
+    _resolution_tables.clear()
+    _view_enabled_plugins.clear()
+    del _plugin_names[:]
+
+
+def mappings_on_close(view) -> None:
+    _view_enabled_plugins.pop(view.id(), None)
+
+
 def _seq_to_command(view, seq: str, mode: str):
     # Return the command definition mapped for seq and mode.
     #
@@ -126,18 +316,15 @@ def _seq_to_command(view, seq: str, mode: str):
     # Returns:
     #   ViCommandDefBase:
     #   ViMissingCommandDef: If not found.
-    if mode in plugin.mappings:
-        plugin_command = plugin.mappings[mode].get(seq)
-        if plugin_command:
-            plugin_name = plugin_command.__class__.__module__[24:]
-            is_plugin_enabled = get_setting(view, 'enable_%s' % plugin_name)
-            if is_plugin_enabled:
-                return plugin_command
-
-    if mode in keys.mappings:
-        command = keys.mappings[mode].get(seq)
-        if command:
-            return command
+    enabled_plugins = _get_enabled_plugins(view) if mode in plugin.mappings else ()
+
+    try:
+        command = _get_resolution_table(enabled_plugins)[mode].get(seq)
+    except KeyError:
+        command = None
+
+    if command:
+        return command
 
     return ViMissingCommandDef()
 
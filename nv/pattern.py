@@ -0,0 +1,723 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# Translates Vim search patterns into regular expressions that can be used by
+# both the Sublime Text find APIs and the Python re module. See :help pattern.
+
+from functools import lru_cache
+import re
+import sys
+
+from sublime import IGNORECASE
+from sublime import LITERAL
+
+from NeoVintageous.nv.regexes import register_regex
+
+
+# The magic levels, see :help /magic. The default level, when a pattern has no
+# \v, \m, \M, or \V prefix and 'magic' is set, is the Perl compatible syntax
+# that NeoVintageous has always supported, extended with the Vim atoms that
+# don't conflict with it, e.g. \<, \>, \{n,m}, \zs, \ze, and \a.
+_PERL = 'p'
+_VERY_MAGIC = 'v'
+_MAGIC = 'm'
+_NOMAGIC = 'M'
+_VERY_NOMAGIC = 'V'
+
+# The characters that have a special meaning without a backslash.
+_BARE_SPECIALS = {
+    _PERL: '.*[^$~()|+?{',
+    _VERY_MAGIC: '()|+?={@<>~.*[^$%',
+    _MAGIC: '.*[^$~',
+    _NOMAGIC: '^$',
+    _VERY_NOMAGIC: '',
+}
+
+# The characters that have a special meaning when preceded by a backslash.
+_ESCAPED_SPECIALS = {
+    _PERL: '<>={@%',
+    _VERY_MAGIC: '',
+    _MAGIC: '()|+?={@<>%',
+    _NOMAGIC: '()|+?={@<>%.*[~',
+    _VERY_NOMAGIC: '()|+?={@<>%.*[~^$',
+}
+
+# The character classes, see :help /character-classes. A class is a tuple of
+# the characters in the class and whether the class is negated. Classes don't
+# match an end-of-line, unless preceded by an underscore e.g. \_s.
+_CLASSES = {
+    'i': ('\\w', False),
+    'I': ('\\w', True),
+    'k': ('\\w', False),
+    'K': ('\\W\\d', True),
+    'f': ('\\w/.\\-+,#$%~=', False),
+    'F': ('\\w/.\\-+,#$%~=', True),
+    'p': ('\\x00-\\x1f\\x7f', True),
+    'P': ('\\x00-\\x1f\\x7f0-9', True),
+    's': (' \\t', False),
+    'S': (' \\t', True),
+    'd': ('0-9', False),
+    'D': ('0-9', True),
+    'x': ('0-9A-Fa-f', False),
+    'X': ('0-9A-Fa-f', True),
+    'o': ('0-7', False),
+    'O': ('0-7', True),
+    'w': ('0-9A-Za-z_', False),
+    'W': ('0-9A-Za-z_', True),
+    'h': ('A-Za-z_', False),
+    'H': ('A-Za-z_', True),
+    'a': ('A-Za-z', False),
+    'A': ('A-Za-z', True),
+    'l': ('a-z', False),
+    'L': ('a-z', True),
+    'u': ('A-Z', False),
+    'U': ('A-Z', True),
+}
+
+# The classes that keep their Perl meaning in the default level.
+_PERL_CLASSES = 'dDwWsS'
+
+# The POSIX character classes that can be used in a collection e.g. [[:alpha:]].
+_POSIX_CLASSES = {
+    'alnum': 'A-Za-z0-9',
+    'alpha': 'A-Za-z',
+    'backspace': '\\x08',
+    'blank': ' \\t',
+    'cntrl': '\\x00-\\x1f\\x7f',
+    'digit': '0-9',
+    'escape': '\\x1b',
+    'fname': '\\w/.\\-+,#$%~=',
+    'graph': '!-~',
+    'ident': '\\w',
+    'keyword': '\\w',
+    'lower': 'a-z',
+    'print': ' -~',
+    'punct': '!-/:-@\\[-`{-~',
+    'return': '\\r',
+    'space': ' \\t\\n\\r\\f\\v',
+    'tab': '\\t',
+    'upper': 'A-Z',
+    'xdigit': '0-9A-Fa-f',
+}
+
+_CHAR_ESCAPES = {
+    'e': '\\x1b',
+    't': '\\t',
+    'r': '\\r',
+    'n': '\\n',
+    'b': '\\x08',
+}
+
+_NUMBER_ESCAPES = {
+    'd': ('0123456789', 10, None),
+    'o': ('01234567', 8, 4),
+    'x': ('0123456789abcdefABCDEF', 16, 2),
+    'u': ('0123456789abcdefABCDEF', 16, 4),
+    'U': ('0123456789abcdefABCDEF', 16, 8),
+}
+
+_PERL_QUANTIFIER = register_regex('pattern.perl_quantifier', '\\{(\\d+)(,(\\d*))?\\}')
+_VIM_QUANTIFIER = register_regex('pattern.vim_quantifier', '(-?)(\\d*)(,(\\d*))?\\\\?\\}')
+_PERL_GROUP = register_regex(
+    'pattern.perl_group',
+    '\\(\\?(?:[:=!>|]|<[=!]|P?<\\w+>|P=\\w+\\)|#[^)]*\\)|[aiLmsux-]+(?::|\\)))'
+)
+_PERL_ESCAPE = register_regex('pattern.perl_escape', '\\\\(?:x[0-9a-fA-F]{1,2}|[xpP]\\{[^}]*\\})')
+_LOOKAROUND = register_regex('pattern.lookaround', '@\\d*(=|!|<=|<!|>)')
+_CASE_ATOM = register_regex('pattern.case_atom', '\\\\(?:[cCvmMV])|(\\\\.)')
+
+# Item kinds.
+_ATOM = 0
+_ANCHOR = 1
+_BAR = 2
+_OPEN = 3
+
+
+# Atomic groups and possessive quantifiers are supported by the Python re
+# module since Python 3.11.
+_PYTHON_ATOMIC_GROUPS = sys.version_info >= (3, 11)
+
+
+class PatternError(ValueError):
+    pass
+
+
+class UnsupportedPatternError(ValueError):
+    # Raised when a pattern is translated for the Python re module and it uses
+    # syntax that the re module doesn't support, e.g. the \K that \zs is
+    # translated to after a variable width pattern.
+
+    def __init__(self, pattern: str, reason: str):
+        super().__init__('E383: Invalid search string: %s (%s)' % (pattern, reason))
+
+
+def _escape(c: str) -> str:
+    if c in '\\.^$*+?{}[]()|':
+        return '\\' + c
+
+    return c
+
+
+def _escape_in_collection(c: str) -> str:
+    if c in '\\[]^-&~|':
+        return '\\' + c
+
+    return c
+
+
+def _class(chars: str, negated: bool, newline: bool = False) -> str:
+    if negated:
+        return '[^' + chars + ('' if newline else '\\n') + ']'
+
+    return '[' + chars + ('\\n' if newline else '') + ']'
+
+
+class _Item():
+
+    __slots__ = ['kind', 'text', 'width', 'literal', 'quantified']
+
+    def __init__(self, kind: int, text: str, width=None, literal: str = None):
+        # The width is the fixed number of characters the item matches, or
+        # None if it varies. Literal is the character matched by the item if
+        # it's a literal character.
+        self.kind = kind
+        self.text = text
+        self.width = width
+        self.literal = literal
+        self.quantified = False
+
+
+class _Translator():
+
+    def __init__(self, pattern: str, level: str, last_substitute: str, python: bool = False):
+        self.pattern = pattern
+        self.level = level
+        self.last_substitute = last_substitute
+        self.python = python
+        self.idx = 0
+        self.items = []  # type: list
+        self.groups = []  # type: list
+        self.ignorecase = None
+        self.zs = None
+        self.ze = None
+        self.has_bar = False
+
+    def translate(self) -> tuple:
+        pattern = self.pattern
+        end = len(pattern)
+        while self.idx < end:
+            c = pattern[self.idx]
+            if c == '\\':
+                self._escaped()
+            elif c in _BARE_SPECIALS[self.level]:
+                self.idx += 1
+                self._special(c)
+            else:
+                self.idx += 1
+                self._literal(c)
+
+        return self._finish()
+
+    def _escaped(self) -> None:
+        pattern = self.pattern
+        i = self.idx
+        if i + 1 == len(pattern):
+            self.idx += 1
+            self._literal('\\')
+            return
+
+        c = pattern[i + 1]
+        self.idx += 2
+        if c in _ESCAPED_SPECIALS[self.level]:
+            self._special(c, escaped=True)
+        elif c.isalnum() or c == '_':
+            self._escaped_letter(c)
+        else:
+            self._literal(c)
+
+    def _escaped_letter(self, c: str) -> None:
+        pattern = self.pattern
+        level = self.level
+
+        if c in 'cC':
+            if c == 'c' or self.ignorecase is None:
+                self.ignorecase = c == 'c'
+        elif c in 'vmMV':
+            self.level = c
+        elif c == 'z':
+            self._zs_ze()
+        elif c in '123456789':
+            self._append(_ATOM, '\\' + c)
+        elif c == '_':
+            self._newline_class()
+        elif level == _PERL and c in _PERL_CLASSES:
+            self._append(_ATOM, '\\' + c, 1)
+        elif level == _PERL and c in 'xpP' and _PERL_ESCAPE.match(pattern, self.idx - 2):
+            match = _PERL_ESCAPE.match(pattern, self.idx - 2)
+            self.idx = match.end()
+            self._append(_ATOM, match.group(0), 1)
+        elif c in _CLASSES:
+            self._append(_ATOM, _class(*_CLASSES[c]), 1)
+        elif level == _PERL and c == 'b':
+            self._append(_ANCHOR, '\\b', 0)
+        elif c in _CHAR_ESCAPES:
+            self._append(_ATOM, _CHAR_ESCAPES[c], 1)
+        elif level == _PERL:
+            self._append(_ATOM, '\\' + c)
+        else:
+            raise PatternError('unsupported atom \\' + c)
+
+    def _zs_ze(self) -> None:
+        pattern = self.pattern
+        c = pattern[self.idx:self.idx + 1]
+        if c not in ('s', 'e') or self.groups:
+            raise PatternError('unsupported atom \\z' + c)
+
+        self.idx += 1
+        if c == 's':
+            self.zs = len(self.items)
+        else:
+            self.ze = len(self.items)
+
+    def _newline_class(self) -> None:
+        pattern = self.pattern
+        c = pattern[self.idx:self.idx + 1]
+        self.idx += 1
+        if c in _CLASSES:
+            chars, negated = _CLASSES[c]
+            self._append(_ATOM, _class(chars, negated, newline=True), 1)
+        elif c == '.':
+            self._append(_ATOM, '[\\s\\S]', 1)
+        elif c == '[':
+            if not self._collection(newline=True):
+                raise PatternError('missing ] after \\_[')
+        elif c == '^':
+            self._append(_ANCHOR, '^', 0)
+        elif c == '$':
+            self._append(_ANCHOR, '$', 0)
+        else:
+            raise PatternError('unsupported atom \\_' + c)
+
+    def _literal(self, c: str) -> None:
+        self._append(_ATOM, _escape(c), 1, c)
+
+    def _append(self, kind: int, text: str, width=None, literal: str = None) -> None:
+        self.items.append(_Item(kind, text, width, literal))
+
+    def _is_quantifiable(self) -> bool:
+        if not self.items or self.items[-1].kind != _ATOM:
+            return False
+
+        if self.items[-1].quantified:
+            raise PatternError('nested quantifier')
+
+        return True
+
+    def _quantify(self, quantifier: str, width=None) -> None:
+        item = self.items[-1]
+        item.text = item.text + quantifier
+        item.width = width
+        item.literal = None
+        item.quantified = True
+
+    def _special(self, c: str, escaped: bool = False) -> None:
+        level = self.level
+        source = ('\\' if escaped else '') + c
+
+        if c == '(':
+            if level == _PERL and self.pattern.startswith('?', self.idx):
+                self._perl_group()
+            else:
+                self._append(_OPEN, '(', None, source)
+                self.groups.append(len(self.items) - 1)
+        elif c == ')':
+            self._close_group()
+        elif c == '%':
+            self._percent(source)
+        elif c == '|':
+            self.has_bar = True
+            self._append(_BAR, '|')
+        elif c in '*+?=':
+            if level == _PERL and c in '+?' and self.items and self.items[-1].quantified:
+                # Lazy and possessive quantifiers e.g. x*? and x++.
+                if c == '+':
+                    self._unsupported_by_python_before_3_11('possessive quantifier')
+
+                self.items[-1].text += c
+            elif self._is_quantifiable():
+                self._quantify('?' if c == '=' else c)
+            else:
+                self._literal(c)
+        elif c == '{':
+            self._brace(escaped)
+        elif c == '@':
+            self._lookaround()
+        elif c == '<':
+            self._append(_ANCHOR, '\\b(?=\\w)', 0)
+        elif c == '>':
+            self._append(_ANCHOR, '\\b(?<=\\w)', 0)
+        elif c == '~':
+            self._tilde()
+        elif c == '.':
+            self._append(_ATOM, '.', 1)
+        elif c == '[':
+            if not self._collection():
+                self._literal('[')
+        elif c == '^':
+            if level == _PERL or self._is_start_of_branch():
+                self._append(_ANCHOR, '^', 0)
+            else:
+                self._literal('^')
+        elif c == '$':
+            if level == _PERL or self._is_end_of_branch():
+                self._append(_ANCHOR, '$', 0)
+            else:
+                self._literal('$')
+
+    def _is_start_of_branch(self) -> bool:
+        return not self.items or self.items[-1].kind in (_OPEN, _BAR)
+
+    def _is_end_of_branch(self) -> bool:
+        rest = self.pattern[self.idx:]
+        if not rest or rest.startswith('\\n'):
+            return True
+
+        if self.level == _VERY_MAGIC:
+            return rest[0] in '|)'
+
+        return rest.startswith('\\|') or rest.startswith('\\)')
+
+    def _perl_group(self) -> None:
+        match = _PERL_GROUP.match(self.pattern, self.idx - 1)
+        if not match:
+            raise PatternError('unsupported group')
+
+        self.idx = match.end()
+        text = match.group(0)
+        if text.startswith('(?P='):
+            self._append(_ATOM, text)
+        elif text.endswith(')'):
+            self._append(_ANCHOR, text, 0)
+        else:
+            self._append(_OPEN, text, None, text)
+            self.groups.append(len(self.items) - 1)
+
+    def _close_group(self) -> None:
+        if not self.groups:
+            self._literal(')')
+            return
+
+        start = self.groups.pop()
+        items = self.items[start:]
+        del self.items[start:]
+
+        width = 0
+        for item in items[1:]:
+            if item.width is None or item.kind == _BAR:
+                width = None
+                break
+            width += item.width
+
+        text = ''.join(item.text for item in items) + ')'
+        if items[0].text in ('(?=', '(?!', '(?<=', '(?<!'):
+            self._append(_ANCHOR, text, 0)
+        else:
+            self._append(_ATOM, text, width)
+
+    def _percent(self, source: str) -> None:
+        pattern = self.pattern
+        c = pattern[self.idx:self.idx + 1]
+        self.idx += 1
+        if c == '(':
+            self._append(_OPEN, '(?:', None, source + c)
+            self.groups.append(len(self.items) - 1)
+        elif c == '^':
+            self._append(_ANCHOR, '\\A', 0)
+        elif c == '$':
+            self._append(_ANCHOR, '(?![\\s\\S])', 0)
+        elif c in _NUMBER_ESCAPES:
+            digits, base, max_len = _NUMBER_ESCAPES[c]
+            end = self.idx
+            while end < len(pattern) and pattern[end] in digits and (max_len is None or end - self.idx < max_len):
+                end += 1
+
+            if end == self.idx:
+                raise PatternError('missing number after \\%' + c)
+
+            char = chr(int(pattern[self.idx:end], base))
+            self.idx = end
+            self._literal(char)
+        else:
+            raise PatternError('unsupported atom \\%' + c)
+
+    def _brace(self, escaped: bool) -> None:
+        pattern = self.pattern
+        if self.level == _PERL and not escaped:
+            match = _PERL_QUANTIFIER.match(pattern, self.idx - 1)
+            if match and self._is_quantifiable():
+                self.idx = match.end()
+                width = self.items[-1].width
+                exact = match.group(2) is None
+                self._quantify(match.group(0), width * int(match.group(1)) if exact and width is not None else None)
+            else:
+                self._literal('{')
+            return
+
+        match = _VIM_QUANTIFIER.match(pattern, self.idx)
+        if not match:
+            if self.level == _PERL:
+                self._literal('{')
+                return
+            raise PatternError('syntax error in \\{...}')
+
+        if not self._is_quantifiable():
+            raise PatternError('nothing to repeat')
+
+        self.idx = match.end()
+        lazy, low, comma, high = match.group(1), match.group(2), match.group(3), match.group(4)
+
+        if not comma:
+            if low:
+                width = self.items[-1].width
+                self._quantify('{' + low + '}', width * int(low) if width is not None else None)
+                return
+            quantifier = '*'
+        elif not low and not high:
+            quantifier = '*'
+        else:
+            low = int(low or 0)
+            if high:
+                high = int(high)
+                low, high = min(low, high), max(low, high)
+                quantifier = '{%s,%s}' % (low, high)
+            else:
+                quantifier = '{%s,}' % low
+
+        self._quantify(quantifier + ('?' if lazy else ''))
+
+    def _lookaround(self) -> None:
+        match = _LOOKAROUND.match(self.pattern, self.idx - 1)
+        if not match or not self._is_quantifiable():
+            raise PatternError('unsupported use of \\@')
+
+        self.idx = match.end()
+        item = self.items.pop()
+        kind = match.group(1)
+        if kind == '>':
+            self._unsupported_by_python_before_3_11('\\@>')
+            self._append(_ATOM, '(?>' + item.text + ')', item.width)
+        else:
+            if self.python and kind in ('<=', '<!') and item.width is None:
+                raise UnsupportedPatternError(self.pattern, '\\@%s after a variable width pattern' % kind)
+
+            self._append(_ANCHOR, '(?' + kind + item.text + ')', 0)
+
+    def _unsupported_by_python_before_3_11(self, syntax: str) -> None:
+        if self.python and not _PYTHON_ATOMIC_GROUPS:
+            raise UnsupportedPatternError(self.pattern, syntax + ' requires Python 3.11')
+
+    def _tilde(self) -> None:
+        if self.last_substitute is None:
+            self._literal('~')
+        else:
+            for c in self.last_substitute:
+                self._literal(c)
+
+    def _collection(self, newline: bool = False) -> bool:
+        # Returns False, without consuming anything, if the collection has no
+        # closing bracket, in which case the "[" is taken literally.
+        pattern = self.pattern
+        end = len(pattern)
+        i = self.idx
+        parts = []
+        negated = False
+
+        if i < end and pattern[i] == '^':
+            negated = True
+            i += 1
+
+        if i < end and pattern[i] == ']':
+            parts.append('\\]')
+            i += 1
+
+        while True:
+            if i >= end:
+                return False
+
+            c = pattern[i]
+            if c == ']':
+                break
+
+            if c == '[' and pattern.startswith('[:', i):
+                close = pattern.find(':]', i + 2)
+                if close != -1 and pattern[i + 2:close] in _POSIX_CLASSES:
+                    parts.append(_POSIX_CLASSES[pattern[i + 2:close]])
+                    i = close + 2
+                    continue
+
+            if c == '\\' and i + 1 < end:
+                d = pattern[i + 1]
+                i += 2
+                if self.level == _PERL:
+                    parts.append('\\' + d)
+                elif d in _CHAR_ESCAPES:
+                    parts.append(_CHAR_ESCAPES[d])
+                elif d in '\\]^-':
+                    parts.append('\\' + d)
+                elif d in _NUMBER_ESCAPES and i < end and pattern[i] in _NUMBER_ESCAPES[d][0]:
+                    digits, base, max_len = _NUMBER_ESCAPES[d]
+                    j = i
+                    while j < end and pattern[j] in digits and (max_len is None or j - i < max_len):
+                        j += 1
+                    parts.append(_escape_in_collection(chr(int(pattern[i:j], base))))
+                    i = j
+                else:
+                    # Other backslashes are taken literally e.g. [\xyz] matches
+                    # "\", "x", "y", or "z".
+                    parts.append('\\\\' + _escape_in_collection(d))
+                continue
+
+            if c == '-':
+                parts.append('-')
+            else:
+                parts.append(_escape_in_collection(c))
+
+            i += 1
+
+        self.idx = i + 1
+        chars = ''.join(parts)
+        if negated:
+            text = '[^' + chars + ']'
+        else:
+            text = '[' + chars + ('\\n' if newline else '') + ']'
+
+        self._append(_ATOM, text, 1)
+
+        return True
+
+    def _finish(self) -> tuple:
+        # Unclosed groups are taken literally.
+        for start in reversed(self.groups):
+            item = self.items[start]
+            self.items[start:start + 1] = [_Item(_ATOM, _escape(c), 1, c) for c in item.literal if c != '\\']
+
+        items = self.items
+
+        if self.zs is None and self.ze is None:
+            if items and all(item.kind == _ATOM and item.literal is not None for item in items):
+                return ''.join(item.literal for item in items), True
+
+            return ''.join(item.text for item in items), False
+
+        if self.has_bar:
+            raise PatternError('\\zs and \\ze are not supported with alternatives')
+
+        zs = self.zs or 0
+        ze = len(items) if self.ze is None else max(self.ze, zs)
+        prefix = items[:zs]
+        middle = ''.join(item.text for item in items[zs:ze])
+        suffix = ''.join(item.text for item in items[ze:])
+
+        text = ''
+        if prefix:
+            if all(item.width is not None for item in prefix):
+                text = '(?<=' + ''.join(item.text for item in prefix) + ')'
+            elif self.python:
+                raise UnsupportedPatternError(self.pattern, '\\zs after a variable width pattern')
+            else:
+                text = ''.join(item.text for item in prefix) + '\\K'
+
+        text += middle
+        if suffix:
+            text += '(?=' + suffix + ')'
+
+        return text, False
+
+
+def _has_uppercase(pattern: str) -> bool:
+    # Characters preceded by a backslash don't count e.g. \S, see :help /\C.
+    i = 0
+    end = len(pattern)
+    while i < end:
+        c = pattern[i]
+        if c == '\\':
+            i += 3 if pattern[i + 1:i + 2] in ('_', '%') else 2
+            continue
+
+        if c.isupper():
+            return True
+
+        i += 1
+
+    return False
+
+
+def _strip_case_atoms(pattern: str) -> str:
+    return _CASE_ATOM.sub(lambda m: m.group(1) or '', pattern)
+
+
+@lru_cache(maxsize=256)
+def translate_pattern(pattern: str, ignorecase: bool, smartcase: bool, magic: bool,
+                      last_substitute: str = None, python: bool = False) -> tuple:
+    # Translates a Vim search pattern to a (pattern, flags) tuple that can be
+    # passed to view.find() and friends. The flags are a combination of the
+    # Sublime Text IGNORECASE and LITERAL flags. Patterns that only match
+    # literal text are returned unescaped with the LITERAL flag.
+    #
+    # The last substitute string is the replacement of the last :substitute,
+    # which is matched by "~". Callers only need to pass it when "~" is in the
+    # pattern, so that the cache isn't invalidated by substitutions.
+    #
+    # Patterns that are translated for compile_pattern() must be translated
+    # with python=True. An UnsupportedPatternError is raised if the pattern
+    # uses syntax that the Python re module doesn't support.
+    translator = _Translator(pattern, _PERL if magic else _NOMAGIC, last_substitute, python)
+
+    try:
+        text, literal = translator.translate()
+    except PatternError:
+        # Patterns that use unsupported Vim syntax are matched literally.
+        text, literal = _strip_case_atoms(pattern), True
+
+    flags = 0
+
+    if ignorecase and not (smartcase and _has_uppercase(pattern)):
+        flags |= IGNORECASE
+
+    if translator.ignorecase is True:
+        flags |= IGNORECASE
+    elif translator.ignorecase is False:
+        flags &= ~IGNORECASE
+
+    if literal and text:
+        flags |= LITERAL
+
+    return text, flags
+
+
+@lru_cache(maxsize=128)
+def compile_pattern(pattern: str, flags: int):
+    # Compiles a translated (pattern, flags) tuple as a Python regex, for
+    # example to substitute the occurrences of a search pattern.
+    re_flags = re.MULTILINE
+    if flags & IGNORECASE:
+        re_flags |= re.IGNORECASE
+
+    if flags & LITERAL:
+        pattern = re.escape(pattern)
+
+    return re.compile(pattern, re_flags)
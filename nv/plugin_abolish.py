@@ -17,11 +17,10 @@
 
 # A port of https://github.com/tpope/vim-abolish.
 
-import re
-
 from sublime_plugin import TextCommand
 
 from NeoVintageous.nv.plugin import register
+from NeoVintageous.nv.regexes import register_regex
 from NeoVintageous.nv.utils import set_selection
 from NeoVintageous.nv.vi import seqs
 from NeoVintageous.nv.vi.cmd_base import RequiresOneCharMixinDef
@@ -34,6 +33,10 @@ __all__ = [
 ]
 
 
+_ACRONYM_BOUNDARY_PATTERN = register_regex('abolish.acronym_boundary', r"([A-Z]+)([A-Z][a-z])")
+_WORD_BOUNDARY_PATTERN = register_regex('abolish.word_boundary', r"([a-z\d])([A-Z])")
+
+
 def _coerce_to_mixedcase(string: str) -> str:
     return _coerce_to_spacecase(string).title().replace(' ', '')
 
@@ -48,8 +51,8 @@ def _coerce_to_camelcase(string: str) -> str:
 def _coerce_to_snakecase(string: str) -> str:
     # https://stackoverflow.com/a/1176023
     # https://github.com/jpvanhal/inflection
-    string = re.sub(r"([A-Z]+)([A-Z][a-z])", r'\1_\2', string)
-    string = re.sub(r"([a-z\d])([A-Z])", r'\1_\2', string)
+    string = _ACRONYM_BOUNDARY_PATTERN.sub(r'\1_\2', string)
+    string = _WORD_BOUNDARY_PATTERN.sub(r'\1_\2', string)
     string = string.replace("-", "_")
     return string.lower()
 
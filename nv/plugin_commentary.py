@@ -133,8 +133,7 @@ def _do_c(view, edit, mode, count=1, motion=None):
     pt = line.begin()
 
     if line.size() > 0:
-        line = view.find('^\\s*', line.begin())
-        pt = line.end()
+        pt = next_non_blank(view, line.begin())
 
     set_selection(view, pt)
     enter_normal_mode(view, mode)
@@ -178,8 +177,7 @@ def _do_cc(view, edit, mode: str, count: int = 1) -> None:
     pt = line.begin()
 
     if line.size() > 0:
-        line = view.find('^\\s*', line.begin())
-        pt = line.end()
+        pt = next_non_blank(view, line.begin())
 
     regions_transformer_reversed(view, f)
     set_selection(view, pt)
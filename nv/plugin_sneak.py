@@ -17,14 +17,22 @@
 
 # A Port of https://github.com/justinmk/vim-sneak.
 
+from bisect import bisect_left
+from bisect import bisect_right
+from html import escape
+
 from sublime import IGNORECASE
+from sublime import LAYOUT_INLINE
 from sublime import LITERAL
+from sublime import Phantom
+from sublime import PhantomSet
+from sublime import Region
 from sublime_plugin import TextCommand
 
 from NeoVintageous.nv.options import get_option
 from NeoVintageous.nv.plugin import register
-from NeoVintageous.nv.polyfill import view_find_all_in_range
-from NeoVintageous.nv.polyfill import view_rfind_all
+from NeoVintageous.nv.polyfill import iter_find_in_range
+from NeoVintageous.nv.polyfill import iter_rfind_in_range
 from NeoVintageous.nv.search import add_search_highlighting
 from NeoVintageous.nv.search import clear_search_highlighting
 from NeoVintageous.nv.search import is_smartcase_pattern
@@ -41,6 +49,7 @@ from NeoVintageous.nv.utils import resolve_visual_line_target
 from NeoVintageous.nv.utils import resolve_visual_target
 from NeoVintageous.nv.utils import set_selection
 from NeoVintageous.nv.utils import translate_char
+from NeoVintageous.nv.utils import update_xpos
 from NeoVintageous.nv.vi import seqs
 from NeoVintageous.nv.vi.cmd_base import ViMotionDef
 from NeoVintageous.nv.vim import INTERNAL_NORMAL
@@ -55,6 +64,26 @@ __all__ = [
 ]
 
 
+# The keys used to label occurrences in label mode, the same as vim-sneak.
+_LABELS = ';sftunq/SFGHLTUNRMQZ?0'
+
+
+# The occurrences of the last sneak, keyed by view id. The occurrences are only
+# searched for in a region around the viewport, and reused by repeated sneaks
+# i.e. ; and , until the buffer is modified. The structure of a layout:
+#
+#   ((change_count, search, flags), region, starts, ends)
+#
+_layouts = {}  # type: dict
+
+
+# The labels drawn in label mode, keyed by view id. The structure of an entry:
+#
+#   (phantom_set, change_count, search, forward, {label: target})
+#
+_labels = {}  # type: dict
+
+
 class SneakInputMotion(ViMotionDef):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -119,8 +148,113 @@ def _get_search_flags(view, search: str) -> int:
     return flags
 
 
+def _can_overlap(search: str, flags: int) -> bool:
+    # True if an occurrence can start inside another occurrence, e.g. "aa".
+    if flags & IGNORECASE:
+        search = search.lower()
+
+    return any(search[i:] == search[:-i] for i in range(1, len(search)))
+
+
+def _create_layout(view, search: str, flags: int, target: Region, forward: bool) -> tuple:
+    # The occurrences in the visible region, or in a screenful from the target
+    # when the target is outside of it, so the search work is bounded by the
+    # size of the viewport rather than the size of the buffer.
+    region = view.visible_region()
+    if not region.contains(target):
+        extent = region.size()
+        if forward:
+            region = Region(target.a, min(target.b + extent, view.size()))
+        else:
+            region = Region(max(target.a - extent, 0), target.b)
+
+    starts = []
+    ends = []
+    for occurrence in iter_find_in_range(view, search, region.a, region.b, flags):
+        starts.append(occurrence.a)
+        ends.append(occurrence.b)
+
+    layout = _layouts[view.id()] = ((view.change_count(), search, flags), region, starts, ends)
+
+    return layout
+
+
+def _find_in_layout(view, search: str, flags: int, start_pt: int, count: int, forward: bool):
+    # Returns the index of the {count}th occurrence from {start_pt} in the last
+    # layout, or None if the layout can't tell, in which case search instead.
+    layout = _layouts.get(view.id())
+    if not layout or layout[0] != (view.change_count(), search, flags) or _can_overlap(search, flags):
+        return None
+
+    _, region, starts, ends = layout
+
+    if forward:
+        if start_pt + 1 < region.a:
+            return None
+
+        index = bisect_left(starts, start_pt + 1) + count - 1
+        if index < len(starts):
+            return index
+    else:
+        if start_pt > region.b:
+            return None
+
+        index = bisect_right(ends, start_pt) - count
+        if index >= 0:
+            return index
+
+    return None
+
+
+def _clear_labels(view) -> None:
+    labels = _labels.pop(view.id(), None)
+    if labels:
+        labels[0].update([])
+
+
+def _draw_labels(view, search: str, forward: bool, targets: list) -> None:
+    phantom_set = PhantomSet(view, '_nv_sneak_labels')
+    phantom_set.update([
+        Phantom(Region(target), '<b>%s</b>' % escape(label), LAYOUT_INLINE) for label, target in targets
+    ])
+
+    _labels[view.id()] = (phantom_set, view.change_count(), search, forward, dict(targets))
+
+
+def sneak_jump_to_label(view, mode: str, key: str) -> bool:
+    # Returns True if the key is a label in label mode, in which case the cursor
+    # jumps to it. Any other key removes the labels and is handled as usual.
+    labels = _labels.get(view.id())
+    if not labels:
+        return False
+
+    _clear_labels(view)
+
+    _, change_count, search, forward, targets = labels
+    if key not in targets or mode not in (NORMAL, VISUAL, VISUAL_LINE) or change_count != view.change_count():
+        return False
+
+    view.run_command('nv_sneak', {
+        'mode': mode,
+        'count': 1,
+        'search': search,
+        'forward': forward,
+        'save': False,
+        'target': targets[key]
+    })
+
+    update_xpos(view)
+
+    return True
+
+
+def sneak_on_close(view) -> None:
+    _layouts.pop(view.id(), None)
+    _labels.pop(view.id(), None)
+
+
 class nv_sneak_command(TextCommand):
-    def run(self, edit, mode, count, search=None, forward=True, save=True):
+    def run(self, edit, mode, count, search=None, forward=True, save=True, target=None):
         if len(self.view.sel()) != 1:
             ui_bell('sneak does not support multiple cursors')
             return
@@ -132,23 +266,46 @@ class nv_sneak_command(TextCommand):
                 return
 
         clear_search_highlighting(self.view)
+        _clear_labels(self.view)
 
         flags = _get_search_flags(self.view, search)
         s = self.view.sel()[0]
         start_pt = get_insertion_point_at_b(s)
 
-        if forward:
-            occurrences = view_find_all_in_range(self.view, search, start_pt + 1, self.view.size(), flags)
+        if target is None:
+            index = _find_in_layout(self.view, search, flags, start_pt, count, forward)
+            if index is None:
+                occurrence = self._find(search, flags, start_pt, count, forward)
+                if not occurrence:
+                    ui_bell('not found: %s' % search)
+                    return
+
+                _, _, starts, ends = _create_layout(self.view, search, flags, occurrence, forward)
+                index = bisect_left(starts, occurrence.a)
+                if index == len(starts) or starts[index] != occurrence.a:
+                    # The occurrence overlaps another one in the layout.
+                    starts.insert(index, occurrence.a)
+                    ends.insert(index, occurrence.b)
+            else:
+                _, _, starts, ends = _layouts[self.view.id()]
+
+            labelled = True
         else:
-            occurrences = list(view_rfind_all(self.view, search, start_pt, flags))
+            layout = _layouts.get(self.view.id())
+            if not layout or layout[0] != (self.view.change_count(), search, flags):
+                ui_bell('not found: %s' % search)
+                return
 
-        occurrences = occurrences[count - 1:]
+            _, _, starts, ends = layout
+            index = bisect_left(starts, target)
+            if index == len(starts) or starts[index] != target:
+                ui_bell('not found: %s' % search)
+                return
 
-        if not occurrences:
-            ui_bell('not found: %s' % search)
-            return
+            labelled = False
 
-        target = occurrences[0].a
+        target = starts[index]
+        occurrences = self._get_occurrences_to_highlight(starts, ends, index, forward)
 
         if mode == NORMAL:
             s.a = s.b = target
@@ -164,6 +321,47 @@ class nv_sneak_command(TextCommand):
         set_selection(self.view, s)
         add_search_highlighting(self.view, occurrences)
 
+        if labelled and mode in (NORMAL, VISUAL, VISUAL_LINE) and get_setting(self.view, 'sneak_label_mode'):
+            self._label(starts, ends, index, search, forward)
+
         if save:
             set_last_char_search_command(self.view, 'sneak_s' if forward else 'sneak_big_s')
             _set_last_sneak_search(self.view, search)
+
+    def _find(self, search: str, flags: int, start_pt: int, count: int, forward: bool):
+        # Only the first {count} occurrences are searched for, so the time it
+        # takes is independent of the number of occurrences after the cursor.
+        if forward:
+            matches = list(iter_find_in_range(self.view, search, start_pt + 1, self.view.size(), flags, limit=count))
+        else:
+            matches = list(iter_rfind_in_range(self.view, search, 0, start_pt, flags, limit=count))
+
+        if len(matches) == count:
+            return matches[-1]
+
+    def _get_occurrences_to_highlight(self, starts: list, ends: list, index: int, forward: bool) -> list:
+        # The target and the occurrences after it that don't overlap it.
+        target = Region(starts[index], ends[index])
+        if forward:
+            return [target] + [Region(a, b) for a, b in zip(starts[index + 1:], ends[index + 1:]) if a >= target.b]
+
+        return [Region(a, b) for a, b in zip(starts[:index], ends[:index]) if b <= target.a] + [target]
+
+    def _label(self, starts: list, ends: list, index: int, search: str, forward: bool) -> None:
+        # Only the occurrences in the visible region are labelled.
+        visible_region = self.view.visible_region()
+        if forward:
+            candidates = range(index + 1, len(starts))
+        else:
+            candidates = range(index - 1, -1, -1)
+
+        targets = []
+        for i in candidates:
+            if len(targets) == len(_LABELS):
+                break
+
+            if visible_region.contains(Region(starts[i], ends[i])):
+                targets.append((_LABELS[len(targets)], starts[i]))
+
+        if targets:
+            _draw_labels(self.view, search, forward, targets)
@@ -17,13 +17,12 @@
 
 # A port of https://github.com/tpope/vim-surround.
 
-import re
-
 from sublime import Region
 from sublime_plugin import TextCommand
 
 from NeoVintageous.nv.plugin import register
 from NeoVintageous.nv.polyfill import view_find
+from NeoVintageous.nv.regexes import register_regex
 from NeoVintageous.nv.settings import get_mode
 from NeoVintageous.nv.utils import InputParser
 from NeoVintageous.nv.utils import translate_char
@@ -45,6 +44,9 @@ __all__ = [
 ]
 
 
+_TAG_PATTERN = register_regex('surround.tag', '<.*?>')
+
+
 @register(seqs.YS, (NORMAL,))
 class Surroundys(ViOperatorDef):
     def __init__(self, *args, **kwargs):
@@ -58,7 +60,7 @@ class Surroundys(ViOperatorDef):
     @property
     def accept_input(self) -> bool:
         single = len(self.inp) == 1 and self.inp != '<'
-        tag = re.match('<.*?>', self.inp)
+        tag = _TAG_PATTERN.match(self.inp)
 
         return not (single or tag)
 
@@ -126,7 +128,7 @@ class Surroundds(ViOperatorDef):
     @property
     def accept_input(self) -> bool:
         single = len(self.inp) == 1
-        tag = re.match('<.*?>', self.inp)
+        tag = _TAG_PATTERN.match(self.inp)
 
         return not (single or tag)
 
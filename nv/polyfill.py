@@ -16,17 +16,29 @@
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
 from contextlib import contextmanager
+from functools import lru_cache
+from itertools import islice
 import os
 import re
 import stat
 import sys
+import warnings
 
+from sublime import IGNORECASE
+from sublime import LITERAL
 from sublime import Region
 from sublime import active_window as _active_window
 from sublime import load_settings
 from sublime import save_settings
 from sublime import status_message as _status_message
 
+from NeoVintageous.nv.regexes import register_regex
+
+try:
+    from re import _parser as sre_parse  # type: ignore
+except ImportError:
+    import sre_parse  # type: ignore
+
 
 def is_py38() -> bool:
     return sys.version_info >= (3, 8)
@@ -141,15 +153,171 @@ def view_find(view, pattern: str, start_pt: int, flags: int = 0):
     return match
 
 
+# Sublime regex syntax that Python doesn't support, or supports with different
+# meaning, e.g. word boundaries \< \>, and POSIX bracket expressions [:alpha:].
+# The buffer anchors e.g. \A are unsupported too, because a reverse search
+# scans chunks of the buffer, so they would match at the start of each chunk.
+_RFIND_UNSUPPORTED_PATTERN = register_regex('polyfill.rfind_unsupported', r'\\[<>AGZz]|\[:')
+
+# The size of the first chunk scanned by a reverse search. Each time a chunk
+# doesn't contain enough matches the size is doubled.
+_RFIND_CHUNK_SIZE = 4096
+
+
+# The categories of the regex parser that match a newline.
+_NEWLINE_CATEGORIES = (
+    sre_parse.CATEGORY_LINEBREAK,
+    sre_parse.CATEGORY_NOT_DIGIT,
+    sre_parse.CATEGORY_NOT_WORD,
+    sre_parse.CATEGORY_SPACE,
+)
+
+
+def _in_matches_newline(items) -> bool:
+    negate = False
+    matches = False
+    for op, av in items:
+        if op is sre_parse.NEGATE:
+            negate = True
+        elif op is sre_parse.LITERAL:
+            matches = matches or av == 10
+        elif op is sre_parse.RANGE:
+            matches = matches or av[0] <= 10 <= av[1]
+        elif op is sre_parse.CATEGORY:
+            matches = matches or av in _NEWLINE_CATEGORIES
+
+    return matches != negate
+
+
+def _iter_subpatterns(av):
+    if isinstance(av, sre_parse.SubPattern):
+        yield av
+    elif isinstance(av, (tuple, list)):
+        for item in av:
+            yield from _iter_subpatterns(item)
+
+
+def _can_match_newline(items, dotall: bool) -> bool:
+    # Returns True if a parsed pattern, lookarounds included, can match a
+    # newline i.e. it can see across lines.
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            if av == 10:
+                return True
+        elif op is sre_parse.NOT_LITERAL:
+            if av != 10:
+                return True
+        elif op is sre_parse.ANY:
+            if dotall:
+                return True
+        elif op is sre_parse.IN:
+            if _in_matches_newline(av):
+                return True
+        elif op is sre_parse.SUBPATTERN:
+            # The scoped flags e.g. (?s:...) are only parsed since Python 3.6,
+            # where the subpattern is (group, add_flags, del_flags, p) instead
+            # of (group, p).
+            scoped_dotall = dotall
+            if len(av) == 4:
+                add_flags, del_flags = av[1], av[2]
+                scoped_dotall = (dotall or bool(add_flags & re.DOTALL)) and not del_flags & re.DOTALL
+
+            if _can_match_newline(av[-1], scoped_dotall):
+                return True
+        else:
+            for subpattern in _iter_subpatterns(av):
+                if _can_match_newline(subpattern, dotall):
+                    return True
+
+    return False
+
+
+@lru_cache(maxsize=128)
+def _compile_rfind_pattern(pattern: str, flags: int):
+    # Returns the pattern compiled as a Python regex, or None if the pattern
+    # can't be searched in reverse with a Python regex.
+    re_flags = re.MULTILINE
+    if flags & IGNORECASE:
+        re_flags |= re.IGNORECASE
+
+    if flags & LITERAL:
+        if '\n' in pattern:
+            return None
+
+        return re.compile(re.escape(pattern), re_flags)
+
+    if _RFIND_UNSUPPORTED_PATTERN.search(pattern):
+        return None
+
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            regex = re.compile(pattern, re_flags)
+
+            # A match of a pattern that can match across lines can begin before
+            # a chunk and change the matches after it, see _iter_rfind().
+            if _can_match_newline(sre_parse.parse(pattern, re_flags), bool(regex.flags & re.DOTALL)):
+                return None
+
+            return regex
+
+    # A RecursionError is a RuntimeError, which doesn't exist before Python 3.5.
+    # The parser internals differ between Python versions, so any unexpected
+    # parse tree falls back to the Sublime search too.
+    except (re.error, FutureWarning, DeprecationWarning, OverflowError, RuntimeError, TypeError, IndexError):
+        return None
+
+
+def _iter_rfind(view, regex, start_pt: int, stop_pt: int):
+    # Scans backwards from start_pt in exponentially growing chunks. Each chunk
+    # begins at the start of a line and ends at the end of the line containing
+    # the end of the chunk, so that anchors and lookarounds see the same context
+    # as they would in a forward search. The pattern can't match a newline, so
+    # no match can span the beginning of a chunk, and the matches of a chunk are
+    # the same as those of a forward search of the whole buffer.
+    size = _RFIND_CHUNK_SIZE
+    limit = start_pt
+    before = start_pt + 1
+    while True:
+        chunk_start = max(stop_pt, view.line(max(stop_pt, limit - size)).a)
+        context_start = view.line(chunk_start).a
+        text = view.substr(Region(context_start, view.full_line(limit).b))
+
+        matches = []
+        for match in regex.finditer(text, chunk_start - context_start):
+            a = match.start() + context_start
+            b = match.end() + context_start
+            if a >= before or b > limit:
+                break
+
+            matches.append((a, b))
+
+        for a, b in reversed(matches):
+            yield Region(a, b)
+
+        if chunk_start == stop_pt:
+            return
+
+        limit = before = chunk_start
+        size *= 2
+
+
 # There's no Sublime API to find patterns in reverse direction.
+# Returns the matches, nearest first, that end at or before start_pt and begin
+# at or after stop_pt.
 # @see https://github.com/SublimeTextIssues/Core/issues/245
-def view_rfind_all(view, pattern: str, start_pt: int, flags: int = 0):
+def view_rfind_all(view, pattern: str, start_pt: int, flags: int = 0, stop_pt: int = 0):
+    regex = _compile_rfind_pattern(pattern, flags)
+    if regex is not None:
+        return _iter_rfind(view, regex, start_pt, stop_pt)
+
     matches = view.find_all(pattern, flags)
     for region in matches:
         if region.b > start_pt:
-            return reversed(matches[:matches.index(region)])
+            matches = matches[:matches.index(region)]
+            break
 
-    return reversed(matches)
+    return reversed([region for region in matches if region.a >= stop_pt])
 
 
 # There's no Sublime API to find a pattern in reverse direction.
@@ -191,22 +359,32 @@ def view_find_in_range(view, pattern: str, pos: int, endpos: int, flags: int = 0
 # @see https://forum.sublimetext.com/t/find-pattern-returns-1-1-instead-of-none/43866
 # @see https://github.com/sublimehq/sublime_text/issues/2797
 # @see https://github.com/SublimeTextIssues/Core/issues/534
-# @todo Refactor to generator
 def view_find_all_in_range(view, pattern: str, pos: int, endpos: int, flags: int = 0) -> list:
-    matches = []
-    while pos <= endpos:
+    return list(iter_find_in_range(view, pattern, pos, endpos, flags))
+
+
+# Generator version of view_find_all_in_range(). The buffer is searched lazily,
+# one match at a time, and searching stops after {limit} matches, so callers
+# that only need the first few matches don't pay for the rest of the range.
+def iter_find_in_range(view, pattern: str, pos: int, endpos: int, flags: int = 0, limit: int = None):
+    count = 0
+    while pos <= endpos and (limit is None or count < limit):
         match = view.find(pattern, pos, flags)
-        if match is None or match.b == -1:
-            break
+        if match is None or match.b == -1 or match.b > endpos:
+            return
+
+        yield match
+        count += 1
 
         pos = match.b
         if match.size() == 0:
             pos += 1
 
-        if match.b <= endpos:
-            matches.append(match)
 
-    return matches
+# Same as iter_find_in_range(), in reverse i.e. the matches between pos and
+# endpos are yielded nearest to endpos first. See view_rfind_all().
+def iter_rfind_in_range(view, pattern: str, pos: int, endpos: int, flags: int = 0, limit: int = None):
+    return islice(view_rfind_all(view, pattern, endpos, flags, stop_pt=pos), limit)
 
 
 # Polyfill to work around bug in internal APIs.
@@ -0,0 +1,209 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# A keystroke latency profiler.
+#
+# Each key press fed to nv_feed_key is timed per stage and the timings are
+# recorded against the name of the command the key resolved to. The samples
+# are kept in fixed-size ring buffers per command and stage, together with a
+# histogram of all the samples. The profiler is disabled by default and is
+# controlled by the :NVProfile ex command. When disabled, the overhead on the
+# key press path is a flag check per stage.
+
+from array import array
+
+try:
+    from time import perf_counter_ns
+except ImportError:  # pragma: no cover
+    # Python < 3.7 e.g. the Sublime Text 3 plugin host.
+    from time import perf_counter
+
+    def perf_counter_ns() -> int:
+        return int(perf_counter() * 1000000000)
+
+from NeoVintageous.nv.regexes import get_regex_counts
+from NeoVintageous.nv.regexes import reset_regex_counts
+from NeoVintageous.nv.regexes import set_regex_counting
+
+STAGE_SELECTION_FIX = 'selection-fix'
+STAGE_MAPPING_RESOLUTION = 'mapping-resolution'
+STAGE_COMMAND_HANDLING = 'command-handling'
+STAGE_EVALUATE_STATE = 'evaluate-state'
+STAGE_RUN_COMMAND = 'run-command'
+STAGE_TOTAL = 'total'
+
+_STAGES = (
+    STAGE_SELECTION_FIX,
+    STAGE_MAPPING_RESOLUTION,
+    STAGE_COMMAND_HANDLING,
+    STAGE_EVALUATE_STATE,
+    STAGE_RUN_COMMAND,
+    STAGE_TOTAL,
+)
+
+# The upper bounds of the histogram buckets in nanoseconds. The last bucket is
+# unbounded. The frame budget is 16 ms.
+_BUCKETS = (100000, 250000, 500000, 1000000, 2000000, 4000000, 8000000, 16000000, 32000000, 64000000)
+
+_FRAME_BUDGET = 16000000
+
+_RING_SIZE = 1024
+
+
+class _RingBuffer:
+
+    __slots__ = ('samples', 'index', 'count', 'histogram')
+
+    def __init__(self, size: int = _RING_SIZE):
+        self.samples = array('q', bytes(8 * size))
+        self.index = 0
+        self.count = 0
+        self.histogram = [0] * (len(_BUCKETS) + 1)
+
+    def add(self, value: int) -> None:
+        self.samples[self.index] = value
+        self.index = (self.index + 1) % len(self.samples)
+        self.count += 1
+
+        bucket = 0
+        for bound in _BUCKETS:
+            if value <= bound:
+                break
+            bucket += 1
+
+        self.histogram[bucket] += 1
+
+    def percentiles(self, *percents) -> list:
+        samples = sorted(self.samples[:min(self.count, len(self.samples))])
+        if not samples:
+            return [0 for p in percents]
+
+        return [samples[min(len(samples) - 1, (len(samples) * p) // 100)] for p in percents]
+
+    def over_budget(self) -> int:
+        return sum(self.histogram[_BUCKETS.index(_FRAME_BUDGET) + 1:])
+
+
+_enabled = False
+
+# The timings of the key presses that are in progress. Keys can be nested, for
+# example a user mapping feeds the keys of its rhs while the lhs key is being
+# handled, so each key press has its own frame.
+_frames = []  # type: list
+
+# Command name -> stage -> _RingBuffer.
+_samples = {}  # type: dict
+
+
+def profiler_start() -> None:
+    global _enabled
+    _enabled = True
+    set_regex_counting(True)
+
+
+def profiler_stop() -> None:
+    global _enabled
+    _enabled = False
+    del _frames[:]
+    set_regex_counting(False)
+
+
+def profiler_reset() -> None:
+    _samples.clear()
+    del _frames[:]
+    reset_regex_counts()
+
+
+def is_profiling() -> bool:
+    return _enabled
+
+
+def profile_clock() -> int:
+    # Returns the start time of a stage, or zero if the profiler is disabled.
+    return perf_counter_ns() if _enabled else 0
+
+
+def profile_key_begin() -> None:
+    if _enabled:
+        _frames.append([None, perf_counter_ns(), {}])
+
+
+def profile_stage(stage: str, start: int) -> None:
+    if _enabled and start and _frames:
+        stages = _frames[-1][2]
+        stages[stage] = stages.get(stage, 0) + perf_counter_ns() - start
+
+
+def profile_command(name: str) -> None:
+    if _enabled and _frames:
+        _frames[-1][0] = name
+
+
+def profile_key_end(key: str) -> None:
+    if not (_enabled and _frames):
+        return
+
+    name, start, stages = _frames.pop()
+    stages[STAGE_TOTAL] = perf_counter_ns() - start
+
+    try:
+        command_samples = _samples[name or key]
+    except KeyError:
+        command_samples = _samples[name or key] = {}
+
+    for stage, elapsed in stages.items():
+        try:
+            command_samples[stage].add(elapsed)
+        except KeyError:
+            buffer = command_samples[stage] = _RingBuffer()
+            buffer.add(elapsed)
+
+
+def _format_ms(ns: int) -> str:
+    return '{:.3f}'.format(ns / 1000000)
+
+
+def profiler_report() -> str:
+    # Returns the p50/p95/p99 latency in milliseconds per command and stage,
+    # sorted by the p99 of the total key press latency (slowest first).
+    lines = ['%-40s %-20s %8s %9s %9s %9s %7s' % ('command', 'stage', 'count', 'p50', 'p95', 'p99', '>16ms')]
+
+    def _sort_key(item):
+        total = item[1].get(STAGE_TOTAL)
+
+        return -(total.percentiles(99)[0] if total else 0)
+
+    for name, command_samples in sorted(_samples.items(), key=_sort_key):
+        for stage in _STAGES:
+            buffer = command_samples.get(stage)
+            if buffer:
+                p50, p95, p99 = buffer.percentiles(50, 95, 99)
+                lines.append('%-40s %-20s %8d %9s %9s %9s %7d' % (
+                    name, stage, buffer.count, _format_ms(p50), _format_ms(p95), _format_ms(p99), buffer.over_budget()))
+
+    if len(lines) == 1:
+        lines.append('no samples' + ('' if _enabled else ' (profiler is not running, see :NVProfile start)'))
+
+    # The number of times each registered regex has been used, most used first.
+    regex_counts = sorted(((count, name) for name, count in get_regex_counts().items() if count), reverse=True)
+    if regex_counts:
+        lines.append('')
+        lines.append('%-40s %8s' % ('regex', 'count'))
+        for count, name in regex_counts:
+            lines.append('%-40s %8d' % (name, count))
+
+    return '\n'.join(lines)
@@ -0,0 +1,87 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# A registry of the regular expressions used on the key press path.
+#
+# The patterns are compiled once at import time, instead of being looked up in
+# the re module's cache on every call. While the profiler is running each regex
+# counts how many times it has been used, and the counts are shown by the
+# :NVProfile report. Otherwise the methods of a regex are those of the compiled
+# pattern, so there is no counting overhead. Modules on the key press path must
+# register their regexes here rather than pass literal patterns to the re
+# module, see tests/nv/test_regexes.py.
+
+import re
+
+# Name -> _Regex.
+_registry = {}  # type: dict
+
+# The methods of the compiled patterns that are counted.
+_METHODS = ('match', 'search', 'findall', 'finditer', 'split', 'sub')
+
+_counting = False
+
+
+class _Regex:
+
+    __slots__ = ('name', 'regex', 'count') + _METHODS
+
+    def __init__(self, name: str, pattern: str, flags: int = 0):
+        self.name = name
+        self.regex = re.compile(pattern, flags)
+        self.count = 0
+        self.set_counting(_counting)
+
+    @property
+    def pattern(self) -> str:
+        return self.regex.pattern
+
+    def set_counting(self, counting: bool) -> None:
+        for name in _METHODS:
+            method = getattr(self.regex, name)
+            setattr(self, name, self._counted(method) if counting else method)
+
+    def _counted(self, method):
+        def _count(*args, **kwargs):
+            self.count += 1
+            return method(*args, **kwargs)
+
+        return _count
+
+
+def register_regex(name: str, pattern: str, flags: int = 0) -> _Regex:
+    # Registering a name again replaces the regex, which happens when the
+    # plugin modules are reloaded.
+    regex = _registry[name] = _Regex(name, pattern, flags)
+
+    return regex
+
+
+def set_regex_counting(counting: bool) -> None:
+    global _counting
+    _counting = counting
+    for regex in _registry.values():
+        regex.set_counting(counting)
+
+
+def get_regex_counts() -> dict:
+    return {name: regex.count for name, regex in _registry.items()}
+
+
+def reset_regex_counts() -> None:
+    for regex in _registry.values():
+        regex.count = 0
@@ -15,66 +15,345 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
 import re
 
 from sublime import IGNORECASE
-from sublime import LITERAL
+from sublime import Region
+from sublime import set_timeout
+from sublime import set_timeout_async
 
 from NeoVintageous.nv.options import get_option
+from NeoVintageous.nv.pattern import translate_pattern
+from NeoVintageous.nv.polyfill import status_message
+from NeoVintageous.nv.settings import get_ex_substitute_last_replacement
+from NeoVintageous.nv.settings import get_setting
 from NeoVintageous.nv.settings import get_setting_neo
 from NeoVintageous.nv.ui import ui_region_flags
 
 
+# The pending incremental search per view. A new token is stored for every
+# pattern typed at the search prompt and the chunks scheduled for a previous
+# token are dropped, see add_incremental_search_highlighting().
+_incsearch_tokens = {}  # type: dict
+
+# The number of characters scanned by each asynchronous incremental search step.
+_INCSEARCH_CHUNK_SIZE = 1000000
+
+# The maximum number of matches collected by each asynchronous incremental
+# search step before yielding to check whether it has been cancelled.
+_INCSEARCH_CHUNK_MATCHES = 1000
+
+# The pending background search count per view, see show_search_count().
+_search_count_tokens = {}  # type: dict
+
+# The regions last added to the view per view and key. An entry is a tuple:
+#
+#   (change_count, regions)
+#
+# Regions are only sent to the view when they differ from the ones it already
+# has, e.g. "n" only updates the current match, see _update_regions().
+_highlighted = {}  # type: dict
+
+# The occurrences per view when there are more than the "hlsearch_max_regions"
+# setting, in which case only the ones around the visible region are added to
+# the view, see _add_occurrences_highlighting(). An entry is a tuple:
+#
+#   (token, change_count, occurrences, starts, visible)
+#
+# where visible is the visible region the occurrences were last added for.
+_limited_occurrences = {}  # type: dict
+
+# The occurrences returned by find_search_occurrences() per view. An entry is a
+# tuple of the _occurrences entry and the list of regions of its occurrences,
+# so that the regions are only created once per search.
+_occurrence_regions = {}  # type: dict
+
+# The intervals in milliseconds at which the visible region is checked for
+# scrolling, while it's scrolling and while it's idle. Scrolling with the mouse
+# doesn't run any commands, so the visible region is checked for as long as the
+# occurrences are highlighted. Text commands, e.g. motions, are checked at once
+# too, see search_on_post_text_command().
+_LIMITED_OCCURRENCES_REFRESH_INTERVAL = 200
+_LIMITED_OCCURRENCES_IDLE_INTERVAL = 1000
+
+
 def clear_search_highlighting(view) -> None:
+    _incsearch_tokens.pop(view.id(), None)
+    _highlighted.pop(view.id(), None)
+    _limited_occurrences.pop(view.id(), None)
     view.erase_regions('_nv_search_occ')
     view.erase_regions('_nv_search_cur')
     view.erase_regions('_nv_search_inc')
 
 
 def get_search_occurrences(view) -> list:
+    limited = _limited_occurrences.get(view.id())
+    if limited and limited[1] == view.change_count():
+        return list(limited[2])
+
     return view.get_regions('_nv_search_occ')
 
 
+def _update_regions(view, key: str, regions: list, scope: str, style: str) -> None:
+    highlighted = _highlighted.setdefault(view.id(), {})
+    entry = (view.change_count(), regions)
+    if highlighted.get(key, (None, [])) == entry:
+        return
+
+    highlighted[key] = entry
+
+    if regions:
+        view.add_regions(key, regions, scope=scope, flags=ui_region_flags(get_setting_neo(view, style)))
+    else:
+        view.erase_regions(key)
+
+
 def add_search_highlighting(view, occurrences: list, incremental: list = None) -> None:
     # Incremental search match string highlighting: while typing a search
     # command, where the pattern, as it was typed so far, matches.
-    if incremental and get_option(view, 'incsearch'):
-        view.add_regions(
-            '_nv_search_inc',
-            incremental,
-            scope='support.function neovintageous_search_inc',
-            flags=ui_region_flags(get_setting_neo(view, 'search_inc_style'))
-        )
+    if not (incremental and get_option(view, 'incsearch')):
+        incremental = []
+
+    _update_regions(
+        view,
+        '_nv_search_inc',
+        incremental,
+        scope='support.function neovintageous_search_inc',
+        style='search_inc_style'
+    )
 
     # Occurrences and current search match string highlighting: when there are
     # search matches, highlight all the matches and the current active one too.
-    if occurrences and get_option(view, 'hlsearch'):
-        view.add_regions(
-            '_nv_search_occ',
-            occurrences,
-            scope='string neovintageous_search_occ',
-            flags=ui_region_flags(get_setting_neo(view, 'search_occ_style'))
-        )
-
-        sels = []
-        for sel in view.sel():
-            if sel.empty():
-                sel.b += 1
-            sels.append(sel)
-
-        current = []
-        for region in occurrences:
-            for sel in sels:
-                if region.contains(sel):
-                    current.append(region)
-
-        if current:
-            view.add_regions(
-                '_nv_search_cur',
-                current,
-                scope='support.function neovintageous_search_cur',
-                flags=ui_region_flags(get_setting_neo(view, 'search_cur_style'))
-            )
+    if not (occurrences and get_option(view, 'hlsearch')):
+        occurrences = []
+
+    occurrences, starts = _sort_occurrences(view, occurrences)
+    _add_occurrences_highlighting(view, occurrences, starts)
+
+    current = _find_current_occurrences(view, occurrences, starts)
+    _update_regions(
+        view,
+        '_nv_search_cur',
+        current,
+        scope='support.function neovintageous_search_cur',
+        style='search_cur_style'
+    )
+
+
+def _sort_occurrences(view, occurrences: list) -> tuple:
+    # Returns the occurrences sorted by their begin points, and the begin
+    # points. The occurrences returned by find_search_occurrences() are already
+    # sorted, and their begin points are cached, see _occurrences.
+    cached = _occurrence_regions.get(view.id())
+    if cached and cached[1] is occurrences:
+        return occurrences, cached[0][1]
+
+    occurrences = sorted(occurrences, key=Region.begin)
+
+    return occurrences, [region.begin() for region in occurrences]
+
+
+def _find_current_occurrences(view, occurrences: list, starts) -> list:
+    # The occurrences, sorted by their begin points, that contain a selection.
+    # An empty selection is treated as the character after it. The occurrences
+    # don't overlap, so each selection is located with a bisect of the begin
+    # points, and is only contained by the occurrence that begins before it.
+    if not occurrences:
+        return []
+
+    current = set()
+    for sel in view.sel():
+        begin = sel.begin()
+        end = sel.end() if sel.b != sel.a else begin + 1
+        i = bisect_right(starts, begin) - 1
+        if i >= 0 and end <= occurrences[i].end():
+            current.add(i)
+
+    return [occurrences[i] for i in sorted(current)]
+
+
+def _add_occurrences_highlighting(view, occurrences: list, starts) -> None:
+    # Above the "hlsearch_max_regions" setting only the occurrences in and
+    # around the visible region are added to the view, and they're refreshed
+    # when the view is scrolled. The occurrences are sorted by their begin
+    # points, which are the starts.
+    maximum = get_setting(view, 'hlsearch_max_regions')
+    if not maximum or len(occurrences) <= maximum:
+        _limited_occurrences.pop(view.id(), None)
+        _update_occurrences_regions(view, occurrences)
+        return
+
+    token = object()
+    _limited_occurrences[view.id()] = (token, view.change_count(), occurrences, starts, None)
+    _refresh_limited_occurrences(view, token)
+
+
+def _update_occurrences_regions(view, occurrences: list) -> None:
+    _update_regions(
+        view,
+        '_nv_search_occ',
+        occurrences,
+        scope='string neovintageous_search_occ',
+        style='search_occ_style'
+    )
+
+
+def _refresh_limited_occurrences(view, token) -> None:
+    scrolled = _update_limited_occurrences(view, token)
+    if scrolled is None:
+        return
+
+    interval = _LIMITED_OCCURRENCES_REFRESH_INTERVAL if scrolled else _LIMITED_OCCURRENCES_IDLE_INTERVAL
+    set_timeout(lambda: _refresh_limited_occurrences(view, token), interval)
+
+
+def _update_limited_occurrences(view, token):
+    # Returns True if the visible region has scrolled since the occurrences
+    # were last added, False if it hasn't, and None if the occurrences are no
+    # longer highlighted.
+    limited = _limited_occurrences.get(view.id())
+    if not limited or limited[0] is not token or not view.is_valid():
+        return None
+
+    _, change_count, occurrences, starts, last_visible = limited
+    if change_count != view.change_count():
+        # The regions in the view have moved with the modifications.
+        del _limited_occurrences[view.id()]
+        return None
+
+    visible = view.visible_region()
+    if visible == last_visible:
+        return False
+
+    _limited_occurrences[view.id()] = (token, change_count, occurrences, starts, visible)
+
+    # The occurrences in the visible region and a screenful either side of it.
+    margin = visible.size()
+    i = bisect_right(starts, visible.begin() - margin)
+    j = bisect_right(starts, visible.end() + margin)
+    _update_occurrences_regions(view, occurrences[max(i - 1, 0):j])
+
+    return True
+
+
+def search_on_post_text_command(view) -> None:
+    # Text commands, e.g. motions and scrolling, may have moved the visible
+    # region when only the occurrences around it are highlighted.
+    limited = _limited_occurrences.get(view.id())
+    if limited:
+        _update_limited_occurrences(view, limited[0])
+
+
+def add_incremental_search_highlighting(view, pattern: str, flags: int, match: Region) -> None:
+    # Incremental search highlighting for the search prompt, which is run for
+    # every key typed. Buffers larger than the "incsearch_async_threshold"
+    # setting highlight the occurrences in the visible region first, and then
+    # the rest of the buffer is scanned in chunks asynchronously. Typing
+    # another key, or closing the prompt, cancels any pending chunks.
+    _incsearch_tokens.pop(view.id(), None)
+
+    threshold = get_setting(view, 'incsearch_async_threshold')
+    if not threshold or view.size() <= threshold or not get_option(view, 'hlsearch'):
+        add_search_highlighting(view, find_search_occurrences(view, pattern, flags), [match])
+        return
+
+    visible = _get_incsearch_region(view, match)
+    occurrences = list(_iter_find_all(view, pattern, flags, visible.a, visible.b))
+    add_search_highlighting(view, occurrences, [match])
+
+    token = _incsearch_tokens[view.id()] = object()
+    pos = max(visible.b, occurrences[-1].b) if occurrences else visible.b
+    chunks = _iter_incsearch_chunks(view, pattern, flags, visible.a, pos)
+    before = []  # type: list
+    after = []  # type: list
+    publishing = False
+
+    def _publish() -> None:
+        # The regions are added on the main thread, once for all of the chunks
+        # scanned since the previous time.
+        nonlocal publishing
+        publishing = False
+        if _incsearch_tokens.get(view.id()) is not token or not view.is_valid():
+            return
+
+        merged = before + occurrences + after
+        _add_occurrences_highlighting(view, merged, [region.begin() for region in merged])
+
+    def _step() -> None:
+        nonlocal publishing
+        if _incsearch_tokens.get(view.id()) is not token or not view.is_valid():
+            return
+
+        try:
+            chunk = next(chunks)
+        except StopIteration:
+            return
+
+        if chunk:
+            is_before, matches = chunk
+            (before if is_before else after).extend(matches)
+            if not publishing:
+                publishing = True
+                set_timeout(_publish)
+
+        set_timeout_async(_step)
+
+    set_timeout_async(_step)
+
+
+def _get_incsearch_region(view, match: Region) -> Region:
+    # The view is scrolled to the match after the highlighting is added, so if
+    # the match isn't visible then a region of the same size around it is used.
+    visible = view.visible_region()
+    if visible.contains(match):
+        return visible
+
+    half = max(visible.size() // 2, 1)
+
+    return Region(view.line(max(0, match.a - half)).a, view.line(min(view.size(), match.b + half)).b)
+
+
+def _iter_find_all(view, pattern: str, flags: int, pos: int, endpos: int):
+    # Yields the matches starting between pos and endpos. Each find resumes
+    # from the end of the previous match, so a gap between matches is only
+    # ever scanned once.
+    while pos < endpos:
+        match = view.find(pattern, pos, flags)
+        if match is None or match.b == -1 or match.a >= endpos:
+            return
+
+        yield match
+
+        pos = match.b if match.b > match.a else match.b + 1
+
+
+def _iter_incsearch_chunks(view, pattern: str, flags: int, visible_start: int, pos: int):
+    # Scans the buffer after the visible region and then the buffer before it
+    # (wrapping around like the search itself). Yields a (before, matches) tuple
+    # of the new matches whenever a chunk has been scanned, where before is True
+    # for the matches before the visible region, otherwise yields None whenever
+    # enough matches have been collected to check for cancellation.
+    for before, start, end in ((False, pos, view.size()), (True, 0, visible_start)):
+        boundary = start + _INCSEARCH_CHUNK_SIZE
+        matches = []  # type: list
+        collected = 0
+        for match in _iter_find_all(view, pattern, flags, start, end):
+            matches.append(match)
+            collected += 1
+            if match.b >= boundary:
+                boundary = match.b + _INCSEARCH_CHUNK_SIZE
+                collected = 0
+                yield before, matches
+                matches = []
+            elif collected >= _INCSEARCH_CHUNK_MATCHES:
+                collected = 0
+                yield None
+
+        if matches:
+            yield before, matches
 
 
 def is_smartcase_pattern(view, pattern: str) -> bool:
@@ -82,82 +361,21 @@ def is_smartcase_pattern(view, pattern: str) -> bool:
 
 
 def process_search_pattern(view, pattern: str) -> tuple:
-    flags = 0
+    # The translations are cached by the pattern and the options that affect
+    # them, so repeated searches e.g. "n" and incremental search keystrokes
+    # that revisit a pattern don't translate it again.
+    return translate_pattern(
+        pattern,
+        bool(get_option(view, 'ignorecase')),
+        bool(get_option(view, 'smartcase')),
+        bool(get_option(view, 'magic')),
+        get_ex_substitute_last_replacement() if '~' in pattern else None
+    )
 
-    if get_option(view, 'ignorecase') and not is_smartcase_pattern(view, pattern):
-        flags |= IGNORECASE
 
-    # Changes the special characters that can be used in search patterns.
-    is_magic = get_option(view, 'magic')
-
-    # Pattern modes can be specified anywhere within the pattern itself and the
-    # effect of the mode applies to the entire pattern:
-    #
-    # \c  ignore case, do not use the 'ignorecase' option
-    # \C  match case, do not use the 'ignorecase' option
-    pattern_modes = set()
-
-    def _add_pattern_mode(match) -> str:
-        pattern_modes.add(match.group(1))
-        return ''
-
-    pattern = re.sub('\\\\([cC])', _add_pattern_mode, pattern)
-    for m in pattern_modes:
-        if m == 'c':
-            flags |= IGNORECASE
-        elif m == 'C':
-            flags &= ~IGNORECASE
-
-    # Some characters in the pattern are taken literally. They match with the
-    # same character in the text. When preceded with a backslash however, these
-    # characters get a special meaning. See :help magic for more details.
-    #
-    # Patterns can be prefixed by a "mode" that overrides the 'magic' option:
-    #
-    #   \m    'magic' on for the following chars in the pattern.
-    #   \M    'magic' off for the following chars in the pattern.
-    #   \v    the following chars in the pattern are "very magic".
-    #   \V    the following chars int the pattern are "very nomagic".
-    mode = None
-    match = re.match('^\\\\(m|M|v|V)(.*)$', pattern)
-    if match:
-        mode = match.group(1)
-        pattern = match.group(2)
-
-    def _process_magic(pattern, flags):
-        # When magic is on some characters in a pattern are interpreted
-        # literally depending on context. For example [0-9 is interpreted
-        # literally and [0-9] is interpreted as a regular expression.
-        # XXX The following is a quick and dirty implementation to support some
-        # very basic 'magic' literal interpretations.
-        if pattern:
-            if re.match('^[a-zA-Z0-9_\'"\\[\\]]+$', pattern):
-                if '[' not in pattern or ']' not in pattern:
-                    flags |= LITERAL
-
-            elif re.match('^[a-zA-Z0-9_\'"\\(\\)]+$', pattern):
-                if '(' not in pattern or ')' not in pattern:
-                    flags |= LITERAL
-
-        return pattern, flags
-
-    # magic
-    if mode == 'm' or (is_magic and not mode):
-        pattern, flags = _process_magic(pattern, flags)
-
-    # very magic
-    elif mode == 'v':
-        pattern, flags = _process_magic(pattern, flags)
-
-    # nomagic
-    elif mode == 'M' or (not is_magic and not mode):
-        flags |= LITERAL
-
-    # very nomagic
-    elif mode == 'V':
-        flags |= LITERAL
-
-    return pattern, flags
+@lru_cache(maxsize=128)
+def _word_search_pattern(word: str) -> str:
+    return r'\b{0}\b'.format(re.escape(word))
 
 
 def process_word_search_pattern(view, pattern: str) -> tuple:
@@ -166,14 +384,130 @@ def process_word_search_pattern(view, pattern: str) -> tuple:
     if get_option(view, 'ignorecase'):
         flags |= IGNORECASE
 
-    pattern = r'\b{0}\b'.format(re.escape(pattern))
+    return _word_search_pattern(pattern), flags
+
+
+# The occurrences of the last pattern searched per view. An entry is a tuple:
+#
+#   ((change_count, pattern, flags), starts, ends)
+#
+# where starts and ends are arrays of the sorted begin and end points of the
+# occurrences. The occurrences don't overlap, so both arrays are sorted, and
+# "next occurrence from point" queries are a bisect. An entry is stale as soon
+# as the buffer is modified, and is replaced on the next search or evicted when
+# the view is closed, see search_on_close().
+_occurrences = {}  # type: dict
+
 
-    return pattern, flags
+def _get_occurrences(view, pattern: str, flags: int) -> tuple:
+    key = (view.change_count(), pattern, flags)
+    try:
+        entry = _occurrences[view.id()]
+        if entry[0] == key:
+            return entry
+    except KeyError:
+        pass
+
+    starts = array('l')
+    ends = array('l')
+    for region in view.find_all(pattern, flags):
+        starts.append(region.a)
+        ends.append(region.b)
+
+    entry = _occurrences[view.id()] = (key, starts, ends)
+
+    return entry
+
+
+def get_cached_search_occurrences(view, pattern: str, flags: int):
+    # Returns the (starts, ends) arrays of the cached occurrences, or None if
+    # they aren't cached for the current buffer. Unlike the other functions,
+    # this never searches the buffer.
+    try:
+        key, starts, ends = _occurrences[view.id()]
+    except KeyError:
+        return None
+
+    if key != (view.change_count(), pattern, flags):
+        del _occurrences[view.id()]
+        return None
+
+    return starts, ends
+
+
+def search_on_close(view) -> None:
+    _incsearch_tokens.pop(view.id(), None)
+    _search_count_tokens.pop(view.id(), None)
+    _occurrences.pop(view.id(), None)
+    _occurrence_regions.pop(view.id(), None)
+    _highlighted.pop(view.id(), None)
+    _limited_occurrences.pop(view.id(), None)
 
 
 def find_search_occurrences(view, pattern: str, flags: int) -> list:
-    return view.find_all(pattern, flags)
+    # The returned list is shared by the calls for the same occurrences, so it
+    # must not be modified.
+    entry = _get_occurrences(view, pattern, flags)
+    cached = _occurrence_regions.get(view.id())
+    if cached is None or cached[0] is not entry:
+        cached = _occurrence_regions[view.id()] = (entry, list(map(Region, entry[1], entry[2])))
+
+    return cached[1]
 
 
 def find_word_search_occurrences(view, pattern: str, flags: int) -> list:
-    return view.find_all(pattern, flags)
+    return find_search_occurrences(view, pattern, flags)
+
+
+def _format_search_count(index: int, total: int, maxcount: int) -> str:
+    def _format(count: int) -> str:
+        return '>%s' % maxcount if count > maxcount else str(count)
+
+    return '[%s/%s]' % (_format(index), _format(total))
+
+
+def show_search_count(view, pattern: str, flags: int) -> None:
+    # Shows the index of the match at the cursor and the total number of
+    # matches e.g. "[12/4031]", see :help shortmess-S. The index is a bisect of
+    # the cached occurrences, so repeating a search doesn't search the buffer.
+    # If the occurrences aren't cached then they're counted in the background,
+    # and counting stops after the "search_count_max" setting e.g. ">999".
+    _search_count_tokens.pop(view.id(), None)
+
+    maxcount = get_setting(view, 'search_count_max')
+    if not maxcount or len(view.sel()) == 0:
+        return
+
+    pt = view.sel()[0].begin()
+
+    cached = get_cached_search_occurrences(view, pattern, flags)
+    if cached is not None:
+        starts = cached[0]
+        status_message(_format_search_count(bisect_right(starts, pt), len(starts), maxcount))
+        return
+
+    token = _search_count_tokens[view.id()] = object()
+    change_count = view.change_count()
+
+    def _count() -> None:
+        if _search_count_tokens.get(view.id()) is not token or not view.is_valid():
+            return
+
+        del _search_count_tokens[view.id()]
+
+        if view.change_count() != change_count:
+            return
+
+        index = 0
+        total = 0
+        for match in _iter_find_all(view, pattern, flags, 0, view.size()):
+            total += 1
+            if match.a <= pt:
+                index = total
+
+            if total > maxcount:
+                break
+
+        status_message(_format_search_count(index, total, maxcount))
+
+    set_timeout_async(_count)
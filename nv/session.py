@@ -1,12 +1,65 @@
-from collections import defaultdict
 import json
 import os
 import traceback
 
 from sublime import packages_path
 
+from NeoVintageous.nv.vim import UNKNOWN
+
 _session = {}
-_views = defaultdict(dict)  # type: dict
+
+
+class ViewState:
+    # The volatile per-view state, e.g. the mode and the command being built.
+    #
+    # An instance is created lazily per view by get_view_state() and freed by
+    # session_on_close(). The slots are plain attributes so that the per-key
+    # getters and setters in the settings module are attribute accesses rather
+    # than nested dict lookups.
+
+    __slots__ = (
+        'action',
+        'action_count',
+        'glue_until_normal_mode',
+        'interactive',
+        'mode',
+        'motion',
+        'motion_count',
+        'must_capture_register_name',
+        'normal_insert_count',
+        'partial_sequence',
+        'processing_notation',
+        'query_context',
+        'register',
+        'repeat_data',
+        'sequence',
+        'xpos',
+    )
+
+    def __init__(self):
+        self.glue_until_normal_mode = False
+        self.interactive = True
+        self.mode = UNKNOWN
+        self.normal_insert_count = 1
+        self.processing_notation = False
+        self.query_context = None
+        self.repeat_data = None
+        self.xpos = 0
+        self.reset_command()
+
+    def reset_command(self) -> None:
+        # Resets all the data needed to build a command or partial command.
+        self.action = None
+        self.action_count = ''
+        self.motion = None
+        self.motion_count = ''
+        self.must_capture_register_name = False
+        self.partial_sequence = ''
+        self.register = '"'
+        self.sequence = ''
+
+
+_views = {}  # type: dict
 
 
 def session_on_close(view) -> None:
@@ -76,12 +129,21 @@ def set_session_value(name: str, value, persist: bool = False) -> None:
         save_session()
 
 
-def get_session_view_value(view, name: str, default=None):
+def get_view_state(view) -> ViewState:
+    view_id = view.id()
     try:
-        return _views[view.id()][name]
+        return _views[view_id]
     except KeyError:
+        state = _views[view_id] = ViewState()
+        return state
+
+
+def get_session_view_value(view, name: str, default=None):
+    try:
+        return getattr(_views[view.id()], name)
+    except (KeyError, AttributeError):
         return default
 
 
 def set_session_view_value(view, name: str, value) -> None:
-    _views[view.id()][name] = value
+    setattr(get_view_state(view), name, value)
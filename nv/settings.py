@@ -21,11 +21,9 @@ from sublime import active_window
 
 from NeoVintageous.nv.polyfill import save_preferences
 from NeoVintageous.nv.session import get_session_value
-from NeoVintageous.nv.session import get_session_view_value
+from NeoVintageous.nv.session import get_view_state
 from NeoVintageous.nv.session import set_session_value
-from NeoVintageous.nv.session import set_session_view_value
 from NeoVintageous.nv.vim import DIRECTION_DOWN
-from NeoVintageous.nv.vim import UNKNOWN
 
 
 def get_setting(view, name: str, default=None):
@@ -62,14 +60,14 @@ def get_setting_neo(view, name: str):
 
 
 def get_action_count(view) -> str:
-    return get_session_view_value(view, 'action_count', '')
+    return get_view_state(view).action_count
 
 
 def set_action_count(view, value: str) -> None:
     # TODO Is this check necessary; this was an assertion which are disabled in <4000 which is good
     if value != '' and not value.isdigit():
         raise ValueError()
-    set_session_view_value(view, 'action_count', value)
+    get_view_state(view).action_count = value
 
 
 def get_cmdline_cwd() -> str:
@@ -181,15 +179,18 @@ def get_mode(view) -> str:
     # State of current mode. It isn't guaranteed that the underlying view's
     # .sel() will be in a consistent state (for example, that it will at least
     # have one non- empty region in visual mode.
-    return get_session_view_value(view, 'mode', UNKNOWN)
+    return get_view_state(view).mode
 
 
 def set_mode(view, value: str) -> None:
-    set_session_view_value(view, 'mode', value)
+    state = get_view_state(view)
+    state.mode = value
+    # The query context caches the handle_keys table of the current mode.
+    state.query_context = None
 
 
 def get_motion_count(view) -> str:
-    return get_session_view_value(view, 'motion_count', '')
+    return get_view_state(view).motion_count
 
 
 def set_motion_count(view, value: str) -> None:
@@ -197,7 +198,7 @@ def set_motion_count(view, value: str) -> None:
     if value != '' and not value.isdigit():
         raise ValueError()
 
-    set_session_view_value(view, 'motion_count', value)
+    get_view_state(view).motion_count = value
 
 
 # This setting isn't reset automatically. nv_enter_normal_mode mode must take care
@@ -205,32 +206,32 @@ def set_motion_count(view, value: str) -> None:
 def get_normal_insert_count(view) -> int:
     # Count issued to 'i' or 'a', etc. These commands enter insert mode. If
     # passed a count, they must repeat the commands run while in insert mode.
-    return int(get_session_view_value(view, 'normal_insert_count', 1))
+    return int(get_view_state(view).normal_insert_count)
 
 
 def set_normal_insert_count(view, value: int) -> None:
-    set_session_view_value(view, 'normal_insert_count', value)
+    get_view_state(view).normal_insert_count = value
 
 
 def is_interactive(view) -> bool:
     # See set_interactive().
-    return get_session_view_value(view, 'interactive', True)
+    return get_view_state(view).interactive
 
 
 def set_interactive(view, value: bool) -> None:
     # Indicate if prompts should be interactive or suppressed (non-interactive).
     # For example, cmdline and search input collecting: :ls<CR> and /foo<CR>.
-    set_session_view_value(view, 'interactive', value)
+    get_view_state(view).interactive = value
 
 
 def get_partial_sequence(view) -> str:
     # Sometimes we need to store a partial sequence to obtain the commands' full
     # name. Such is the case of `gD`, for example.
-    return get_session_view_value(view, 'partial_sequence', '')
+    return get_view_state(view).partial_sequence
 
 
 def set_partial_sequence(view, value: str) -> None:
-    set_session_view_value(view, 'partial_sequence', value)
+    get_view_state(view).partial_sequence = value
 
 
 def is_processing_notation(view) -> bool:
@@ -241,38 +242,38 @@ def is_processing_notation(view) -> bool:
     # interactive sequence of commands.
     #
     # This property is *VOLATILE*; it shouldn't be persisted between sessions.
-    return get_session_view_value(view, 'processing_notation', False)
+    return get_view_state(view).processing_notation
 
 
 def set_processing_notation(view, value: bool) -> None:
-    return set_session_view_value(view, 'processing_notation', value)
+    get_view_state(view).processing_notation = value
 
 
 def get_register(view) -> str:
-    return get_session_view_value(view, 'register', '"')
+    return get_view_state(view).register
 
 
 def set_register(view, value: str) -> None:
     assert len(str(value)) == 1, '`value` must be a character'  # TODO Remove assertion
-    set_session_view_value(view, 'register', value)
+    get_view_state(view).register = value
     set_must_capture_register_name(view, False)
 
 
 def get_xpos(view) -> int:
-    return get_session_view_value(view, 'xpos', 0)
+    return get_view_state(view).xpos
 
 
 def set_xpos(view, value: int) -> None:
     assert isinstance(value, int), '`value` must be an int'  # TODO Remove assertion
-    set_session_view_value(view, 'xpos', value)
+    get_view_state(view).xpos = value
 
 
 def is_must_capture_register_name(view) -> bool:
-    return get_session_view_value(view, 'must_capture_register_name', False)
+    return get_view_state(view).must_capture_register_name
 
 
 def set_must_capture_register_name(view, value: bool) -> None:
-    set_session_view_value(view, 'must_capture_register_name', value)
+    get_view_state(view).must_capture_register_name = value
 
 
 def set_repeat_data(view, data: tuple) -> None:
@@ -303,11 +304,11 @@ def set_repeat_data(view, data: tuple) -> None:
     #
     assert isinstance(data, tuple) or isinstance(data, list), 'bad call'  # TODO remove assertion
     assert len(data) == 4, 'bad call'  # TODO remove assertion
-    set_session_view_value(view, 'repeat_data', data)
+    get_view_state(view).repeat_data = data
 
 
 def get_repeat_data(view):
-    return get_session_view_value(view, 'repeat_data')
+    return get_view_state(view).repeat_data
 
 
 def get_reset_during_init(view) -> bool:
@@ -322,11 +323,11 @@ def set_reset_during_init(view, value: bool) -> None:
 
 
 def get_sequence(view) -> str:
-    return get_session_view_value(view, 'sequence', '')
+    return get_view_state(view).sequence
 
 
 def set_sequence(view, value: str) -> None:
-    set_session_view_value(view, 'sequence', value)
+    get_view_state(view).sequence = value
 
 
 def append_sequence(view, value: str) -> None:
@@ -338,11 +339,11 @@ def get_glue_until_normal_mode(view) -> bool:
     # grouped together in a single undo step after the user requested
     # `nv_enter_normal_mode` next. This property is *VOLATILE*; it shouldn't be
     # persisted between sessions.
-    return get_session_view_value(view, 'glue_until_normal_mode', False)
+    return get_view_state(view).glue_until_normal_mode
 
 
 def set_glue_until_normal_mode(view, value: bool) -> None:
-    set_session_view_value(view, 'glue_until_normal_mode', value)
+    get_view_state(view).glue_until_normal_mode = value
 
 
 def get_visual_block_direction(view, default: int = DIRECTION_DOWN) -> int:
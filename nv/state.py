@@ -16,15 +16,17 @@
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
 import logging
+import os
 
 from sublime import active_window
 
 from NeoVintageous.nv import macros
-from NeoVintageous.nv import plugin
 from NeoVintageous.nv.macros import add_macro_step
 from NeoVintageous.nv.polyfill import run_window_command
-from NeoVintageous.nv.session import get_session_view_value
-from NeoVintageous.nv.session import set_session_view_value
+from NeoVintageous.nv.profiler import STAGE_RUN_COMMAND
+from NeoVintageous.nv.profiler import profile_clock
+from NeoVintageous.nv.profiler import profile_stage
+from NeoVintageous.nv.session import get_view_state
 from NeoVintageous.nv.settings import get_glue_until_normal_mode
 from NeoVintageous.nv.settings import get_mode
 from NeoVintageous.nv.settings import get_reset_during_init
@@ -32,20 +34,13 @@ from NeoVintageous.nv.settings import get_sequence
 from NeoVintageous.nv.settings import get_setting
 from NeoVintageous.nv.settings import is_interactive
 from NeoVintageous.nv.settings import is_processing_notation
-from NeoVintageous.nv.settings import set_action_count
 from NeoVintageous.nv.settings import set_mode
-from NeoVintageous.nv.settings import set_motion_count
-from NeoVintageous.nv.settings import set_must_capture_register_name
-from NeoVintageous.nv.settings import set_partial_sequence
-from NeoVintageous.nv.settings import set_register
 from NeoVintageous.nv.settings import set_repeat_data
 from NeoVintageous.nv.settings import set_reset_during_init
-from NeoVintageous.nv.settings import set_sequence
 from NeoVintageous.nv.utils import get_visual_repeat_data
 from NeoVintageous.nv.utils import is_view
 from NeoVintageous.nv.utils import save_previous_selection
 from NeoVintageous.nv.utils import update_xpos
-from NeoVintageous.nv.vi import cmd_defs
 from NeoVintageous.nv.vi.cmd_base import ViMotionDef
 from NeoVintageous.nv.vi.cmd_base import ViOperatorDef
 from NeoVintageous.nv.vi.cmd_defs import ViToggleMacroRecorder
@@ -69,6 +64,11 @@ from NeoVintageous.nv.vim import run_motion
 
 _log = logging.getLogger(__name__)
 
+# See plugin.py. Debug builds count the command definition instantiations.
+_DEBUG = bool(os.getenv('SUBLIME_NEOVINTAGEOUS_DEBUG'))
+
+_definition_stats = {'instantiations': 0}
+
 
 def update_status_line(view) -> None:
     mode_name = mode_to_name(get_mode(view))
@@ -145,36 +145,44 @@ def _scroll_into_view(view, mode: str) -> None:
     view.show(target_pt, False)
 
 
-def _create_definition(view, name: str):
-    cmd = get_session_view_value(view, name)
-    if cmd:
-        cls = getattr(cmd_defs, cmd['name'], None)
+def _own_definition(value):
+    # Definitions resolved from the key mappings are instances shared by all
+    # views. Definitions that collect input are mutated by accept(), so the
+    # state takes its own copy of those. All other definitions are immutable
+    # once registered and are kept as is.
+    if value is None or not value.accept_input:
+        return value
+
+    if _DEBUG:
+        _definition_stats['instantiations'] += 1
 
-        if cls is None:
-            cls = plugin.classes.get(cmd['name'], None)
+    return value.from_json(value.serialize()['data'])
 
-        if cls is None:
-            ValueError('unknown %s: %s' % (name, cmd))
 
-        return cls.from_json(cmd['data'])
+def get_definition_instantiations() -> int:
+    # The number of command definitions instantiated by the state. Only counted
+    # when debugging is enabled, see SUBLIME_NEOVINTAGEOUS_DEBUG.
+    return _definition_stats['instantiations']
 
 
 def get_action(view):
-    return _create_definition(view, 'action')
+    return get_view_state(view).action
 
 
 def set_action(view, value) -> None:
-    serialized = value.serialize() if value else None
-    set_session_view_value(view, 'action', serialized)
+    state = get_view_state(view)
+    if value is not state.action:
+        state.action = _own_definition(value)
 
 
 def get_motion(view):
-    return _create_definition(view, 'motion')
+    return get_view_state(view).motion
 
 
 def set_motion(view, value) -> None:
-    serialized = value.serialize() if value else None
-    set_session_view_value(view, 'motion', serialized)
+    state = get_view_state(view)
+    if value is not state.motion:
+        state.motion = _own_definition(value)
 
 
 def reset_command_data(view) -> None:
@@ -193,15 +201,8 @@ def reset_command_data(view) -> None:
             _scroll_into_view(active_view, get_mode(active_view))
 
     action and action.reset()
-    set_action(view, None)
     motion and motion.reset()
-    set_motion(view, None)
-    set_action_count(view, '')
-    set_motion_count(view, '')
-    set_sequence(view, '')
-    set_partial_sequence(view, '')
-    set_register(view, '"')
-    set_must_capture_register_name(view, False)
+    get_view_state(view).reset_command()
     reset_status_line(view, get_mode(view))
 
 
@@ -283,7 +284,9 @@ def evaluate_state(view) -> None:
 
         add_macro_step(view, action_cmd['action'], args)
 
+        start = profile_clock()
         run_window_command(action_cmd['action'], args)
+        profile_stage(STAGE_RUN_COMMAND, start)
 
         if is_interactive(view) and get_action(view).repeatable:
             set_repeat_data(view, ('vi', str(get_sequence(view)), get_mode(view), None))
@@ -302,7 +305,9 @@ def evaluate_state(view) -> None:
 
         add_macro_step(view, motion_cmd['motion'], motion_cmd['motion_args'])
 
+        start = profile_clock()
         run_motion(view, motion_cmd)
+        profile_stage(STAGE_RUN_COMMAND, start)
 
     if action:
         action_cmd = action.translate(view)
@@ -337,7 +342,9 @@ def evaluate_state(view) -> None:
 
         add_macro_step(view, action_cmd['action'], action_cmd['action_args'])
 
+        start = profile_clock()
         run_action(active_window(), action_cmd)
+        profile_stage(STAGE_RUN_COMMAND, start)
 
         if not (is_processing_notation(view) and get_glue_until_normal_mode(view)) and action.repeatable:
             set_repeat_data(view, ('vi', sequence, get_mode(view), visual_repeat_data))
@@ -0,0 +1,161 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# A keystroke trace recorder.
+#
+# Records the keys fed to nv_feed_key and nv_process_notation, and the native
+# text commands run while typing in insert mode, together with the initial
+# buffer text. The trace is saved in JSON lines format, the first line is the
+# header, the last line is the footer, and each line in between is an event:
+#
+#   {"version": 1, "text": "fizz\n", "sel": [[0, 0]], "mode": "mode_normal"}
+#   ["k", 0.0, "mode_normal", "w", null, true]
+#   ["n", 0.25, "mode_normal", "dw", null, true]
+#   ["t", 0.5, "mode_insert", "insert", {"characters": "x"}]
+#   {"hash": "...", "size": 5}
+#
+# The event fields are type, time in seconds since the start of recording,
+# mode, and the command arguments:
+#
+#   k - nv_feed_key key, repeat_count, check_user_mappings
+#   n - nv_process_notation keys, repeat_count, check_user_mappings
+#   t - native text command name and args
+#
+# The footer is the SHA-1 hash and size of the final buffer, which is used by
+# the replay benchmarks to check that a replay ends with the same buffer. See
+# NeoVintageous.tests.benchmarks.replay.
+
+import hashlib
+import json
+import os
+import time
+
+from NeoVintageous.nv.polyfill import view_to_region
+from NeoVintageous.nv.settings import get_mode
+
+TRACE_KEY = 'k'
+TRACE_NOTATION = 'n'
+TRACE_TEXT_COMMAND = 't'
+
+_TRACE_VERSION = 1
+
+# The native text commands that are recorded when typing in insert mode.
+_TEXT_COMMANDS = ('insert', 'left_delete', 'right_delete', 'insert_snippet')
+
+_recording = None  # type: dict
+
+# Keys fed by other keys, for example the rhs of a mapping, the keys of a
+# notation, or the "." command, are not recorded because they are replayed by
+# the recorded key.
+_depth = [0]
+
+
+def buffer_hash(view) -> str:
+    return hashlib.sha1(view.substr(view_to_region(view)).encode('utf-8')).hexdigest()
+
+
+def is_tracing() -> bool:
+    return _recording is not None
+
+
+def trace_start(view) -> None:
+    global _recording
+    _recording = {
+        'view': view,
+        'start': time.perf_counter(),
+        'header': {
+            'version': _TRACE_VERSION,
+            'text': view.substr(view_to_region(view)),
+            'sel': [[s.a, s.b] for s in view.sel()],
+            'mode': get_mode(view),
+        },
+        'events': [],
+    }
+    _depth[0] = 0
+
+
+def trace_stop(file_name: str) -> int:
+    # Saves the trace and returns the number of events saved.
+    global _recording
+    if _recording is None:
+        raise ValueError('no trace is being recorded')
+
+    recording = _recording
+    _recording = None
+
+    events = recording['events']
+
+    # The trace is usually stopped with the :NVTrace command, in which case
+    # the last event is the key that opened the command-line.
+    if events and events[-1][0] == TRACE_KEY and events[-1][3] == ':':
+        events.pop()
+
+    view = recording['view']
+
+    os.makedirs(os.path.dirname(os.path.abspath(file_name)), exist_ok=True)
+    with open(file_name, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(recording['header']) + '\n')
+        for event in events:
+            f.write(json.dumps(event) + '\n')
+
+        f.write(json.dumps({'hash': buffer_hash(view), 'size': view.size()}) + '\n')
+
+    return len(events)
+
+
+def _append(view, event_type: str, args: list) -> None:
+    _recording['events'].append(
+        [event_type, round(time.perf_counter() - _recording['start'], 4), get_mode(view)] + args)
+
+
+def trace_enter(window, event_type: str, *args) -> None:
+    if _recording is None:
+        return
+
+    if _depth[0] == 0:
+        _append(window.active_view(), event_type, list(args))
+
+    _depth[0] += 1
+
+
+def trace_exit() -> None:
+    if _recording is not None and _depth[0] > 0:
+        _depth[0] -= 1
+
+
+def trace_text_command(view, command: str, args: dict) -> None:
+    if _recording is not None and _depth[0] == 0 and command in _TEXT_COMMANDS:
+        if view == _recording['view']:
+            _append(view, TRACE_TEXT_COMMAND, [command, args])
+
+
+def load_trace(file_name: str) -> dict:
+    # Returns a dict with the header, events, and footer of a saved trace.
+    with open(file_name, encoding='utf-8') as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+
+    if len(lines) < 2 or not isinstance(lines[0], dict) or not isinstance(lines[-1], dict):
+        raise ValueError('invalid trace: %s' % file_name)
+
+    if lines[0].get('version') != _TRACE_VERSION:
+        raise ValueError('unsupported trace version: %s' % file_name)
+
+    return {
+        'header': lines[0],
+        'events': lines[1:-1],
+        'footer': lines[-1],
+    }
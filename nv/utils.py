@@ -33,7 +33,6 @@
 
 from contextlib import contextmanager
 from collections import Counter
-import re
 
 from sublime import Region
 from sublime import View
@@ -41,6 +40,7 @@ from sublime import View
 from NeoVintageous.nv.options import get_option
 from NeoVintageous.nv.polyfill import spell_add
 from NeoVintageous.nv.polyfill import spell_undo
+from NeoVintageous.nv.regexes import register_regex
 from NeoVintageous.nv.settings import get_visual_block_direction
 from NeoVintageous.nv.settings import set_mode
 from NeoVintageous.nv.settings import set_processing_notation
@@ -388,6 +388,10 @@ def wrapscan(view, forward: bool = True):
                     break
 
 
+_NON_WHITESPACE_PATTERN = register_regex('utils.non_whitespace', '[^\\s]+')
+_FILE_NAME_PATTERN = register_regex('utils.file_name', '^[a-zA-Z0-9\\._/-]+$')
+
+
 def extract_file_name(view):
     sel = view.sel()[0]
     line = view.substr(view.line(sel))
@@ -397,30 +401,31 @@ def extract_file_name(view):
     if pos > col:
         return
 
-    matches = re.findall('[^\\s]+', line)
+    matches = _NON_WHITESPACE_PATTERN.findall(line)
     if matches:
         for match in matches:
             pos += len(match)
             if pos >= col:
-                if not re.match('^[a-zA-Z0-9\\._/-]+$', match):
+                if not _FILE_NAME_PATTERN.match(match):
                     return
 
                 return match
 
 
+_URL_PATTERN = register_regex('utils.url', r"""(?x)
+    .*(?P<url>
+        https?://               # http:// or https://
+        (?:www\.)?              # www.
+        (?:[a-zA-Z0-9-]+\.)+    # domain
+        [a-zA-Z]+               # tld
+        /?[a-zA-Z0-9\-._?,!'(){}\[\]/+&@%$#=:"|~;]*     # url path
+    )
+""")
+
+
 def extract_url(view):
-    _URL_REGEX = r"""(?x)
-        .*(?P<url>
-            https?://               # http:// or https://
-            (?:www\.)?              # www.
-            (?:[a-zA-Z0-9-]+\.)+    # domain
-            [a-zA-Z]+               # tld
-            /?[a-zA-Z0-9\-._?,!'(){}\[\]/+&@%$#=:"|~;]*     # url path
-        )
-    """
-
-    def _extract_url_from_text(regex: str, text: str):
-        match = re.match(regex, text)
+    def _extract_url_from_text(text: str):
+        match = _URL_PATTERN.match(text)
         if match:
             url = match.group('url')
 
@@ -450,7 +455,7 @@ def extract_url(view):
     line = view.line(sel)
     text = view.substr(line)
 
-    return _extract_url_from_text(_URL_REGEX, text)
+    return _extract_url_from_text(text)
 
 
 def extract_word(view, mode: str, sel) -> str:
@@ -15,9 +15,11 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+from functools import lru_cache
 import re
 
 from NeoVintageous.nv import variables
+from NeoVintageous.nv.regexes import register_regex
 from NeoVintageous.nv.vi import seqs
 from NeoVintageous.nv.vim import INSERT
 from NeoVintageous.nv.vim import NORMAL
@@ -39,7 +41,7 @@ mappings = {
 }  # type: dict
 
 
-_NAMED_KEYS = [
+_NAMED_KEYS = frozenset((
 
     seqs.BACKSLASH,
     seqs.BACKSPACE,
@@ -98,7 +100,7 @@ _NAMED_KEYS = [
     seqs.F19,
     seqs.F20,
 
-]
+))
 
 
 _NAMED_KEY_ALIASES = {
@@ -209,11 +211,62 @@ class KeySequenceTokenizer():
         return variables.get(c) if variables.is_key_name(c) else c
 
 
-def tokenize_keys(keys: str) -> list:
-    return KeySequenceTokenizer(keys)._iter_tokenize()
+# A token is either a bracketed key name like <C-w>, or a single character. A
+# "<" without a closing ">" only matches as a single character, which is an
+# error that is reported by the KeySequenceTokenizer.
+_TOKEN_PATTERN = register_regex('keys.token', r'<[^>]*>|.', re.DOTALL)
 
 
-_BARE_COMMAND_NAME_PATTERN = re.compile(r'^(?:".)?(?:[1-9]+)?')
+@lru_cache(maxsize=256)
+def _long_key_name(token: str) -> str:
+    tokenizer = KeySequenceTokenizer(token)
+    tokenizer._consume()
+
+    return tokenizer._long_key_name()
+
+
+@lru_cache(maxsize=1024)
+def _tokenize(keys: str) -> tuple:
+    # Single-pass tokenizer equivalent to KeySequenceTokenizer, except that the
+    # variables e.g. <leader> are not expanded, see tokenize_keys().
+    tokens = []
+    for token in _TOKEN_PATTERN.findall(keys):
+        if len(token) > 1:
+            tokens.append(_long_key_name(token))
+        elif token == '<':
+            raise ValueError("expected '>'")
+        else:
+            tokens.append(token)
+
+    return tuple(tokens)
+
+
+def tokenize_keys(keys: str) -> tuple:
+    try:
+        tokens = _tokenize(keys)
+    except ValueError:
+        # Defer to the KeySequenceTokenizer to raise the exact same error.
+        return tuple(KeySequenceTokenizer(keys)._iter_tokenize())
+
+    if seqs.LEADER in tokens:
+        leader = variables.get(seqs.LEADER)
+        tokens = tuple(leader if token == seqs.LEADER else token for token in tokens)
+
+    return tokens
+
+
+_BARE_COMMAND_NAME_PATTERN = register_regex('keys.bare_command_name', r'^(?:".)?(?:[1-9]+)?')
+
+
+@lru_cache(maxsize=512)
+def _to_bare_command_name(seq: str, leader: str) -> str:
+    # The leader is only passed to key the cache, because it is expanded by
+    # tokenize_keys() and the result depends on it.
+
+    # Account for d2d and similar sequences.
+    new_seq = tokenize_keys(_BARE_COMMAND_NAME_PATTERN.sub('', seq))
+
+    return ''.join(k for k in new_seq if not k.isdigit())
 
 
 def to_bare_command_name(seq: str) -> str:
@@ -227,10 +280,7 @@ def to_bare_command_name(seq: str) -> str:
     if seq == '0':
         return seq
 
-    # Account for d2d and similar sequences.
-    new_seq = list(tokenize_keys(_BARE_COMMAND_NAME_PATTERN.sub('', seq)))
-
-    return ''.join(k for k in new_seq if not k.isdigit())
+    return _to_bare_command_name(seq, variables.get(seqs.LEADER))
 
 
 def assign(seq: str, modes, *args, **kwargs):
@@ -15,9 +15,14 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+from bisect import bisect_left
+from bisect import bisect_right
+
 from sublime import Region
 
 from NeoVintageous.nv.options import get_option
+from NeoVintageous.nv.polyfill import view_rfind_all
+from NeoVintageous.nv.search import get_cached_search_occurrences
 
 
 # DEPRECATED Use view_find_in_range()
@@ -47,6 +52,49 @@ def find_all_in_range(view, term: str, start: int, end: int, flags: int = 0) ->
         start = m.end()
 
 
+def _find_occurrence(view, term: str, start: int, end: int, flags: int = 0):
+    # Same as find_in_range(), but if the occurrences of the term are cached,
+    # for example when repeating a search with "n", then it's a bisect instead
+    # of a search of the buffer.
+    occurrences = get_cached_search_occurrences(view, term, flags)
+    if occurrences is not None:
+        starts, ends = occurrences
+        i = bisect_left(starts, start)
+
+        # An occurrence that spans the start point means that a search from
+        # that point may find an overlapping match that isn't cached.
+        if i == 0 or ends[i - 1] <= start:
+            if i < len(starts) and ends[i] <= end:
+                return Region(starts[i], ends[i])
+
+            return None
+
+    return find_in_range(view, term, start, end, flags)
+
+
+def _reverse_find_occurrence(view, term: str, start: int, end: int, flags: int = 0):
+    # Same as reverse_search(), but if the occurrences of the term are cached
+    # then it's a bisect instead of a search of the buffer.
+    occurrences = get_cached_search_occurrences(view, term, flags)
+    if occurrences is not None and start >= 0 and end <= view.size():
+        starts, ends = occurrences
+        i = bisect_right(ends, end) - 1
+        if i < 0:
+            return None
+
+        # Matches that are empty, span multiple lines, or that overlap the
+        # start of the line are searched, see reverse_search().
+        line = view.full_line(starts[i])
+        if starts[i] < ends[i] <= line.b and (i == 0 or ends[i - 1] <= line.a):
+            if starts[i] >= view.full_line(start).a:
+                return Region(starts[i], ends[i])
+
+            if ends[i] <= view.full_line(start).a:
+                return None
+
+    return reverse_search(view, term, start, end, flags)
+
+
 def find_wrapping(view, term: str, start: int, end: int, flags: int = 0, times: int = 1):
     try:
         current_sel = view.sel()[0]
@@ -54,7 +102,7 @@ def find_wrapping(view, term: str, start: int, end: int, flags: int = 0, times:
         return
 
     for x in range(times):
-        match = find_in_range(view, term, start, end, flags)
+        match = _find_occurrence(view, term, start, end, flags)
         # make sure we wrap around the end of the buffer
         if not match:
             if not get_option(view, 'wrapscan'):
@@ -66,7 +114,7 @@ def find_wrapping(view, term: str, start: int, end: int, flags: int = 0, times:
             # See https://github.com/NeoVintageous/NeoVintageous/issues/223.
             end = current_sel.a
             end = view.word(current_sel.a).b
-            match = find_in_range(view, term, start, end, flags)
+            match = _find_occurrence(view, term, start, end, flags)
             if not match:
                 return
 
@@ -83,7 +131,7 @@ def reverse_find_wrapping(view, term: str, start: int, end: int, flags: int = 0,
 
     # Search wrapping around the end of the buffer.
     for x in range(times):
-        match = reverse_search(view, term, start, end, flags)
+        match = _reverse_find_occurrence(view, term, start, end, flags)
         # Start searching in the lower half of the buffer if we aren't doing it yet.
         if not match and start <= current_sel.b:
             if not get_option(view, 'wrapscan'):
@@ -94,7 +142,7 @@ def reverse_find_wrapping(view, term: str, start: int, end: int, flags: int = 0,
             # See https://github.com/NeoVintageous/NeoVintageous/issues/223.
             start = view.word(current_sel.b).a
             end = view.size()
-            match = reverse_search(view, term, start, end, flags)
+            match = _reverse_find_occurrence(view, term, start, end, flags)
             if not match:
                 return
         # No luck in the whole buffer.
@@ -149,28 +197,7 @@ def reverse_search(view, term: str, start: int, end: int, flags: int = 0):
     if start < 0 or end > view.size():
         return None
 
-    lo_line = view.full_line(start)
-    hi_line = view.full_line(end)
-
-    while True:
-        low_row, hi_row = view.rowcol(lo_line.a)[0], view.rowcol(hi_line.a)[0]
-        middle_row = (low_row + hi_row) // 2
-
-        middle_line = view.full_line(view.text_point(middle_row, 0))
-
-        lo_region = Region(lo_line.a, middle_line.b)
-        hi_region = Region(middle_line.b, min(hi_line.b, end))
-
-        if find_in_range(view, term, hi_region.a, hi_region.b, flags):
-            lo_line = view.full_line(middle_line.b)
-        elif find_in_range(view, term, lo_region.a, lo_region.b, flags):
-            hi_line = view.full_line(middle_line.a)
-        else:
-            return None
-
-        if lo_line == hi_line:
-            # we found the line we were looking for, now extract the match.
-            return find_last_in_range(view, term, hi_line.a, min(hi_line.b, end), flags)
+    return _reverse_find_last(view, term, view.full_line(start).a, end, flags)
 
 
 def reverse_search_by_pt(view, term: str, start: int, end: int, flags: int = 0):
@@ -183,25 +210,12 @@ def reverse_search_by_pt(view, term: str, start: int, end: int, flags: int = 0):
     if start < 0 or end > view.size():
         return None
 
-    lo_line = view.full_line(start)
-    hi_line = view.full_line(end)
-
-    while True:
-        low_row, hi_row = view.rowcol(lo_line.a)[0], view.rowcol(hi_line.a)[0]
-        middle_row = (low_row + hi_row) // 2
-
-        middle_line = view.full_line(view.text_point(middle_row, 0))
-
-        lo_region = Region(lo_line.a, middle_line.b)
-        hi_region = Region(middle_line.b, min(hi_line.b, end))
+    return _reverse_find_last(view, term, start, end, flags)
 
-        if find_in_range(view, term, hi_region.a, hi_region.b, flags):
-            lo_line = view.full_line(middle_line.b)
-        elif find_in_range(view, term, lo_region.a, lo_region.b, flags):
-            hi_line = view.full_line(middle_line.a)
-        else:
-            return None
 
-        if lo_line == hi_line:
-            # we found the line we were looking for, now extract the match.
-            return find_last_in_range(view, term, max(hi_line.a, start), min(hi_line.b, end), flags)
+def _reverse_find_last(view, term: str, start: int, end: int, flags: int = 0):
+    # Returns the last non-empty match that begins at or after start and ends
+    # at or before end, or None if there is no match.
+    for match in view_rfind_all(view, term, end, flags, stop_pt=start):
+        if match.a < match.b:
+            return match
@@ -33,6 +33,7 @@ from NeoVintageous.nv.polyfill import view_find_in_range
 from NeoVintageous.nv.polyfill import view_indentation_level
 from NeoVintageous.nv.polyfill import view_indented_region
 from NeoVintageous.nv.polyfill import view_rfind_all
+from NeoVintageous.nv.regexes import register_regex
 from NeoVintageous.nv.utils import get_insertion_point_at_b
 from NeoVintageous.nv.utils import next_non_blank
 from NeoVintageous.nv.utils import next_non_ws
@@ -45,7 +46,8 @@ from NeoVintageous.nv.vi.units import word_starts
 
 RX_ANY_TAG = r'</?([0-9A-Za-z-]+).*?>'
 RX_ANY_TAG_NAMED_TPL = r'</?({0}) *?.*?>'
-RXC_ANY_TAG = re.compile(r'</?([0-9A-Za-z]+).*?>')
+_BLANK_LINE_PATTERN = register_regex('text_objects.blank_line', '^\\s*$')
+_LEADING_WHITESPACE_PATTERN = register_regex('text_objects.leading_whitespace', '\\s+')
 # According to the HTML 5 editor's draft, only 0-9A-Za-z characters can be
 # used in tag names. TODO: This won't be enough in Dart Polymer projects,
 # for example.
@@ -697,7 +699,7 @@ def resolve_indent_text_object(view, s: Region, inclusive: bool = True, big: boo
     idnt = 1000
     idnt_pt = None
     for line in view.lines(s):
-        if not re.match('^\\s*$', view.substr(line)):
+        if not _BLANK_LINE_PATTERN.match(view.substr(line)):
             level = view.indentation_level(line.a)
             if level < idnt:
                 idnt = min(idnt, level)
@@ -765,7 +767,7 @@ def find_line_text_object(view, s: Region) -> tuple:
     begin = line.begin()
     end = line.end()
 
-    whitespace_match = re.match("\\s+", line_content)
+    whitespace_match = _LEADING_WHITESPACE_PATTERN.match(line_content)
     if whitespace_match:
         begin = begin + len(whitespace_match.group(0))
 
@@ -15,8 +15,6 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
-import re
-
 from sublime import CLASS_LINE_END
 from sublime import CLASS_LINE_START
 from sublime import CLASS_PUNCTUATION_END
@@ -25,12 +23,13 @@ from sublime import CLASS_WORD_END
 from sublime import CLASS_WORD_START
 from sublime import Region
 
+from NeoVintageous.nv.regexes import register_regex
 from NeoVintageous.nv.utils import last_row
 from NeoVintageous.nv.utils import next_non_blank
 from NeoVintageous.nv.utils import row_at
 
 
-_WORD_PATTERN = re.compile('\\w')
+_WORD_PATTERN = register_regex('units.word', '\\w')
 # Places at which regular words start (for Vim).
 _CLASS_VI_WORD_START = CLASS_WORD_START | CLASS_PUNCTUATION_START | CLASS_LINE_START
 # Places at which *sometimes* words start. Called 'internal' because it's a
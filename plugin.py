@@ -58,6 +58,7 @@ import sublime  # noqa: E402
 try:
     _startup_exception = None
 
+    from NeoVintageous.nv.mappings import mappings_reset_resolution_tables
     from NeoVintageous.nv.rc import load_rc
     from NeoVintageous.nv.session import load_session
     from NeoVintageous.nv.vim import clean_views
@@ -163,6 +164,7 @@ def plugin_loaded():
         loading_exeption = e
 
     try:
+        mappings_reset_resolution_tables()
         load_session()
         load_rc()
     except Exception as e:  # pragma: no cover
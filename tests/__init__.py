@@ -15,7 +15,13 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
-from sublime_plugin import reload_plugin
+try:
+    from sublime_plugin import reload_plugin
+except ImportError:
+    # Not running in Sublime Text, see NeoVintageous.tests.headless.
+    from NeoVintageous.tests.headless import install
+    install()
+    from sublime_plugin import reload_plugin
 
 
 # This needs to be done to initialise sublime plugin
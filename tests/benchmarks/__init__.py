@@ -0,0 +1,52 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# Benchmarks are skipped by default. To run them, set the env var to a
+# non-blank value and run the test suite as usual. The results are printed.
+
+import os
+import time
+import unittest
+
+BENCHMARK = bool(os.getenv('SUBLIME_NEOVINTAGEOUS_BENCHMARK'))
+
+
+def skip_unless_benchmark(obj):
+    return unittest.skipUnless(BENCHMARK, 'set SUBLIME_NEOVINTAGEOUS_BENCHMARK to run benchmarks')(obj)
+
+
+def best_time(func, repeat: int = 3, setup=None) -> float:
+    # Returns the best wall time in seconds of `repeat` calls to func(). The
+    # optional setup() is called before each call and isn't timed.
+    best = None
+    for i in range(repeat):
+        if setup:
+            setup()
+
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+
+    return best
+
+
+def report(name: str, **results) -> None:
+    print('benchmark: {} {}'.format(name, ' '.join(
+        '{}={}'.format(k, '{:.6f}'.format(v) if isinstance(v, float) else v) for k, v in sorted(results.items())
+    )))
@@ -0,0 +1,142 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# Replays keystroke traces recorded with :NVTrace, see NeoVintageous.nv.trace.
+#
+# Each trace is replayed against a fresh view and the total wall time, the
+# per event latency percentiles, and the final buffer hash are reported. The
+# final buffer must match the one recorded in the trace. The traces in the
+# traces directory are replayed by the test suite (see test_replay.py), and
+# any directory of traces can be replayed from the command line:
+#
+#   python -m NeoVintageous.tests.benchmarks.replay [DIR|FILE]...
+
+import os
+import sys
+import time
+
+from sublime import Region
+from sublime import active_window
+
+from NeoVintageous.nv.settings import set_mode
+from NeoVintageous.nv.state import reset_command_data
+from NeoVintageous.nv.trace import TRACE_KEY
+from NeoVintageous.nv.trace import TRACE_NOTATION
+from NeoVintageous.nv.trace import TRACE_TEXT_COMMAND
+from NeoVintageous.nv.trace import buffer_hash
+from NeoVintageous.nv.trace import load_trace
+from NeoVintageous.tests.benchmarks import report
+
+TRACES_PATH = os.path.join(os.path.dirname(__file__), 'traces')
+
+
+def find_traces(path: str = TRACES_PATH) -> list:
+    if os.path.isfile(path):
+        return [path]
+
+    return sorted(os.path.join(path, f) for f in os.listdir(path) if f.endswith('.jsonl'))
+
+
+def _percentile(sorted_values: list, percent: int) -> float:
+    if not sorted_values:
+        return 0.0
+
+    return sorted_values[min(len(sorted_values) - 1, (len(sorted_values) * percent) // 100)]
+
+
+def _replay_event(window, view, event: list) -> None:
+    event_type = event[0]
+    if event_type == TRACE_KEY:
+        window.run_command('nv_feed_key', {'key': event[3], 'repeat_count': event[4], 'check_user_mappings': event[5]})
+    elif event_type == TRACE_NOTATION:
+        window.run_command('nv_process_notation', {
+            'keys': event[3], 'repeat_count': event[4], 'check_user_mappings': event[5]})
+    elif event_type == TRACE_TEXT_COMMAND:
+        view.run_command(event[3], event[4])
+    else:
+        raise ValueError('unknown trace event type: %s' % event_type)
+
+
+def replay_trace(trace: dict, window=None) -> dict:
+    # Replays a trace (see load_trace()) in a new view and returns the results.
+    if window is None:
+        window = active_window()
+
+    view = window.new_file()
+    view.set_scratch(True)
+
+    try:
+        header = trace['header']
+        view.run_command('nv_test_write', {'text': header['text']})
+        view.sel().clear()
+        view.sel().add_all([Region(a, b) for a, b in header['sel']])
+        set_mode(view, header['mode'])
+        reset_command_data(view)
+
+        latencies = []
+        start = time.perf_counter()
+        for event in trace['events']:
+            event_start = time.perf_counter()
+            _replay_event(window, view, event)
+            latencies.append(time.perf_counter() - event_start)
+
+        wall = time.perf_counter() - start
+        latencies.sort()
+
+        return {
+            'events': len(latencies),
+            'wall': wall,
+            'p50': _percentile(latencies, 50),
+            'p95': _percentile(latencies, 95),
+            'p99': _percentile(latencies, 99),
+            'hash': buffer_hash(view),
+            'size': view.size(),
+        }
+    finally:
+        view.close()
+
+
+def replay(file_name: str, window=None) -> dict:
+    # Replays a saved trace and returns the results. The result "ok" is False
+    # if the final buffer doesn't match the recorded buffer.
+    trace = load_trace(file_name)
+    results = replay_trace(trace, window)
+    results['ok'] = results['hash'] == trace['footer']['hash']
+
+    return results
+
+
+def main(argv: list) -> int:
+    files = []
+    for path in (argv or [TRACES_PATH]):
+        files.extend(find_traces(path))
+
+    failed = []
+    for f in files:
+        results = replay(f)
+        report('replay %s' % os.path.basename(f), **results)
+        if not results['ok']:
+            failed.append(f)
+
+    for f in failed:
+        print('replay failed: final buffer does not match trace %s' % f)
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,94 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+import re
+import unittest
+import unittest.mock
+
+from NeoVintageous.tests.benchmarks import best_time
+from NeoVintageous.tests.benchmarks import report
+from NeoVintageous.tests.benchmarks import skip_unless_benchmark
+
+from NeoVintageous.nv.ex.parser import parse_command_line
+from NeoVintageous.nv.ex_routes import ex_routes
+from NeoVintageous.nv.ex_routes import match_route
+
+
+# A command line for each of the routes.
+_COMMAND_LINES = (
+    '!ls', '&&', 'ls', 'bfirst', 'blast', 'bnext', 'bNext', 'bprevious', 'browse', 'brewind', 'buffer 2',
+    'cd /tmp', 'close', 'copy 3', 'cquit', 'delete', 'exit', 'edit foo.txt', 'file', 'global/foo/d', 'history',
+    'help foo', 'inoremap a b', 'let mapleader=,', 'move 3', 'new', 'nnoremap a b', 'nohlsearch', 'noremap a b',
+    'nunmap a', 'NVProfile report', 'NVTrace stop', 'onoremap a b', 'only', 'ounmap a', 'pwd', 'print', 'qall',
+    'quitall', 'quit', 'registers', 'read foo.txt', 'setlocal ts=4', 'set ts=4', 'substitute/a/b/g', 'shell',
+    'silent bnext', 'snoremap a b', 'sort n', 'spellundo foo', 'spellgood foo', 'split', 'sunmap a', 'tabclose',
+    'tabfirst', 'tablast', 'tabnext', 'tabNext', 'tabonly', 'tabprevious', 'tabrewind', 'unmap a', 'unvsplit',
+    'vnoremap a b', 'vsplit', 'vunmap a', 'write', 'wall', 'wqall', 'wq', 'xall', 'xit', 'yank',
+    "'<,'>sort u", '%s/a/b/g', '.,+2delete', '3', '/foo/yank',
+)
+
+
+def _match_route_in_order(source: str, position: int = 0):
+    # The previous implementation tried each of the routes in turn.
+    for route, command in ex_routes.items():
+        match = re.compile(route).match(source, position)
+        if match:
+            return match, command
+
+    return None
+
+
+@skip_unless_benchmark
+class TestExParserBenchmark(unittest.TestCase):
+
+    def _command_lines_per_second(self, number: int = 200) -> float:
+        def run():
+            for i in range(number):
+                for command_line in _COMMAND_LINES:
+                    parse_command_line(command_line)
+
+        return number * len(_COMMAND_LINES) / best_time(run)
+
+    def test_parse_command_line(self):
+        routes = {match_route(command_line)[1] for command_line in _COMMAND_LINES if match_route(command_line)}
+        self.assertEqual(routes, set(ex_routes.values()))
+
+        with unittest.mock.patch('NeoVintageous.nv.ex.scanner.match_route', _match_route_in_order):
+            expected = [str(parse_command_line(command_line)) for command_line in _COMMAND_LINES]
+            before = self._command_lines_per_second()
+
+        self.assertEqual(expected, [str(parse_command_line(command_line)) for command_line in _COMMAND_LINES])
+        after = self._command_lines_per_second()
+
+        report('parse_command_line', routes=len(ex_routes), before_lines_per_sec=before, after_lines_per_sec=after)
+
+        self.assertGreater(after, before)
+
+    def test_match_route(self):
+        def matches_per_second(match, number: int = 1000) -> float:
+            def run():
+                for i in range(number):
+                    for command_line in _COMMAND_LINES:
+                        match(command_line)
+
+            return number * len(_COMMAND_LINES) / best_time(run)
+
+        before = matches_per_second(_match_route_in_order)
+        after = matches_per_second(match_route)
+
+        report('match_route', routes=len(ex_routes), before_matches_per_sec=before, after_matches_per_sec=after)
+
+        self.assertGreater(after, before)
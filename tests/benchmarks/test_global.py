@@ -0,0 +1,59 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from NeoVintageous.tests import unittest
+from NeoVintageous.tests.benchmarks import best_time
+from NeoVintageous.tests.benchmarks import report
+from NeoVintageous.tests.benchmarks import skip_unless_benchmark
+
+from NeoVintageous.nv.ex_cmds import do_ex_cmdline
+
+
+@skip_unless_benchmark
+@unittest.mock.patch.dict('NeoVintageous.nv.session._session', {})
+class TestGlobalBenchmark(unittest.ViewTestCase):
+
+    def test_global_delete(self):
+        for lines in (10000, 100000, 1000000):
+            text = ''.join('DEBUG fizz\n' if i % 2 else 'INFO buzz\n' for i in range(lines))
+
+            def setup():
+                self.write(text)
+                self.select(0)
+
+            def run():
+                do_ex_cmdline(self.view.window(), ':g/^DEBUG/d')
+
+            # The previous implementation selected and erased each line.
+            def run_per_line():
+                for region in reversed(self.view.find_all('^DEBUG.*\\n')):
+                    self.view.sel().add(region)
+                    self.view.run_command('nv_test_replace', {'a': region.a, 'b': region.b, 'text': ''})
+
+            global_secs = best_time(run, repeat=1, setup=setup)
+            self.assertEqual('INFO buzz\n' * (lines // 2), self.content())
+
+            # Each erase copies the buffer of the test view, which makes the
+            # previous implementation too slow to run on the larger buffers.
+            if lines > 10000:
+                report('global_delete', lines=lines, global_secs=global_secs)
+                continue
+
+            per_line_secs = best_time(run_per_line, repeat=1, setup=setup)
+            self.assertEqual('INFO buzz\n' * (lines // 2), self.content())
+
+            report('global_delete', lines=lines, global_secs=global_secs, per_line_secs=per_line_secs)
@@ -0,0 +1,70 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+import unittest
+
+from NeoVintageous.tests.benchmarks import best_time
+from NeoVintageous.tests.benchmarks import report
+from NeoVintageous.tests.benchmarks import skip_unless_benchmark
+
+from NeoVintageous.nv.vi.keys import KeySequenceTokenizer
+from NeoVintageous.nv.vi.keys import _to_bare_command_name
+from NeoVintageous.nv.vi.keys import _tokenize
+from NeoVintageous.nv.vi.keys import to_bare_command_name
+from NeoVintageous.nv.vi.keys import tokenize_keys
+
+
+_SEQUENCES = (
+    'w', 'dd', '"a2d2aw', '3w<A-f>', '<C-w><C-b>', '<leader>ek', '<Esc>ai', '<c-m-s-a>',
+    'ciw<C-r>"<Esc>', '<space>ff<CR>', 'vi]:sort u<CR>', '10<f7>', ':s/foo/bar/g<CR>',
+)
+
+
+@skip_unless_benchmark
+class TestTokenizeKeysBenchmark(unittest.TestCase):
+
+    def _tokens_per_second(self, tokenize, number: int = 2000) -> float:
+        def run():
+            for i in range(number):
+                for seq in _SEQUENCES:
+                    tokenize(seq)
+
+        tokens = number * sum(len(tuple(tokenize_keys(seq))) for seq in _SEQUENCES)
+
+        return tokens / best_time(run)
+
+    def test_tokenize_keys(self):
+        for seq in _SEQUENCES:
+            self.assertEqual(tuple(KeySequenceTokenizer(seq)._iter_tokenize()), tuple(tokenize_keys(seq)))
+
+        before = self._tokens_per_second(lambda seq: tuple(KeySequenceTokenizer(seq)._iter_tokenize()))
+        uncached = self._tokens_per_second(lambda seq: _tokenize.__wrapped__(seq))
+        after = self._tokens_per_second(tokenize_keys)
+
+        report('tokenize_keys', before_tokens_per_sec=before, uncached_tokens_per_sec=uncached,
+               after_tokens_per_sec=after)
+
+        self.assertGreater(after, before)
+
+    def test_to_bare_command_name(self):
+        def run():
+            for i in range(2000):
+                for seq in _SEQUENCES:
+                    to_bare_command_name(seq)
+
+        _to_bare_command_name.cache_clear()
+        report('to_bare_command_name', secs=best_time(run), cache=str(_to_bare_command_name.cache_info()))
@@ -0,0 +1,50 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from NeoVintageous.tests import unittest
+
+from NeoVintageous.tests.benchmarks import best_time
+from NeoVintageous.tests.benchmarks import report
+from NeoVintageous.tests.benchmarks import skip_unless_benchmark
+
+
+@skip_unless_benchmark
+class TestProcessNotationBenchmark(unittest.ViewTestCase):
+
+    def _keys_per_second(self, text: str, keys: str, count: int) -> float:
+        def run():
+            self.normal(text)
+            self.view.window().run_command('nv_process_notation', {'keys': keys})
+
+        return count / best_time(run)
+
+    def test_normal_mode_1k_keys(self):
+        keys = 'lh' * 500
+        report('nv_process_notation normal', keys_per_sec=self._keys_per_second('|' + ('x' * 20), keys, 1000))
+        self.assertNormal('|' + ('x' * 20))
+
+    def test_insert_mode_1k_keys(self):
+        keys = 'i' + ('abcdefghi<CR>' * 76) + '<Esc>'
+        report('nv_process_notation insert', keys_per_sec=self._keys_per_second('|', keys, 1000))
+        self.assertContent(('abcdefghi\n' * 76))
+
+    def test_insert_mode_1k_keys_is_one_undo_step(self):
+        self.normal('fi|zz')
+        self.view.window().run_command('nv_process_notation', {'keys': 'i' + ('x' * 998) + '<Esc>'})
+        self.assertContent('fi' + ('x' * 998) + 'zz')
+        self.view.run_command('undo')
+        self.assertContent('fizz')
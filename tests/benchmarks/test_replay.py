@@ -0,0 +1,41 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+
+from NeoVintageous.tests import unittest
+
+from NeoVintageous.tests.benchmarks import BENCHMARK
+from NeoVintageous.tests.benchmarks import report
+from NeoVintageous.tests.benchmarks.replay import find_traces
+from NeoVintageous.tests.benchmarks.replay import replay
+
+
+# The stored traces are also regression tests: the final buffer of a replay
+# must match the buffer that was recorded, so they are not skipped. The
+# timings are only reported when running benchmarks.
+class TestReplay(unittest.ViewTestCase):
+
+    def test_traces(self):
+        traces = find_traces()
+        self.assertTrue(traces)
+        for trace in traces:
+            results = replay(trace, self.view.window())
+            if BENCHMARK:
+                report('replay %s' % os.path.basename(trace), **results)
+
+            self.assertTrue(results['ok'], 'final buffer does not match trace %s' % trace)
@@ -0,0 +1,124 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from NeoVintageous.tests import unittest
+from NeoVintageous.tests.benchmarks import best_time
+from NeoVintageous.tests.benchmarks import report
+from NeoVintageous.tests.benchmarks import skip_unless_benchmark
+
+from NeoVintageous.nv.polyfill import view_rfind_all
+from NeoVintageous.nv.search import _find_current_occurrences
+from NeoVintageous.nv.search import _sort_occurrences
+from NeoVintageous.nv.search import find_search_occurrences
+from NeoVintageous.nv.search import search_on_close
+from NeoVintageous.nv.vi.search import find_wrapping
+from NeoVintageous.nv.vi.search import reverse_find_wrapping
+from NeoVintageous.nv.vi.search import reverse_search
+
+
+@skip_unless_benchmark
+class TestSearchOccurrencesBenchmark(unittest.ViewTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.set_option('wrapscan', True)
+        self.write('fizz buzz\n' * 200000)
+        self.select(self.view.size() // 2)
+
+    def test_find_next_occurrence(self):
+        pt = self.view.size() // 2
+
+        def run():
+            for i in range(100):
+                find_wrapping(self.view, 'fizz', pt, self.view.size(), times=3)
+                reverse_find_wrapping(self.view, 'fizz', 0, pt, times=3)
+
+        search_on_close(self.view)
+        uncached = best_time(run)
+        populate = best_time(lambda: find_search_occurrences(self.view, 'fizz', 0), repeat=1)
+        cached = best_time(run)
+
+        report('find_next_occurrence', occurrences=200000, uncached_secs=uncached, cached_secs=cached,
+               populate_secs=populate)
+
+        self.assertLess(cached, uncached)
+
+
+def _find_current_occurrences_quadratic(view, occurrences: list) -> list:
+    # The previous implementation: every occurrence against every selection.
+    sels = []
+    for sel in view.sel():
+        if sel.empty():
+            sel.b += 1
+        sels.append(sel)
+
+    current = []
+    for region in occurrences:
+        for sel in sels:
+            if region.contains(sel):
+                current.append(region)
+
+    return current
+
+
+@skip_unless_benchmark
+class TestCurrentOccurrencesBenchmark(unittest.ViewTestCase):
+
+    def test_find_current_occurrences(self):
+        self.write('fizz buzz\n' * 100000)
+        occurrences = find_search_occurrences(self.view, 'fizz', 0)
+        self.view.sel().clear()
+        self.view.sel().add_all([self.Region(i * 1000 + 1) for i in range(1000)])
+
+        expected = []
+        before = best_time(lambda: expected.extend(_find_current_occurrences_quadratic(self.view, occurrences)), repeat=1)  # noqa: E501
+        after = best_time(lambda: _find_current_occurrences(self.view, *_sort_occurrences(self.view, occurrences)))
+
+        self.assertEqual(expected, _find_current_occurrences(self.view, *_sort_occurrences(self.view, occurrences)))
+
+        report('find_current_occurrences', occurrences=len(occurrences), cursors=len(self.view.sel()),
+               before_secs=before, after_secs=after)
+
+        self.assertLess(after, before)
+
+
+def _view_rfind_all_forward(view, pattern: str, start_pt: int, flags: int = 0):
+    # The previous implementation: a forward search of the whole buffer.
+    matches = view.find_all(pattern, flags)
+    for region in matches:
+        if region.b > start_pt:
+            return reversed(matches[:matches.index(region)])
+
+    return reversed(matches)
+
+
+@skip_unless_benchmark
+class TestReverseSearchBenchmark(unittest.ViewTestCase):
+
+    def test_view_rfind(self):
+        self.write('fizz buzz\n' * 200000)
+        pt = self.view.size() // 2
+        expected = next(_view_rfind_all_forward(self.view, 'buzz', pt))
+        self.assertEqual(expected, next(view_rfind_all(self.view, 'buzz', pt)))
+
+        before = best_time(lambda: next(_view_rfind_all_forward(self.view, 'buzz', pt)))
+        after = best_time(lambda: next(view_rfind_all(self.view, 'buzz', pt)))
+        search = best_time(lambda: reverse_search(self.view, 'buzz', 0, pt))
+
+        report('view_rfind', lines=200000, before_secs=before, after_secs=after, reverse_search_secs=search)
+
+        self.assertLess(after, before)
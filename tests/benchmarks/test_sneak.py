@@ -0,0 +1,63 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from NeoVintageous.tests import unittest
+from NeoVintageous.tests.benchmarks import best_time
+from NeoVintageous.tests.benchmarks import report
+from NeoVintageous.tests.benchmarks import skip_unless_benchmark
+
+from NeoVintageous.nv.plugin_sneak import nv_sneak_command
+from NeoVintageous.nv.polyfill import view_rfind_all
+from NeoVintageous.nv.vim import NORMAL
+
+
+@skip_unless_benchmark
+class TestSneakBenchmark(unittest.ViewTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.write('fizz ab buzz\n' * 1000000)
+        self.command = nv_sneak_command(self.view)
+
+    def _sneak(self, pt: int, forward: bool):
+        def run():
+            for i in range(10):
+                self.select(pt)
+                self.command.run(None, mode=NORMAL, count=2, search='ab', forward=forward, save=False)
+
+        return best_time(run)
+
+    def test_sneak_is_independent_of_occurrences_after_cursor(self):
+        size = self.view.size()
+        forward_many = self._sneak(0, True)
+        forward_few = self._sneak(size - 40, True)
+        backward_many = self._sneak(size - 1, False)
+        backward_few = self._sneak(40, False)
+
+        # The previous implementation collected every occurrence in range.
+        def run_collect_all():
+            self.view.find_all('ab', 0)
+            list(view_rfind_all(self.view, 'ab', size - 1))
+
+        collect_all = best_time(run_collect_all, repeat=1)
+
+        report('sneak', lines=1000000, forward_1m_after_secs=forward_many, forward_3_after_secs=forward_few,
+               backward_1m_before_secs=backward_many, backward_3_before_secs=backward_few,
+               collect_all_secs=collect_all)
+
+        self.assertLess(forward_many, collect_all)
+        self.assertLess(backward_many, collect_all)
@@ -0,0 +1,102 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+from functools import cmp_to_key
+import random
+import re
+
+from NeoVintageous.tests import unittest
+from NeoVintageous.tests.benchmarks import best_time
+from NeoVintageous.tests.benchmarks import report
+from NeoVintageous.tests.benchmarks import skip_unless_benchmark
+
+from NeoVintageous.nv.ex_cmds import do_ex_cmdline
+
+
+def _csv(lines: int) -> str:
+    rnd = random.Random(lines)
+
+    return ''.join('%d,item%d,%d.%02d\n' % (
+        rnd.randrange(1000000), rnd.randrange(lines), rnd.randrange(10000), rnd.randrange(100)) for i in range(lines))
+
+
+@skip_unless_benchmark
+@unittest.mock.patch.dict('NeoVintageous.nv.session._session', {})
+@unittest.mock.patch('NeoVintageous.nv.session.save_session', unittest.mock.Mock())
+class TestSortBenchmark(unittest.ViewTestCase):
+
+    def _sort(self, name: str, lines: int, cmdline: str, compare=None) -> None:
+        text = _csv(lines)
+
+        def run():
+            do_ex_cmdline(self.view.window(), cmdline)
+
+        # Extracting the keys in each comparison, as a comparison function
+        # does, is the cost that the precomputed keys avoid.
+        def run_compare():
+            new_lines = sorted(text[:-1].split('\n'), key=cmp_to_key(compare))
+            self.view.run_command('nv_test_write', {'text': '\n'.join(new_lines) + '\n'})
+
+        def setup():
+            self.write(text)
+            self.select(0)
+
+        secs = best_time(run, repeat=1, setup=setup)
+        results = {'lines': lines, 'secs': secs}
+
+        if compare:
+            expected = self.content()
+            results['compare_secs'] = best_time(run_compare, repeat=1, setup=setup)
+            self.assertEqual(expected, self.content())
+            self.assertLess(secs, results['compare_secs'])
+
+        report(name, **results)
+
+    def test_numeric_sort(self):
+        number = re.compile('-?\\d+')
+
+        def compare(a, b):
+            x = int(number.search(a).group())
+            y = int(number.search(b).group())
+
+            return (x > y) - (x < y)
+
+        self._sort('sort n', 30000, ':sort n', compare)
+        self._sort('sort n', 300000, ':sort n')
+
+    def test_pattern_keyed_numeric_sort(self):
+        pattern = re.compile(',[^,]*,')
+
+        def compare(a, b):
+            x = float(a[pattern.search(a).end():])
+            y = float(b[pattern.search(b).end():])
+
+            return (x > y) - (x < y)
+
+        self._sort('sort f /,[^,]*,/', 30000, ':sort f /,[^,]*,/', compare)
+        self._sort('sort f /,[^,]*,/', 300000, ':sort f /,[^,]*,/')
+
+    def test_pattern_keyed_sort(self):
+        pattern = re.compile(',')
+
+        def compare(a, b):
+            x = a[pattern.search(a).end():]
+            y = b[pattern.search(b).end():]
+
+            return (x > y) - (x < y)
+
+        self._sort('sort /,/', 30000, ':sort /,/', compare)
+        self._sort('sort /,/', 300000, ':sort /,/')
@@ -0,0 +1,89 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+import re
+
+from NeoVintageous.tests import unittest
+from NeoVintageous.tests.benchmarks import best_time
+from NeoVintageous.tests.benchmarks import report
+from NeoVintageous.tests.benchmarks import skip_unless_benchmark
+
+from NeoVintageous.nv.ex_cmds import do_ex_cmdline
+
+
+def _peak_memory(func) -> int:
+    # The tracemalloc module is new in Python 3.4.
+    import tracemalloc
+
+    tracemalloc.start()
+    try:
+        func()
+
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@skip_unless_benchmark
+@unittest.mock.patch.dict('NeoVintageous.nv.session._session', {})
+@unittest.mock.patch('NeoVintageous.nv.session.save_session', unittest.mock.Mock())
+class TestSubstituteBenchmark(unittest.ViewTestCase):
+
+    def _substitute(self, lines: int, text: str) -> tuple:
+        def run():
+            do_ex_cmdline(self.view.window(), ':%substitute/foo/bar/g')
+
+        # The previous implementation substituted each line of the region and
+        # replaced the whole region with the joined lines.
+        def run_per_line():
+            region = self.Region(0, self.view.size())
+            regex = re.compile('foo', re.MULTILINE)
+            new_lines = []
+            for line in self.view.lines(region):
+                new_lines.append(re.sub(regex, 'bar', self.view.substr(line)))
+
+            self.view.run_command('nv_test_replace', {'a': region.a, 'b': region.b, 'text': '\n'.join(new_lines)})
+
+        def setup():
+            self.write(text)
+            self.select(0)
+
+        engine_secs = best_time(run, repeat=1, setup=setup)
+        expected = self.content()
+        per_line_secs = best_time(run_per_line, repeat=1, setup=setup)
+        self.assertEqual(expected, self.content())
+
+        self.write(text)
+        engine_peak = _peak_memory(run)
+        self.write(text)
+        per_line_peak = _peak_memory(run_per_line)
+
+        report('substitute', lines=lines, engine_secs=engine_secs, per_line_secs=per_line_secs,
+               engine_peak_bytes=engine_peak, per_line_peak_bytes=per_line_peak)
+
+        return engine_peak, per_line_peak
+
+    def test_sparse_substitutions(self):
+        for lines in (10000, 100000, 1000000):
+            text = ''.join('fizz foo buzz\n' if i % 1000 == 0 else 'fizz buzz\n' for i in range(lines))
+            engine_peak, per_line_peak = self._substitute(lines, text)
+            self.assertLess(engine_peak, per_line_peak)
+
+    def test_substitutions_on_every_line(self):
+        for lines in (10000, 100000, 1000000):
+            engine_peak, per_line_peak = self._substitute(lines, 'fizz foo buzz foo\n' * lines)
+            self.assertLess(engine_peak, per_line_peak)
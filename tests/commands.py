@@ -15,6 +15,7 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+from sublime import Region
 from sublime_plugin import TextCommand
 
 from NeoVintageous.nv.polyfill import view_to_region
@@ -25,3 +26,9 @@ class nv_test_write(TextCommand):
     def run(self, edit, text):
         self.view.erase(edit, view_to_region(self.view))
         self.view.insert(edit, 0, text)
+
+
+class nv_test_replace(TextCommand):
+
+    def run(self, edit, a, b, text):
+        self.view.replace(edit, Region(a, b), text)
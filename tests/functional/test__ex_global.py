@@ -38,3 +38,57 @@ class Test_ex_global(unittest.FunctionalTestCase):
     def test_global_not_match_delete(self):
         self.eq('|fizz\nxyz\nbuzz\n', ':global!/^x/d', 'xyz\n|')
         self.eq('|fizz\nxyz\nbuzz\nfizz\nxyz\nbuzz\n', ':global!/^x/d', 'xyz\nxyz\n|')
+
+    def test_global_delete_range(self):
+        self.eq('|x1\n2\nx3\nx4\n5\n6\n', ':global/^x/.,+1d', '|5\n6\n')
+        self.eq('|x1\n2\n3\nx4\n5\n6\n', ':global/^x/.,+1d', '3\n|6\n')
+
+    def test_global_substitute(self):
+        self.eq('|xa\nab\nxa\n', ':global/^x/s/a/b/', 'xb\nab\n|xb\n')
+        self.eq('|xa\nab\nxa\n', ':global!/^x/s/a/b/', 'xa\n|bb\nxa\n')
+
+    def test_global_move_reverses_lines(self):
+        self.eq('|1\n2\n3\n4\n', ':global/^/m0', '|4\n3\n2\n1\n')
+        self.eq('|1\n2\n3\n4\n5\n', ':2,4global/^/m1', '1\n|4\n3\n2\n5\n')
+
+    def test_global_move_keeps_the_marks_of_the_moved_lines(self):
+        self.eq('|x1\nx2\n3\n', ':g/^x/.+1m0', '|x1\nx2\n3\n')
+        self.eq('|x1\nx2\nx3\n4\n', ':g/^x/.+1m$', 'x1\nx3\nx2\n|4\n')
+
+    def test_global_copy(self):
+        self.eq('|x1\n2\nx3\n', ':global/^x/copy .', 'x1\nx1\n2\nx3\n|x3\n')
+
+    @unittest.mock_status_message()
+    def test_global_recursive(self):
+        self.eq('|x1\n2\nx3\n', ':global/^x/g/1/d', '|x1\n2\nx3\n')
+        self.assertStatusMessage('E147: Cannot do :global recursive')
+
+    @unittest.mock_status_message()
+    def test_global_pattern_not_found(self):
+        self.eq('|x1\n2\nx3\n', ':global/^y/d', '|x1\n2\nx3\n')
+        self.assertStatusMessage('Pattern not found: ^y')
+
+    def test_global_delete_saves_the_lines_to_the_register(self):
+        self.eq('|x1\n2\nx3\nx4\n', ':global/^x/d', '2\n|')
+        self.assertRegister('"x1\nx3\nx4\n')
+
+    def test_global_runs_the_commands_in_a_single_edit(self):
+        with unittest.mock.patch.object(self.view.window(), 'run_command', wraps=self.view.window().run_command) as run_command:  # noqa: E501
+            self.eq('|xa\nab\nxa\n', ':global/^x/s/a/b/', 'xb\nab\n|xb\n')
+
+        self.assertEqual(1, len([c for c in run_command.call_args_list if c[0][0] == 'nv_ex_cmd_edit_wrap']))
+
+    @unittest.mock_status_message()
+    @unittest.mock.patch('NeoVintageous.nv.ex_cmds._GLOBAL_MARKS_PER_GROUP', 1)
+    @unittest.mock.patch('NeoVintageous.nv.ex_cmds._GLOBAL_PROGRESS_GROUPS', 2)
+    @unittest.mock.patch('NeoVintageous.nv.ex_cmds._GLOBAL_PROGRESS_LINES', 4)
+    def test_global_reports_progress_on_many_lines(self):
+        self.eq('|xa\nxa\nxa\nxa\nxa\n', ':global/^x/s/a/b/', 'xb\nxb\nxb\nxb\n|xb\n')
+        self.assertStatusMessage('global: 4 of 5 lines', count=2)
+
+    @unittest.mock_status_message()
+    @unittest.mock.patch('NeoVintageous.nv.ex_cmds._GLOBAL_MARKS_PER_GROUP', 1)
+    @unittest.mock.patch('NeoVintageous.nv.ex_cmds._GLOBAL_PROGRESS_GROUPS', 2)
+    def test_global_does_not_report_progress_on_a_few_lines(self):
+        self.eq('|xa\nxa\nxa\nxa\nxa\n', ':global/^x/s/a/b/', 'xb\nxb\nxb\nxb\n|xb\n')
+        self.assertNoStatusMessage()
@@ -0,0 +1,42 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+from NeoVintageous.tests import unittest
+
+from NeoVintageous.nv.profiler import is_profiling
+from NeoVintageous.nv.profiler import profiler_stop
+
+
+class Test_ex_nvprofile(unittest.FunctionalTestCase):
+
+    def tearDown(self):
+        profiler_stop()
+        super().tearDown()
+
+    @unittest.mock_status_message()
+    def test_start_stop(self):
+        self.eq('|a', ':NVProfile start', '|a')
+        self.assertStatusMessage('profiler started')
+        self.assertTrue(is_profiling())
+        self.eq('|a', ':NVProfile stop', '|a')
+        self.assertStatusMessage('profiler stopped')
+        self.assertFalse(is_profiling())
+
+    @unittest.mock_status_message()
+    def test_invalid_argument(self):
+        self.eq('|a', ':NVProfile foo', '|a')
+        self.assertStatusMessage('E475: Invalid argument: foo')
+        self.assertFalse(is_profiling())
@@ -15,22 +15,93 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+import sys
+
 from NeoVintageous.tests import unittest
 
 
 class Test_ex_sort(unittest.FunctionalTestCase):
 
     def test_sort(self):
-        self.eq('d\nb\n|c\na', ':sort', 'a\nb\n|c\nd')
+        self.eq('d\nb\n|c\na', ':sort', '|a\nb\nc\nd')
+        self.eq('d\nb\n|c\na\n', ':sort', '|a\nb\nc\nd\n')
+        self.eq('|b\n\na\n', ':sort', '|\na\nb\n')
 
     def test_sort_options(self):
-        self.eq('1\n1\n2\n|3\n2\n4', ':sort u', '1\n|2\n3\n4')
+        self.eq('1\n1\n2\n|3\n2\n4', ':sort u', '|1\n2\n3\n4')
         self.eq('|a\nA\nB\nb', ':sort i', '|a\nA\nB\nb')
         self.eq('|b\nA\na\nB', ':sort i', '|A\na\nb\nB')
         self.eq('|b\na\nA\nB', ':sort i', '|a\nA\nb\nB')
-        self.eq('|1\nb\n1\nb\na\nA\na\nB', ':sort iu', '|1\na\nA\nb\nB')
+        self.eq('|1\nb\n1\nb\na\nA\na\nB', ':sort iu', '|1\na\nb')
+
+    def test_sort_reverse(self):
+        self.eq('|b\nc\na', ':sort!', '|c\nb\na')
+        self.eq('|b\nc\nB\na', ':sort! i', '|c\nB\nb\na')
+        self.eq('|2\nx\n10\ny', ':sort! n', '|10\n2\ny\nx')
+
+    def test_sort_numeric(self):
+        self.eq('|x10\nx9\n-3\nfoo\nx-20\nbar', ':sort n', '|foo\nbar\nx-20\n-3\nx9\nx10')
+        self.eq('|a 2\nb 1\nc 2\nd 1', ':sort n', '|b 1\nd 1\na 2\nc 2')
+        self.eq('|0x1F\n0xa\n-0x2\nzz', ':sort x', '|zz\n-0x2\n0xa\n0x1F')
+        self.eq('|1.5\n-2e1\n\n.25\nnope', ':sort f', '|\n-2e1\nnope\n.25\n1.5')
+        self.eq('|0b101\n11\n0b1\nz', ':sort b', '|z\n0b1\n11\n0b101')
+        self.eq('|010\n7\n9\n011', ':sort o', '|7\n010\n9\n011')
+
+    def test_sort_numeric_unique(self):
+        self.eq('|2\n02\n1\n2', ':sort nu', '|1\n2\n02\n2')
+
+    def test_sort_pattern(self):
+        self.eq('|a,3,x\nb,1,z\nc,2,y', ':sort /,/', '|b,1,z\nc,2,y\na,3,x')
+        self.eq('|a,3,x\nb,1,z\nc,2,y', ':sort /,\\d,/', '|a,3,x\nc,2,y\nb,1,z')
+        self.eq('|a,3,x\nb,1,z\nc,2,y', ':sort /[xyz]/ r', '|a,3,x\nc,2,y\nb,1,z')
+        self.eq('|a,3,x\nb,1,z\nc,2,y', ':sort n /,/', '|b,1,z\nc,2,y\na,3,x')
+        self.eq('|a,3,x\nb,1,z\nc,2,y', ':sort /\\d/ nr', '|b,1,z\nc,2,y\na,3,x')
+        self.eq('|a,3,x\nb,1,z\nc,2,y', ':sort #,#', '|b,1,z\nc,2,y\na,3,x')
+
+    def test_sort_pattern_zs(self):
+        self.eq('|x3a\nx1b\nx2c', ':sort /x\\zs\\d/ r', '|x1b\nx2c\nx3a')
+        self.eq('|a,3,x\nb,1,z\nc,2,y', ':sort /,\\zs\\d\\ze,/ r', '|b,1,z\nc,2,y\na,3,x')
+
+    @unittest.mock_status_message()
+    def test_sort_pattern_zs_after_a_variable_width_pattern(self):
+        self.eq('|x3a\nx1b', ':sort /x*\\zs\\d/', '|x3a\nx1b')
+        self.assertStatusMessage('E383: Invalid search string: x*\\zs\\d (\\zs after a variable width pattern)')
+
+    def test_sort_pattern_lazy_brace(self):
+        self.eq('|a,3,x\nb,1,z\nc,2,y', ':sort /.\\{-},/', '|b,1,z\nc,2,y\na,3,x')
+
+    @unittest.skipIf(sys.version_info < (3, 11), 'atomic groups require Python 3.11')
+    def test_sort_pattern_atomic_group(self):
+        self.eq('|b2\na1\nc3', ':sort /([a-z]*)\\@>\\d/ r', '|a1\nb2\nc3')
+
+    @unittest.mock.patch('NeoVintageous.nv.pattern._PYTHON_ATOMIC_GROUPS', False)
+    @unittest.mock_status_message()
+    def test_sort_pattern_atomic_group_requires_python_3_11(self):
+        self.eq('|b2\na1', ':sort /(\\l*)\\@>\\d/', '|b2\na1')
+        self.assertStatusMessage('E383: Invalid search string: (\\l*)\\@>\\d (\\@> requires Python 3.11)')
+
+    def test_sort_pattern_lines_without_match_keep_their_order_before_the_others(self):
+        self.eq('|z\nk=2\ny\nk=1', ':sort /k=/', '|z\ny\nk=1\nk=2')
+        self.eq('|z\nk=2\ny\nk=1', ':sort! /k=/', '|k=2\nk=1\ny\nz')
+
+    def test_sort_range(self):
+        self.eq('9\n|7\n3\n5\n1', ':2,4sort', '9\n|3\n5\n7\n1')
+        self.eq('9\n7\n3\n|5\n1', ':.,$sort n', '9\n7\n3\n|1\n5')
+
+    @unittest.mock_status_message()
+    def test_sort_reports_fewer_lines(self):
+        self.eq('|a\na\na\na\nb', ':sort u', '|a\nb')
+        self.assertStatusMessage('3 fewer lines')
+
+    @unittest.mock_status_message()
+    def test_sort_invalid_arguments(self):
+        self.eq('|b\na', ':sort z', '|b\na')
+        self.assertStatusMessage('E475: Invalid argument: z')
+        self.eq('|b\na', ':sort nx', '|b\na')
+        self.assertStatusMessage('E474: Invalid argument')
 
     def test_v_sort(self):
         self.eq('9\n|7\n3\n5|\n1', ":'<,'>sort", 'n_9\n|3\n5\n7\n1')
         self.eq('9\n|7\n    3\n5|\n1', ":'<,'>sort", 'n_9\n    |3\n5\n7\n1')
-        self.eq('6\n7\n|1\nb\n1\nb\na\nA\na\nB|\n2\n3', ":'<,'>sort iu", 'n_6\n7\n|1\na\nA\nb\nB\n2\n3')
+        self.eq('6\n7\n|1\nb\n1\nb\na\nA\na\nB|\n2\n3', ":'<,'>sort iu", 'n_6\n7\n|1\na\nb\n2\n3')
+        self.eq('6\n|b 2\nc 1\na 3|\n1', ":'<,'>sort! n", 'n_6\n|a 3\nb 2\nc 1\n1')
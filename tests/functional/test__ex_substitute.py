@@ -15,6 +15,8 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licensesubstitute/>.
 
+import sys
+
 from NeoVintageous.tests import unittest
 
 
@@ -117,3 +119,150 @@ class Test_ex_substitute(unittest.FunctionalTestCase):
     def test_repeat(self):
         self.eq('|abc abc', ':substitute/b/x/', '|axc abc')
         self.eq('|abc abc', ':substitute', '|axc abc')
+
+    @unittest.mock_status_message()
+    def test_reports_substitutions(self):
+        self.eq('|xx\nxx\nxx\nxx\n', ':%substitute/x/y/g', 'yy\nyy\nyy\n|yy\n')
+        self.assertStatusMessage('8 substitutions on 4 lines')
+        self.eq('|xx\nxx\nxx\n', ':%substitute/x/y/', 'yx\nyx\n|yx\n')
+        self.assertStatusMessage('3 substitutions on 3 lines')
+        self.eq('|xxx\n', ':%substitute/x/y/g', '|yyy\n')
+        self.assertStatusMessage('3 substitutions on 1 line')
+
+    @unittest.mock_status_message()
+    def test_does_not_report_a_few_substitutions(self):
+        self.eq('|xx\nxx\n', ':%substitute/x/y/', 'yx\n|yx\n')
+        self.assertNoStatusMessage()
+
+    def test_pattern_does_not_match_across_lines(self):
+        self.eq('|a\nb\na\nb\n', ':%substitute/a\\nb/x/g', '|a\nb\na\nb\n')
+        self.eq('|ab\nab\n', ':%substitute/b\\_.*/x/', 'ax\n|ax\n')
+        self.eq('|abc\nabc\n', ':%substitute/(b)(c)/\\2\\1/g', 'acb\n|acb\n')
+
+    def test_zs(self):
+        self.eq('|foobar foobar\n', ':s/foo\\zsbar/X/g', '|fooX fooX\n')
+        self.eq('|fooobar\n', ':s/fo\\{3}\\zsbar/X/', '|foooX\n')
+
+    @unittest.mock_status_message()
+    def test_zs_after_a_variable_width_pattern(self):
+        self.eq('|fooobar\n', ':s/fo*\\zsbar/X/', '|fooobar\n')
+        self.assertStatusMessage('E383: Invalid search string: fo*\\zsbar (\\zs after a variable width pattern)')
+
+    def test_lazy_brace(self):
+        self.eq('|a1b2b\n', ':s/a.\\{-}b/X/', '|X2b\n')
+        self.eq('|a1b2b\n', ':s/a.\\{-1,}b/X/', '|X2b\n')
+
+    @unittest.skipIf(sys.version_info < (3, 11), 'atomic groups require Python 3.11')
+    def test_atomic_group(self):
+        self.eq('|aab\n', ':s/(a*)\\@>b/X/', '|X\n')
+        self.eq('|aaa\n', ':s/(a*)\\@>a/X/', '|aaa\n')
+
+    @unittest.mock.patch('NeoVintageous.nv.pattern._PYTHON_ATOMIC_GROUPS', False)
+    @unittest.mock_status_message()
+    def test_atomic_group_requires_python_3_11(self):
+        self.eq('|bba\n', ':s/(b*)\\@>a/X/', '|bba\n')
+        self.assertStatusMessage('E383: Invalid search string: (b*)\\@>a (\\@> requires Python 3.11)')
+
+    def test_does_not_change_the_lines_without_substitutions(self):
+        self.write('xx\nab\nxx\nab\nxx\n')
+        self.select(0)
+        self.view.add_regions('test', [self.Region(0, 2), self.Region(6, 8), self.Region(12, 14)])
+        self.feed(':%substitute/a/yy/g')
+        self.assertContent('xx\nyyb\nxx\nyyb\nxx\n')
+        self.assertEqual([self.Region(0, 2), self.Region(7, 9), self.Region(14, 16)], self.view.get_regions('test'))
+
+
+@unittest.mock.patch.dict('NeoVintageous.nv.session._session', {})
+@unittest.mock.patch('NeoVintageous.nv.session.save_session', unittest.mock.Mock())
+class Test_ex_substitute_confirm(unittest.FunctionalTestCase):
+
+    def confirm(self, text: str, seq: str, answers: str, expected: str) -> None:
+        self.normal(text)
+        with unittest.mock.patch.object(self.view.window(), 'show_input_panel') as show_input_panel:
+            self.feed(seq)
+            for key in answers:
+                # Keys that aren't answers are added to the prompt text.
+                if show_input_panel.called:
+                    on_change = show_input_panel.call_args[0][3]
+                    show_input_panel.reset_mock()
+                    text = ''
+
+                text += key
+                on_change(text)
+
+            self.assertMockNotCalled(show_input_panel)
+
+        self.assertNormal(expected)
+        self.assertEqual([], self.view.get_regions('s_confirm'))
+
+    def test_yes(self):
+        self.confirm('|xx\nxx\n', ':%s/x/y/gc', 'yyyy', 'yy\n|yy\n')
+        self.confirm('|xx\nxx\n', ':%s/x/y/c', 'yy', 'yx\n|yx\n')
+
+    def test_no(self):
+        self.confirm('|xx\nxx\n', ':%s/x/y/gc', 'nnnn', '|xx\nxx\n')
+        self.confirm('|xx\nxx\n', ':%s/x/y/gc', 'nyny', 'xy\n|xy\n')
+        self.confirm('|xx\nxx\n', ':%s/x/y/gc', 'ynnn', '|yx\nxx\n')
+
+    def test_all(self):
+        self.confirm('|xx\nxx\n', ':%s/x/y/gc', 'a', 'yy\n|yy\n')
+        self.confirm('|xx\nxx\n', ':%s/x/y/gc', 'nna', 'xx\n|yy\n')
+        self.confirm('|xx\nxx\n', ':%s/x/y/gc', 'ynya', 'yx\n|yy\n')
+
+    def test_all_is_a_single_edit(self):
+        with unittest.mock.patch.object(self.view, 'run_command', wraps=self.view.run_command) as run_command:
+            self.confirm('|xx\nxx\nxx\n', ':%s/x/y/gc', 'na', 'xy\nyy\n|yy\n')
+
+        self.assertEqual([unittest.mock.call('nv_view', {'action': 'replace_regions', 'regions': [
+            (1, 2, 'y'), (3, 4, 'y'), (4, 5, 'y'), (6, 7, 'y'), (7, 8, 'y')
+        ]})], [c for c in run_command.call_args_list if c[0][0] == 'nv_view'])
+
+    @unittest.mock_status_message()
+    def test_reports_substitutions(self):
+        self.confirm('|xx\nxx\nxx\n', ':%s/x/y/gc', 'na', 'xy\nyy\n|yy\n')
+        self.assertStatusMessage('5 substitutions on 3 lines')
+
+    def test_quit(self):
+        self.confirm('|xx\nxx\n', ':%s/x/y/gc', 'q', '|xx\nxx\n')
+        self.confirm('|xx\nxx\n', ':%s/x/y/gc', 'yq', '|yx\nxx\n')
+        self.confirm('|xx\nxx\n', ':%s/x/y/gc', 'nyq', '|xy\nxx\n')
+
+    def test_last(self):
+        self.confirm('|xx\nxx\n', ':%s/x/y/gc', 'l', '|yx\nxx\n')
+        self.confirm('|xx\nxx\n', ':%s/x/y/gc', 'nnl', 'xx\n|yx\n')
+
+    def test_prompt(self):
+        self.normal('|xx\nxx\n')
+        with unittest.mock.patch.object(self.view.window(), 'show_input_panel') as show_input_panel:
+            self.feed(':%s/x/y/gc')
+
+        self.assertEqual(('replace with y (y/n/a/q/l)?', ''), show_input_panel.call_args[0][:2])
+        self.assertEqual([self.Region(0, 1)], self.view.get_regions('s_confirm'))
+
+    def test_cancel(self):
+        self.normal('|xx\nxx\n')
+        with unittest.mock.patch.object(self.view.window(), 'show_input_panel') as show_input_panel:
+            self.feed(':%s/x/y/gc')
+            show_input_panel.call_args[0][3]('y')
+            show_input_panel.call_args[0][4]()
+
+        self.assertNormal('|yx\nxx\n')
+
+    def test_ignores_other_keys(self):
+        self.confirm('|xx\nxx\n', ':%s/x/y/gc', 'xyzq', '|yx\nxx\n')
+
+    def test_offsets_remaining_matches_by_the_substitutions(self):
+        self.confirm('|x x\nx x\n', ':%s/x/yyy/gc', 'nyyn', 'x yyy\n|yyy x\n')
+        self.confirm('|xxx\n', ':%s/xx?/y/gc', 'yy', '|yy\n')
+
+    def test_ignorecase(self):
+        self.confirm('|xX\n', ':%s/x/y/gci', 'yy', '|yy\n')
+
+    @unittest.mock_status_message()
+    def test_pattern_not_found(self):
+        self.normal('|xx\n')
+        with unittest.mock.patch.object(self.view.window(), 'show_input_panel') as show_input_panel:
+            self.feed(':%s/a/y/gc')
+
+        self.assertMockNotCalled(show_input_panel)
+        self.assertStatusMessage('E486: Pattern not found: a')
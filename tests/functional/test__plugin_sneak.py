@@ -17,6 +17,7 @@
 
 from NeoVintageous.tests import unittest
 
+from NeoVintageous.nv.plugin_sneak import _labels
 from NeoVintageous.nv.plugin_sneak import _set_last_sneak_search
 
 
@@ -285,3 +286,81 @@ class Test_goto_next_and_goto_previous(unittest.FunctionalTestCase):
         self.feed('4,')
         self.assertNormal('x iz iz iz iz |iz iz')
         self.assertSearch('x iz iz iz iz |iz| |iz|')
+
+
+class Test_label_mode(unittest.FunctionalTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.set_setting('enable_sneak', True)
+        self.set_setting('sneak_label_mode', True)
+
+    def assertLabels(self, expected: dict) -> None:
+        labels = _labels.get(self.view.id())
+        self.assertEqual(expected, labels[4] if labels else {})
+
+    def test_n(self):
+        self.normal('|x iz iz iz iz')
+        self.feed('siz')
+        self.assertNormal('x |iz iz iz iz')
+        self.assertLabels({';': 5, 's': 8, 'f': 11})
+        self.feed('s')
+        self.assertNormal('x iz iz |iz iz')
+        self.assertSearch('x iz iz |iz| |iz|')
+        self.assertLabels({})
+        self.feed(';')
+        self.assertNormal('x iz iz iz |iz')
+        self.assertLabels({})
+
+    def test_n_backwards(self):
+        self.normal('iz iz iz iz |x')
+        self.feed('Siz')
+        self.assertNormal('iz iz iz |iz x')
+        self.assertLabels({';': 6, 's': 3, 'f': 0})
+        self.feed(';')
+        self.assertNormal('iz iz |iz iz x')
+        self.assertSearch('|iz| |iz| |iz| iz x')
+
+    def test_n_key_that_is_not_a_label_removes_labels(self):
+        self.normal('|x iz iz iz')
+        self.feed('siz')
+        self.assertLabels({';': 5, 's': 8})
+        self.feed('w')
+        self.assertNormal('x iz |iz iz')
+        self.assertLabels({})
+
+    def test_n_labels_only_the_visible_region(self):
+        self.normal('|x iz\niz\niz\niz\niz')
+        self.view.set_viewport_extent((1000, 48))
+        self.feed('siz')
+        self.assertNormal('x |iz\niz\niz\niz\niz')
+        self.assertLabels({';': 5, 's': 8})
+        self.assertSearch('x |iz|\n|iz|\n|iz|\niz\niz')
+
+    def test_v(self):
+        self.visual('|x| iz iz iz')
+        self.feed('v_siz')
+        self.assertLabels({';': 5, 's': 8})
+        self.feed('s')
+        self.assertVisual('|x iz iz i|z')
+
+    def test_n_repeat_reuses_the_layout(self):
+        self.normal('|x iz iz iz iz')
+        self.feed('siz')
+        with unittest.mock.patch('NeoVintageous.nv.plugin_sneak.iter_find_in_range') as find:
+            self.feed(';')
+            self.feed(';')
+            self.feed(',')
+
+        self.assertMockNotCalled(find)
+        self.assertNormal('x iz |iz iz iz')
+        self.assertSearch('x |iz| |iz| iz iz')
+
+    def test_n_layout_is_invalidated_by_changes(self):
+        self.normal('|x iz iz iz')
+        self.feed('siz')
+        self.view.run_command('insert', {'characters': 'iz '})
+        self.assertNormal('x iz |iz iz iz')
+        self.feed(';')
+        self.assertNormal('x iz iz |iz iz')
+        self.assertSearch('x iz iz |iz| |iz|')
@@ -143,7 +143,7 @@ class Test_slash_cmdline_prompt(unittest.FunctionalTestCase):
         self.assertNormal('x |fiz x fiz x')
         self.assertSearch('x |fi|z x |fi|z x')
         self.assertSearchCurrent('x |fi|z x fiz x')
-        self.assertNoStatusMessage()
+        self.assertStatusMessage('[1/2]')
 
     @unittest.mock.patch('NeoVintageous.nv.commands.history_update')
     @unittest.mock.patch('NeoVintageous.nv.commands.Cmdline')
@@ -65,6 +65,13 @@ class Test_slash(unittest.FunctionalTestCase):
         self.assertSearchCurrent('abc\naBc\nABC\n|aBc|\nabc\n')
         self.assertSearch('abc\n|aBc|\nABC\n|aBc|\nabc\n')
 
+    def test_n_vim_pattern_atoms(self):
+        self.eq('|fizzbuzz fizz buzz', 'n_/\\<fizz\\>', 'fizzbuzz |fizz buzz')
+        self.assertSearch('fizzbuzz |fizz| buzz')
+        self.eq('|fizzbuzz fizz buzz', 'n_/fizz\\zsbuzz', 'fizz|buzz fizz buzz')
+        self.assertSearch('fizz|buzz| fizz buzz')
+        self.eq('|x aa aaa', 'n_/\\va{3}', 'x aa |aaa')
+
     def test_n_atom_searches_should_not_use_ignorecase(self):
         self.normal('a|bc\nABC\naBc\nabc\n')
         for flag in (True, False):
@@ -158,7 +165,7 @@ class Test_slash_cmdline_prompt(unittest.FunctionalTestCase):
         self.assertNormal('x fiz x |fiz x')
         self.assertSearch('x |fi|z x |fi|z x')
         self.assertSearchCurrent('x fiz x |fi|z x')
-        self.assertNoStatusMessage()
+        self.assertStatusMessage('[2/2]')
 
     @unittest.mock.patch('NeoVintageous.nv.commands.history_update')
     @unittest.mock.patch('NeoVintageous.nv.commands.Cmdline')
@@ -0,0 +1,71 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# A headless in-memory stand-in for the Sublime Text API.
+#
+# The fake "sublime" and "sublime_plugin" modules make it possible to drive
+# the motion, text object, search, and ex command code paths on a machine
+# without Sublime Text, for example to profile them against large buffers:
+#
+#   from NeoVintageous.tests import headless
+#   from NeoVintageous.nv.commands import nv_feed_key
+#
+#   view = headless.new_view('fizz\nbuzz\n' * 100000)
+#   nv_feed_key(view.window()).run('j')
+#
+# The package directory must be named NeoVintageous and its parent directory
+# must be on the path, as it is for Sublime Text packages. The fakes are
+# installed automatically by NeoVintageous.tests when Sublime Text is not
+# available, so the pure unit tests can also be run with python -m unittest.
+# Keep in mind the fakes are only as good as their implementation e.g. undo is
+# not supported, scopes are always "text.plain", and the regex engine is the
+# Python one.
+
+import sys
+
+
+def install() -> bool:
+    # Installs the fake modules as "sublime" and "sublime_plugin". Must be
+    # called before any NeoVintageous.nv module is imported. Does nothing and
+    # returns False if running in Sublime Text.
+    try:
+        import sublime_api  # type: ignore # noqa: F401
+        return False
+    except ImportError:
+        pass
+
+    from NeoVintageous.tests.headless import sublime
+    from NeoVintageous.tests.headless import sublime_plugin
+
+    sys.modules['sublime'] = sublime
+    sys.modules['sublime_plugin'] = sublime_plugin
+
+    return True
+
+
+def new_view(text: str = '', window=None):
+    # Returns a new view with the text, in the active window by default. The
+    # cursor is at the start of the buffer.
+    from NeoVintageous.tests.headless import sublime
+
+    if window is None:
+        window = sublime.active_window()
+
+    view = window.new_file()
+    view._text = text
+
+    return view
@@ -0,0 +1,1267 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# A headless in-memory stand-in for the Sublime Text "sublime" module.
+#
+# Only the parts of the API used by NeoVintageous are implemented. The buffer
+# is a plain string backed by an index of line start offsets, so rowcol(),
+# text_point() and line() are O(log n). Regex searches use the Python re
+# module instead of the Sublime regex engine, which is close enough for the
+# patterns NeoVintageous generates. See NeoVintageous.tests.headless.
+
+from bisect import bisect_right
+from fnmatch import fnmatch
+from itertools import accumulate
+import json
+import os
+import re
+import sys
+import tempfile
+
+LITERAL = 1
+IGNORECASE = 2
+
+CLASS_WORD_START = 1
+CLASS_WORD_END = 2
+CLASS_PUNCTUATION_START = 4
+CLASS_PUNCTUATION_END = 8
+CLASS_SUB_WORD_START = 16
+CLASS_SUB_WORD_END = 32
+CLASS_LINE_START = 64
+CLASS_LINE_END = 128
+CLASS_EMPTY_LINE = 256
+
+ENCODED_POSITION = 1
+TRANSIENT = 4
+FORCE_GROUP = 8
+
+MONOSPACE_FONT = 1
+KEEP_OPEN_ON_FOCUS_LOST = 2
+
+DRAW_EMPTY = 1
+HIDE_ON_MINIMAP = 2
+DRAW_EMPTY_AS_OVERWRITE = 4
+PERSISTENT = 16
+DRAW_OUTLINED = 32
+DRAW_NO_FILL = 32
+HIDDEN = 128
+DRAW_NO_OUTLINE = 256
+DRAW_SOLID_UNDERLINE = 512
+DRAW_STIPPLED_UNDERLINE = 1024
+DRAW_SQUIGGLY_UNDERLINE = 2048
+
+OP_EQUAL = 0
+OP_NOT_EQUAL = 1
+OP_REGEX_MATCH = 2
+OP_NOT_REGEX_MATCH = 3
+OP_REGEX_CONTAINS = 4
+OP_NOT_REGEX_CONTAINS = 5
+
+DIALOG_CANCEL = 0
+DIALOG_YES = 1
+DIALOG_NO = 2
+
+LAYOUT_INLINE = 0
+LAYOUT_BELOW = 1
+LAYOUT_BLOCK = 2
+
+_DEFAULT_WORD_SEPARATORS = './\\()"\'-:,.;<>~!@#$%^&*|+=[]{}`~?'
+
+_LINE_HEIGHT = 16.0
+_EM_WIDTH = 8.0
+
+
+def version() -> str:
+    return '4126'
+
+
+def platform() -> str:
+    if sys.platform.startswith('win'):
+        return 'windows'
+
+    if sys.platform.startswith('darwin'):
+        return 'osx'
+
+    return 'linux'
+
+
+def arch() -> str:
+    return 'x64'
+
+
+def channel() -> str:
+    return 'stable'
+
+
+def _data_path(name: str) -> str:
+    # Same layout as the Sublime Text data directory, which includes the Local
+    # directory where the session is stored.
+    data_path = os.path.join(tempfile.gettempdir(), 'sublime-headless')
+    for directory in ('Cache', 'Installed Packages', 'Local', 'Packages'):
+        os.makedirs(os.path.join(data_path, directory), exist_ok=True)
+
+    return os.path.join(data_path, name)
+
+
+def packages_path() -> str:
+    return _data_path('Packages')
+
+
+def installed_packages_path() -> str:
+    return _data_path('Installed Packages')
+
+
+def cache_path() -> str:
+    return _data_path('Cache')
+
+
+# The resources are the files in this package e.g. Packages/NeoVintageous/.
+_PACKAGE_PATH = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_PACKAGE_NAME = os.path.basename(_PACKAGE_PATH)
+
+
+def find_resources(pattern: str) -> list:
+    resources = []
+    for root, dirs, files in os.walk(_PACKAGE_PATH):
+        dirs[:] = [d for d in dirs if not d.startswith(('.', '__'))]
+        for f in files:
+            if fnmatch(f, pattern):
+                path = os.path.relpath(os.path.join(root, f), _PACKAGE_PATH).replace(os.sep, '/')
+                resources.append('Packages/%s/%s' % (_PACKAGE_NAME, path))
+
+    return sorted(resources)
+
+
+def load_resource(name: str) -> str:
+    prefix = 'Packages/%s/' % _PACKAGE_NAME
+    if name.startswith(prefix):
+        path = os.path.join(_PACKAGE_PATH, *name[len(prefix):].split('/'))
+        if os.path.isfile(path):
+            with open(path, encoding='utf-8') as f:
+                return f.read()
+
+    raise IOError('resource not found: %s' % name)
+
+
+def decode_value(data: str):
+    # Sublime JSON allows comments and trailing commas.
+    data = re.sub(r'("(?:\\.|[^"\\])*")|//[^\n]*|/\*.*?\*/', lambda m: m.group(1) or '', data, flags=re.DOTALL)
+    data = re.sub(r',(\s*[}\]])', r'\1', data)
+
+    return json.loads(data)
+
+
+def status_message(msg: str) -> None:
+    _messages.append(msg)
+
+
+def message_dialog(msg: str) -> None:
+    _messages.append(msg)
+
+
+def error_message(msg: str) -> None:
+    _messages.append(msg)
+
+
+def ok_cancel_dialog(msg: str, ok_title: str = '') -> bool:
+    return True
+
+
+def yes_no_cancel_dialog(msg: str, yes_title: str = '', no_title: str = '') -> int:
+    return DIALOG_YES
+
+
+def get_clipboard(size_limit: int = 16777216) -> str:
+    return _clipboard[0]
+
+
+def set_clipboard(text: str) -> None:
+    _clipboard[0] = text
+
+
+def log_commands(flag: bool) -> None:
+    pass
+
+
+def log_input(flag: bool) -> None:
+    pass
+
+
+def log_result_regex(flag: bool) -> None:
+    pass
+
+
+def score_selector(scope_name: str, selector: str) -> int:
+    return 1 if _match_selector(scope_name, selector) else 0
+
+
+def get_macro() -> list:
+    return []
+
+
+def load_settings(name: str):
+    try:
+        return _settings[name]
+    except KeyError:
+        settings = _settings[name] = Settings()
+
+        return settings
+
+
+def save_settings(name: str) -> None:
+    pass
+
+
+def set_timeout(callback, delay: int = 0) -> None:
+    # Callbacks are queued, see run_timeouts().
+    _timeouts.append(callback)
+
+
+def set_timeout_async(callback, delay: int = 0) -> None:
+    _timeouts.append(callback)
+
+
+def run_timeouts() -> int:
+    # Runs the callbacks queued by set_timeout() and set_timeout_async(),
+    # including any callbacks queued by those callbacks, in order. Returns the
+    # number of callbacks run. There is no event loop, so the delays are
+    # ignored and it's up to the driver to decide when time has passed.
+    count = 0
+    while _timeouts:
+        _timeouts.pop(0)()
+        count += 1
+
+    return count
+
+
+def run_command(cmd: str, args: dict = None) -> None:
+    from NeoVintageous.tests.headless import sublime_plugin
+
+    command_class = sublime_plugin.find_command_class(sublime_plugin.ApplicationCommand, cmd)
+    if command_class:
+        command_class().run(**(args or {}))
+
+
+def windows() -> list:
+    return list(_windows)
+
+
+def active_window():
+    if not _windows:
+        _windows.append(Window())
+
+    return _windows[0]
+
+
+def reset() -> None:
+    # Discards all windows, views, settings, timeouts and messages.
+    del _windows[:]
+    del _timeouts[:]
+    del _messages[:]
+    _settings.clear()
+    _clipboard[0] = ''
+    _init_preferences()
+
+
+def _match_selector(scope_name: str, selector: str) -> bool:
+    scopes = scope_name.split()
+    for alternative in selector.split(','):
+        parts = alternative.split()
+        if parts and all(any(s == p or s.startswith(p + '.') for s in scopes) for p in parts):
+            return True
+
+    return False
+
+
+class Region:
+
+    __slots__ = ('a', 'b', 'xpos')
+
+    def __init__(self, a: int, b: int = None, xpos: int = -1):
+        if b is None:
+            b = a
+
+        self.a = a
+        self.b = b
+        self.xpos = xpos
+
+    def __repr__(self) -> str:
+        return '(%s, %s)' % (self.a, self.b)
+
+    def __len__(self) -> int:
+        return self.size()
+
+    def __eq__(self, rhs) -> bool:
+        return isinstance(rhs, Region) and self.a == rhs.a and self.b == rhs.b
+
+    def __hash__(self) -> int:
+        return hash((self.a, self.b))
+
+    def __lt__(self, rhs) -> bool:
+        lhs_begin = self.begin()
+        rhs_begin = rhs.begin()
+
+        if lhs_begin == rhs_begin:
+            return self.end() < rhs.end()
+
+        return lhs_begin < rhs_begin
+
+    def __contains__(self, v) -> bool:
+        return self.contains(v)
+
+    def to_tuple(self) -> tuple:
+        return (self.a, self.b)
+
+    def empty(self) -> bool:
+        return self.a == self.b
+
+    def begin(self) -> int:
+        return self.a if self.a < self.b else self.b
+
+    def end(self) -> int:
+        return self.b if self.a < self.b else self.a
+
+    def size(self) -> int:
+        return abs(self.a - self.b)
+
+    def contains(self, x) -> bool:
+        if isinstance(x, Region):
+            return self.contains(x.a) and self.contains(x.b)
+
+        return x >= self.begin() and x <= self.end()
+
+    def cover(self, rhs):
+        a = min(self.begin(), rhs.begin())
+        b = max(self.end(), rhs.end())
+
+        if self.a < self.b:
+            return Region(a, b)
+
+        return Region(b, a)
+
+    def intersection(self, rhs):
+        if self.end() <= rhs.begin() or rhs.end() <= self.begin():
+            return Region(0)
+
+        return Region(max(self.begin(), rhs.begin()), min(self.end(), rhs.end()))
+
+    def intersects(self, rhs) -> bool:
+        lb = self.begin()
+        le = self.end()
+        rb = rhs.begin()
+        re = rhs.end()
+
+        return (
+            (lb == rb and le == re) or
+            (rb > lb and rb < le) or (re > lb and re < le) or
+            (lb > rb and lb < re) or (le > rb and le < re))
+
+
+class Selection:
+
+    def __init__(self, view_id: int = 0):
+        self.view_id = view_id
+        self._regions = []  # type: list
+
+    def __repr__(self) -> str:
+        return repr(self._regions)
+
+    def __len__(self) -> int:
+        return len(self._regions)
+
+    # Like Sublime Text, copies of the regions are returned, so that changes to
+    # them don't change the selection.
+
+    def __getitem__(self, index: int) -> Region:
+        r = self._regions[index]
+
+        return Region(r.a, r.b, r.xpos)
+
+    def __iter__(self):
+        return iter([Region(r.a, r.b, r.xpos) for r in self._regions])
+
+    def __eq__(self, rhs) -> bool:
+        return rhs is not None and list(self) == list(rhs)
+
+    def is_valid(self) -> bool:
+        return True
+
+    def clear(self) -> None:
+        del self._regions[:]
+
+    def add(self, x) -> None:
+        if not isinstance(x, Region):
+            x = Region(x)
+
+        self._regions.append(Region(x.a, x.b, x.xpos))
+        self._normalise()
+
+    def add_all(self, regions) -> None:
+        for region in regions:
+            self._regions.append(Region(region.a, region.b, region.xpos) if isinstance(region, Region) else Region(region))  # noqa: E501
+
+        self._normalise()
+
+    def subtract(self, region: Region) -> None:
+        for i, r in enumerate(self._regions):
+            if r == region:
+                del self._regions[i]
+                return
+
+    def contains(self, region: Region) -> bool:
+        return any(r.contains(region) for r in self._regions)
+
+    def _normalise(self) -> None:
+        # Selections are kept sorted, overlapping regions are merged into one
+        # region, and duplicate empty regions are removed.
+        merged = []  # type: list
+        for region in sorted(self._regions):
+            if merged:
+                last = merged[-1]
+                if region == last or region.begin() < last.end():
+                    if not region.empty():
+                        merged[-1] = last.cover(region)
+
+                    continue
+
+            merged.append(region)
+
+        self._regions[:] = merged
+
+
+class Settings:
+
+    def __init__(self, parent=None):
+        self._data = {}  # type: dict
+        self._parent = parent
+        self._on_change = {}  # type: dict
+
+    def get(self, name: str, default=None):
+        try:
+            return self._data[name]
+        except KeyError:
+            if self._parent is not None:
+                return self._parent.get(name, default)
+
+            return default
+
+    def has(self, name: str) -> bool:
+        return name in self._data
+
+    def set(self, name: str, value) -> None:
+        self._data[name] = value
+        self._notify()
+
+    def erase(self, name: str) -> None:
+        if self._data.pop(name, None) is not None:
+            self._notify()
+
+    def to_dict(self) -> dict:
+        return dict(self._data)
+
+    def add_on_change(self, tag: str, callback) -> None:
+        self._on_change.setdefault(tag, []).append(callback)
+
+    def clear_on_change(self, tag: str) -> None:
+        self._on_change.pop(tag, None)
+
+    def _notify(self) -> None:
+        for callbacks in list(self._on_change.values()):
+            for callback in list(callbacks):
+                callback()
+
+
+class Edit:
+
+    def __init__(self, edit_token: int = 0):
+        self.edit_token = edit_token
+
+
+class Phantom:
+
+    def __init__(self, region: Region, content: str, layout: int, on_navigate=None):
+        self.region = region
+        self.content = content
+        self.layout = layout
+        self.on_navigate = on_navigate
+        self.id = None
+
+    def __eq__(self, rhs) -> bool:
+        return (isinstance(rhs, Phantom) and self.region == rhs.region and self.content == rhs.content and
+                self.layout == rhs.layout)
+
+
+class PhantomSet:
+
+    def __init__(self, view, key: str = ''):
+        self.view = view
+        self.key = key
+        self.phantoms = []  # type: list
+
+    def update(self, new_phantoms: list) -> None:
+        self.view.erase_phantoms(self.key)
+        for phantom in new_phantoms:
+            phantom.id = self.view.add_phantom(self.key, phantom.region, phantom.content, phantom.layout)
+
+        self.phantoms = list(new_phantoms)
+
+
+class View:
+
+    def __init__(self, id: int = None, window=None, text: str = ''):
+        self.view_id = id if id is not None else _next_id()
+        self._window = window
+        self._text = text
+        self._line_starts = None  # type: list
+        self._change_count = 0
+        self._sel = Selection(self.view_id)
+        self._sel.add(Region(0))
+        self._settings = Settings(parent=load_settings('Preferences.sublime-settings'))
+        self._regions = {}  # type: dict
+        self._phantoms = {}  # type: dict
+        self._status = {}  # type: dict
+        self._name = ''
+        self._file_name = None
+        self._read_only = False
+        self._scratch = False
+        self._dirty = False
+        self._overwrite_status = False
+        self._syntax = 'Packages/Text/Plain text.tmLanguage'
+        self._scope = 'text.plain'
+        self._viewport = (0.0, 0.0)
+        self._viewport_extent = (800.0, 50 * _LINE_HEIGHT)
+        self._valid = True
+
+    def __eq__(self, rhs) -> bool:
+        return isinstance(rhs, View) and self.view_id == rhs.view_id
+
+    def __hash__(self) -> int:
+        return self.view_id
+
+    def __repr__(self) -> str:
+        return 'View(%d)' % self.view_id
+
+    def __len__(self) -> int:
+        return self.size()
+
+    def id(self) -> int:
+        return self.view_id
+
+    def buffer_id(self) -> int:
+        return self.view_id
+
+    def is_valid(self) -> bool:
+        return self._valid
+
+    def is_primary(self) -> bool:
+        return True
+
+    def window(self):
+        return self._window
+
+    def close(self) -> bool:
+        if self._window is not None:
+            self._window._close_view(self)
+
+        self._valid = False
+
+        return True
+
+    def file_name(self) -> str:
+        return self._file_name
+
+    def retarget(self, new_fname: str) -> None:
+        self._file_name = new_fname
+
+    def name(self) -> str:
+        return self._name
+
+    def set_name(self, name: str) -> None:
+        self._name = name
+
+    def is_loading(self) -> bool:
+        return False
+
+    def is_dirty(self) -> bool:
+        return self._dirty
+
+    def is_read_only(self) -> bool:
+        return self._read_only
+
+    def set_read_only(self, read_only: bool) -> None:
+        self._read_only = read_only
+
+    def is_scratch(self) -> bool:
+        return self._scratch
+
+    def set_scratch(self, scratch: bool) -> None:
+        self._scratch = scratch
+
+    def settings(self) -> Settings:
+        return self._settings
+
+    def meta_info(self, key: str, pt: int):
+        return None
+
+    def change_count(self) -> int:
+        return self._change_count
+
+    def command_history(self, index: int, modifying_only: bool = False) -> tuple:
+        return ('', None, 0)
+
+    def run_command(self, cmd: str, args: dict = None) -> None:
+        from NeoVintageous.tests.headless import sublime_plugin
+
+        command_class = sublime_plugin.find_command_class(sublime_plugin.TextCommand, cmd)
+        if command_class:
+            command_class(self).run(Edit(), **(args or {}))
+        else:
+            sublime_plugin.run_builtin_text_command(self, cmd, args or {})
+
+    # Buffer.
+
+    def size(self) -> int:
+        return len(self._text)
+
+    def substr(self, x) -> str:
+        if isinstance(x, Region):
+            return self._text[x.begin():x.end()]
+
+        return self._text[x:x + 1] if 0 <= x else ''
+
+    def insert(self, edit: Edit, pt: int, text: str) -> int:
+        pt = max(0, min(pt, self.size()))
+        self._modify(pt, pt, text)
+
+        return len(text)
+
+    def erase(self, edit: Edit, region: Region) -> None:
+        self._modify(region.begin(), region.end(), '')
+
+    def replace(self, edit: Edit, region: Region, text: str) -> None:
+        self._modify(region.begin(), region.end(), text)
+
+    def _modify(self, begin: int, end: int, text: str) -> None:
+        if self._read_only:
+            return
+
+        self._text = self._text[:begin] + text + self._text[end:]
+        self._line_starts = None
+        self._change_count += 1
+        self._dirty = True
+
+        # Regions after the change are shifted, and regions (partially) inside
+        # an erased range are clamped to the start of the change.
+        removed = end - begin
+        delta = len(text) - removed
+
+        def _shift(pt: int) -> int:
+            if pt < begin or (pt == begin and removed):
+                return pt
+
+            if pt >= end:
+                return pt + delta
+
+            return begin
+
+        regions = [Region(_shift(r.a), _shift(r.b), r.xpos) for r in self._sel]
+        self._sel.clear()
+        self._sel.add_all(regions)
+
+        for key, value in self._regions.items():
+            self._regions[key] = (
+                [Region(_shift(r.a), _shift(r.b)) for r in value[0]],) + value[1:]
+
+    def _get_line_starts(self) -> list:
+        if self._line_starts is None:
+            self._line_starts = list(accumulate(len(line) + 1 for line in self._text.split('\n')))
+            self._line_starts.insert(0, 0)
+            self._line_starts.pop()
+
+        return self._line_starts
+
+    def _row(self, pt: int) -> int:
+        return bisect_right(self._get_line_starts(), pt) - 1
+
+    def rowcol(self, pt: int) -> tuple:
+        pt = max(0, min(pt, self.size()))
+        row = self._row(pt)
+
+        return (row, pt - self._get_line_starts()[row])
+
+    def text_point(self, row: int, col: int) -> int:
+        line_starts = self._get_line_starts()
+        if row < 0:
+            return 0
+
+        if row >= len(line_starts):
+            return self.size()
+
+        return max(0, min(line_starts[row] + col, self.size()))
+
+    def _line_end(self, row: int) -> int:
+        line_starts = self._get_line_starts()
+        if row + 1 < len(line_starts):
+            return line_starts[row + 1] - 1
+
+        return self.size()
+
+    def line(self, x) -> Region:
+        if isinstance(x, Region):
+            return Region(self.line(x.begin()).begin(), self.line(x.end()).end())
+
+        row = self._row(max(0, min(x, self.size())))
+
+        return Region(self._get_line_starts()[row], self._line_end(row))
+
+    def full_line(self, x) -> Region:
+        if isinstance(x, Region):
+            return Region(self.full_line(x.begin()).begin(), self.full_line(x.end()).end())
+
+        row = self._row(max(0, min(x, self.size())))
+        end = self._line_end(row)
+
+        return Region(self._get_line_starts()[row], end + 1 if end < self.size() else end)
+
+    def lines(self, region: Region) -> list:
+        first = self._row(region.begin())
+        last = self._row(region.end())
+        line_starts = self._get_line_starts()
+
+        return [Region(line_starts[row], self._line_end(row)) for row in range(first, last + 1)]
+
+    def split_by_newlines(self, region: Region) -> list:
+        if region.empty():
+            return [region]
+
+        lines = []
+        for line in self.lines(region):
+            begin = max(line.begin(), region.begin())
+            end = min(line.end(), region.end())
+            if begin < end or not lines:
+                lines.append(Region(begin, end))
+
+        return lines
+
+    # Searching.
+
+    def _compile(self, pattern: str, flags: int):
+        if flags & LITERAL:
+            pattern = re.escape(pattern)
+
+        return re.compile(pattern, re.MULTILINE | (re.IGNORECASE if flags & IGNORECASE else 0))
+
+    def find(self, pattern: str, start_pt: int, flags: int = 0) -> Region:
+        try:
+            match = self._compile(pattern, flags).search(self._text, max(0, start_pt))
+        except re.error:
+            match = None
+
+        if match:
+            return Region(match.start(), match.end())
+
+        return Region(-1, -1)
+
+    def find_all(self, pattern: str, flags: int = 0, fmt: str = None, extractions: list = None) -> list:
+        try:
+            matches = list(self._compile(pattern, flags).finditer(self._text))
+        except re.error:
+            return []
+
+        if fmt is not None and extractions is not None:
+            fmt = re.sub(r'\$(\d+)|\\(\d+)', lambda m: '\\g<%s>' % (m.group(1) or m.group(2)), fmt)
+            for match in matches:
+                extractions.append(match.expand(fmt))
+
+        return [Region(m.start(), m.end()) for m in matches]
+
+    def _is_separator(self, c: str, separators: str) -> bool:
+        return c in separators
+
+    def classify(self, pt: int) -> int:
+        separators = self._settings.get('word_separators', _DEFAULT_WORD_SEPARATORS)
+
+        return self._classify(pt, separators)
+
+    def _classify(self, pt: int, separators: str) -> int:
+        size = self.size()
+        prev_char = self._text[pt - 1] if 0 < pt <= size else ''
+        next_char = self._text[pt] if 0 <= pt < size else ''
+
+        def _kind(c: str) -> int:
+            if not c or c.isspace():
+                return 0
+
+            return 2 if c in separators else 1
+
+        prev_kind = _kind(prev_char)
+        next_kind = _kind(next_char)
+
+        classes = 0
+
+        if pt == 0 or prev_char == '\n':
+            classes |= CLASS_LINE_START
+
+        if pt == size or next_char == '\n':
+            classes |= CLASS_LINE_END
+
+        if (classes & CLASS_LINE_START) and (classes & CLASS_LINE_END):
+            classes |= CLASS_EMPTY_LINE
+
+        if next_kind == 1 and prev_kind != 1:
+            classes |= CLASS_WORD_START | CLASS_SUB_WORD_START
+
+        if prev_kind == 1 and next_kind != 1:
+            classes |= CLASS_WORD_END | CLASS_SUB_WORD_END
+
+        if next_kind == 2 and prev_kind != 2:
+            classes |= CLASS_PUNCTUATION_START
+
+        if prev_kind == 2 and next_kind != 2:
+            classes |= CLASS_PUNCTUATION_END
+
+        return classes
+
+    def find_by_class(self, pt: int, forward: bool, classes: int, separators: str = '') -> int:
+        if not separators:
+            separators = self._settings.get('word_separators', _DEFAULT_WORD_SEPARATORS)
+
+        size = self.size()
+        if forward:
+            for i in range(pt + 1, size + 1):
+                if self._classify(i, separators) & classes:
+                    return i
+
+            return size
+
+        for i in range(pt - 1, -1, -1):
+            if self._classify(i, separators) & classes:
+                return i
+
+        return 0
+
+    def expand_by_class(self, x, classes: int, separators: str = '') -> Region:
+        if not isinstance(x, Region):
+            x = Region(x)
+
+        if not separators:
+            separators = self._settings.get('word_separators', _DEFAULT_WORD_SEPARATORS)
+
+        a = x.begin()
+        while a > 0 and not (self._classify(a, separators) & classes):
+            a -= 1
+
+        b = x.end()
+        while b < self.size() and not (self._classify(b, separators) & classes):
+            b += 1
+
+        return Region(a, b)
+
+    def word(self, x) -> Region:
+        if isinstance(x, Region):
+            return Region(self.word(x.begin()).begin(), self.word(x.end()).end())
+
+        separators = self._settings.get('word_separators', _DEFAULT_WORD_SEPARATORS)
+
+        def _is_word(c: str) -> bool:
+            return not c.isspace() and c not in separators
+
+        a = b = x
+        while a > 0 and _is_word(self._text[a - 1]):
+            a -= 1
+
+        while b < self.size() and _is_word(self._text[b]):
+            b += 1
+
+        return Region(a, b)
+
+    # Scopes and indentation.
+
+    def syntax(self):
+        return None
+
+    def assign_syntax(self, syntax_file: str) -> None:
+        self._syntax = syntax_file
+
+    def set_syntax_file(self, syntax_file: str) -> None:
+        self._syntax = syntax_file
+
+    def scope_name(self, pt: int) -> str:
+        return self._scope + ' '
+
+    def match_selector(self, pt: int, selector: str) -> bool:
+        return _match_selector(self.scope_name(pt), selector)
+
+    def score_selector(self, pt: int, selector: str) -> int:
+        return score_selector(self.scope_name(pt), selector)
+
+    def extract_scope(self, pt: int) -> Region:
+        return Region(0, self.size())
+
+    def indentation_level(self, pt: int) -> int:
+        line = self.substr(self.line(pt))
+        tab_size = self._settings.get('tab_size', 4)
+        width = len(line.expandtabs(tab_size)) - len(line.lstrip().expandtabs(tab_size))
+
+        return width // tab_size
+
+    def indented_region(self, pt: int) -> Region:
+        return Region(pt)
+
+    def folded_regions(self) -> list:
+        return []
+
+    # Selection and regions.
+
+    def sel(self) -> Selection:
+        return self._sel
+
+    def has_non_empty_selection_region(self) -> bool:
+        return any(not r.empty() for r in self._sel)
+
+    def add_regions(self, key: str, regions: list, scope: str = '', icon: str = '', flags: int = 0, *args, **kwargs) -> None:  # noqa: E501
+        self._regions[key] = ([Region(r.a, r.b) for r in regions], scope, icon, flags)
+
+    def get_regions(self, key: str) -> list:
+        try:
+            return [Region(r.a, r.b) for r in self._regions[key][0]]
+        except KeyError:
+            return []
+
+    def erase_regions(self, key: str) -> None:
+        self._regions.pop(key, None)
+
+    def add_phantom(self, key: str, region: Region, content: str, layout: int, on_navigate=None) -> int:
+        phantom_id = _next_id()
+        self._phantoms.setdefault(key, []).append((phantom_id, region, content, layout))
+
+        return phantom_id
+
+    def erase_phantoms(self, key: str) -> None:
+        self._phantoms.pop(key, None)
+
+    def erase_phantom_by_id(self, pid: int) -> None:
+        for key, phantoms in self._phantoms.items():
+            self._phantoms[key] = [p for p in phantoms if p[0] != pid]
+
+    def set_status(self, key: str, value: str) -> None:
+        self._status[key] = value
+
+    def get_status(self, key: str) -> str:
+        return self._status.get(key, '')
+
+    def erase_status(self, key: str) -> None:
+        self._status.pop(key, None)
+
+    def set_overwrite_status(self, value: bool) -> None:
+        self._overwrite_status = value
+
+    def overwrite_status(self) -> bool:
+        return self._overwrite_status
+
+    # Layout. Each line is _LINE_HEIGHT high and each character is _EM_WIDTH
+    # wide; line wrapping and folding are not supported.
+
+    def line_height(self) -> float:
+        return _LINE_HEIGHT
+
+    def em_width(self) -> float:
+        return _EM_WIDTH
+
+    def text_to_layout(self, pt: int) -> tuple:
+        row, col = self.rowcol(pt)
+
+        return (col * _EM_WIDTH, row * _LINE_HEIGHT)
+
+    def text_to_window(self, pt: int) -> tuple:
+        x, y = self.text_to_layout(pt)
+
+        return (x - self._viewport[0], y - self._viewport[1])
+
+    def layout_to_text(self, vector: tuple) -> int:
+        return self.text_point(int(vector[1] // _LINE_HEIGHT), int(vector[0] // _EM_WIDTH))
+
+    def window_to_text(self, vector: tuple) -> int:
+        return self.layout_to_text((vector[0] + self._viewport[0], vector[1] + self._viewport[1]))
+
+    def layout_extent(self) -> tuple:
+        return (self._viewport_extent[0], len(self._get_line_starts()) * _LINE_HEIGHT)
+
+    def viewport_position(self) -> tuple:
+        return self._viewport
+
+    def set_viewport_position(self, xy: tuple, animate: bool = True) -> None:
+        max_y = max(0.0, self.layout_extent()[1] - _LINE_HEIGHT)
+        self._viewport = (max(0.0, xy[0]), max(0.0, min(float(xy[1]), max_y)))
+
+    def viewport_extent(self) -> tuple:
+        return self._viewport_extent
+
+    def set_viewport_extent(self, extent: tuple) -> None:
+        # Not part of the Sublime API: sets the size of the visible area.
+        self._viewport_extent = extent
+
+    def visible_region(self) -> Region:
+        first_row = int(self._viewport[1] // _LINE_HEIGHT)
+        last_row = first_row + max(1, int(self._viewport_extent[1] // _LINE_HEIGHT)) - 1
+
+        return Region(self.text_point(first_row, 0), self._line_end(min(last_row, len(self._get_line_starts()) - 1)))
+
+    def show(self, x, show_surrounds: bool = True, keep_to_left: bool = False, animate: bool = True) -> None:
+        if isinstance(x, (Selection, list)):
+            if not len(x):
+                return
+            x = x[0]
+
+        pt = x.b if isinstance(x, Region) else x
+        visible = self.visible_region()
+        if visible.contains(pt):
+            return
+
+        row = self.rowcol(pt)[0]
+        rows = max(1, int(self._viewport_extent[1] // _LINE_HEIGHT))
+        if pt < visible.begin():
+            self.set_viewport_position((self._viewport[0], row * _LINE_HEIGHT))
+        else:
+            self.set_viewport_position((self._viewport[0], (row - rows + 1) * _LINE_HEIGHT))
+
+    def show_at_center(self, x) -> None:
+        pt = x.b if isinstance(x, Region) else x
+        rows = max(1, int(self._viewport_extent[1] // _LINE_HEIGHT))
+        self.set_viewport_position((self._viewport[0], (self.rowcol(pt)[0] - rows // 2) * _LINE_HEIGHT))
+
+
+class Window:
+
+    def __init__(self, id: int = None):
+        self.window_id = id if id is not None else _next_id()
+        self._views = []  # type: list
+        self._panels = {}  # type: dict
+        self._active_view = None
+        self._settings = Settings()
+        self._visible = {'menu': True, 'minimap': True, 'sidebar': True, 'status_bar': True, 'tabs': True}
+        self._layout = {'cells': [[0, 0, 1, 1]], 'cols': [0.0, 1.0], 'rows': [0.0, 1.0]}
+
+    def __eq__(self, rhs) -> bool:
+        return isinstance(rhs, Window) and self.window_id == rhs.window_id
+
+    def __hash__(self) -> int:
+        return self.window_id
+
+    def __repr__(self) -> str:
+        return 'Window(%d)' % self.window_id
+
+    def id(self) -> int:
+        return self.window_id
+
+    def is_valid(self) -> bool:
+        return True
+
+    def settings(self) -> Settings:
+        return self._settings
+
+    def run_command(self, cmd: str, args: dict = None) -> None:
+        from NeoVintageous.tests.headless import sublime_plugin
+
+        command_class = sublime_plugin.find_command_class(sublime_plugin.WindowCommand, cmd)
+        if command_class:
+            command_class(self).run(**(args or {}))
+        elif self._active_view is not None:
+            self._active_view.run_command(cmd, args)
+
+    def new_file(self, flags: int = 0, syntax: str = '') -> View:
+        view = View(window=self)
+        self._views.append(view)
+        self._active_view = view
+
+        return view
+
+    def open_file(self, fname: str, flags: int = 0, group: int = -1) -> View:
+        if flags & ENCODED_POSITION:
+            fname = re.sub(r'(?::\d+){1,2}$', '', fname)
+
+        view = self.find_open_file(fname)
+        if view:
+            self.focus_view(view)
+            return view
+
+        view = self.new_file()
+        view._file_name = fname
+        if os.path.isfile(fname):
+            with open(fname, encoding='utf-8', errors='replace') as f:
+                view._text = f.read()
+
+        return view
+
+    def find_open_file(self, fname: str):
+        for view in self._views:
+            if view.file_name() == fname:
+                return view
+
+        return None
+
+    def _close_view(self, view: View) -> None:
+        if view in self._views:
+            self._views.remove(view)
+
+        for name, panel in list(self._panels.items()):
+            if panel == view:
+                del self._panels[name]
+
+        if self._active_view == view:
+            self._active_view = self._views[-1] if self._views else None
+
+    def views(self) -> list:
+        return list(self._views)
+
+    def active_view(self):
+        return self._active_view
+
+    def focus_view(self, view: View) -> None:
+        if view in self._views:
+            self._active_view = view
+
+    def num_groups(self) -> int:
+        return 1
+
+    def active_group(self) -> int:
+        return 0
+
+    def focus_group(self, idx: int) -> None:
+        pass
+
+    def active_view_in_group(self, group: int):
+        return self._active_view if group == 0 else None
+
+    def views_in_group(self, group: int) -> list:
+        return self.views() if group == 0 else []
+
+    def get_view_index(self, view: View) -> tuple:
+        try:
+            return (0, self._views.index(view))
+        except ValueError:
+            return (-1, -1)
+
+    def set_view_index(self, view: View, group: int, idx: int) -> None:
+        if view in self._views:
+            self._views.remove(view)
+            self._views.insert(idx, view)
+
+    def layout(self) -> dict:
+        return self._layout
+
+    def set_layout(self, layout: dict) -> None:
+        self._layout = layout
+
+    def is_sidebar_visible(self) -> bool:
+        return self._visible['sidebar']
+
+    def set_sidebar_visible(self, flag: bool) -> None:
+        self._visible['sidebar'] = flag
+
+    def is_menu_visible(self) -> bool:
+        return self._visible['menu']
+
+    def set_menu_visible(self, flag: bool) -> None:
+        self._visible['menu'] = flag
+
+    def is_minimap_visible(self) -> bool:
+        return self._visible['minimap']
+
+    def set_minimap_visible(self, flag: bool) -> None:
+        self._visible['minimap'] = flag
+
+    def is_status_bar_visible(self) -> bool:
+        return self._visible['status_bar']
+
+    def set_status_bar_visible(self, flag: bool) -> None:
+        self._visible['status_bar'] = flag
+
+    def get_tabs_visible(self) -> bool:
+        return self._visible['tabs']
+
+    def set_tabs_visible(self, flag: bool) -> None:
+        self._visible['tabs'] = flag
+
+    def create_output_panel(self, name: str, unlisted: bool = False) -> View:
+        panel = self._panels[name] = View(window=self)
+
+        return panel
+
+    def find_output_panel(self, name: str):
+        return self._panels.get(name)
+
+    def destroy_output_panel(self, name: str) -> None:
+        self._panels.pop(name, None)
+
+    def show_input_panel(self, caption: str, initial_text: str, on_done, on_change, on_cancel) -> View:
+        panel = View(window=self, text=initial_text)
+        panel._sel.clear()
+        panel._sel.add(Region(len(initial_text)))
+
+        return panel
+
+    def status_message(self, msg: str) -> None:
+        status_message(msg)
+
+    def extract_variables(self) -> dict:
+        variables = {'platform': platform().capitalize() if platform() != 'osx' else 'OSX'}
+        view = self._active_view
+        if view is not None and view.file_name():
+            variables['file'] = view.file_name()
+            variables['file_path'] = os.path.dirname(view.file_name())
+            variables['file_name'] = os.path.basename(view.file_name())
+
+        return variables
+
+    def folders(self) -> list:
+        return []
+
+    def project_data(self):
+        return None
+
+
+def _next_id() -> int:
+    _ids[0] += 1
+
+    return _ids[0]
+
+
+_ids = [0]
+_windows = []  # type: list
+_timeouts = []  # type: list
+_messages = []  # type: list
+_settings = {}  # type: dict
+_clipboard = ['']
+
+
+def _init_preferences() -> None:
+    # The package preferences are loaded on top of the editor defaults.
+    preferences = load_settings('Preferences.sublime-settings')
+    preferences._data.update({
+        'tab_size': 4,
+        'translate_tabs_to_spaces': False,
+        'word_separators': _DEFAULT_WORD_SEPARATORS,
+    })
+
+    try:
+        preferences._data.update(decode_value(load_resource('Packages/%s/Preferences.sublime-settings' % _PACKAGE_NAME)))  # noqa: E501
+    except (IOError, ValueError):
+        pass
+
+
+_init_preferences()
@@ -0,0 +1,193 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# A headless in-memory stand-in for the Sublime Text "sublime_plugin" module.
+#
+# Command classes are registered by name when they are defined, so commands
+# are found by View.run_command(), Window.run_command() and run_command()
+# as soon as the module defining them has been imported. Like Sublime Text,
+# the plugins in the root of the package are imported before the first
+# command is run, but plugin_loaded() is not called. Event listeners are not
+# dispatched. See NeoVintageous.tests.headless.
+
+import importlib
+import os
+
+from NeoVintageous.tests.headless import sublime
+
+_commands = {}  # type: dict
+_plugins_loaded = []  # type: list
+
+# The names of built-in commands run by a view that have no headless
+# implementation, in the order they were run.
+unhandled_commands = []  # type: list
+
+
+def reload_plugin(modulename: str) -> None:
+    # Importing the module is enough to register its commands.
+    importlib.import_module(modulename)
+
+
+def _command_name(cls) -> str:
+    # Same algorithm Sublime Text uses e.g. FooBarCommand -> foo_bar.
+    clsname = cls.__name__
+    name = clsname[0].lower()
+    last_upper = False
+    for c in clsname[1:]:
+        if c.isupper() and not last_upper:
+            name += '_'
+            name += c.lower()
+        else:
+            name += c
+
+        last_upper = c.isupper()
+
+    if name.endswith('_command'):
+        name = name[0:-8]
+
+    return name
+
+
+def _load_plugins() -> None:
+    if _plugins_loaded:
+        return
+
+    _plugins_loaded.append(True)
+    for f in sorted(os.listdir(sublime._PACKAGE_PATH)):
+        if f.endswith('.py'):
+            importlib.import_module('%s.%s' % (sublime._PACKAGE_NAME, f[:-3]))
+
+
+def find_command_class(base, name: str):
+    _load_plugins()
+    cls = _commands.get(name)
+    if cls and issubclass(cls, base):
+        return cls
+
+    return None
+
+
+class Command:
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _commands[_command_name(cls)] = cls
+
+    def name(self) -> str:
+        return _command_name(self.__class__)
+
+    def is_enabled(self) -> bool:
+        return True
+
+    def is_visible(self) -> bool:
+        return True
+
+    def description(self):
+        return None
+
+
+class ApplicationCommand(Command):
+    pass
+
+
+class WindowCommand(Command):
+
+    def __init__(self, window):
+        self.window = window
+
+
+class TextCommand(Command):
+
+    def __init__(self, view):
+        self.view = view
+
+
+class EventListener:
+    pass
+
+
+class ViewEventListener:
+
+    def __init__(self, view):
+        self.view = view
+
+    @classmethod
+    def is_applicable(cls, settings) -> bool:
+        return True
+
+    @classmethod
+    def applies_to_primary_view_only(cls) -> bool:
+        return True
+
+
+class CommandInputHandler:
+    pass
+
+
+class TextInputHandler(CommandInputHandler):
+    pass
+
+
+class ListInputHandler(CommandInputHandler):
+    pass
+
+
+def _insert(view, edit, characters: str) -> None:
+    regions = list(view.sel())
+    for region in reversed(regions):
+        view.replace(edit, region, characters)
+
+    view.sel().clear()
+    delta = 0
+    for region in regions:
+        pt = region.begin() + delta + len(characters)
+        view.sel().add(pt)
+        delta += len(characters) - region.size()
+
+
+def _left_delete(view, edit) -> None:
+    for region in reversed(list(view.sel())):
+        if region.empty() and region.begin() > 0:
+            region = sublime.Region(region.begin() - 1, region.begin())
+
+        view.erase(edit, region)
+
+
+def _right_delete(view, edit) -> None:
+    for region in reversed(list(view.sel())):
+        if region.empty() and region.end() < view.size():
+            region = sublime.Region(region.end(), region.end() + 1)
+
+        view.erase(edit, region)
+
+
+def run_builtin_text_command(view, cmd: str, args: dict) -> None:
+    edit = sublime.Edit()
+    if cmd == 'insert':
+        _insert(view, edit, args.get('characters', ''))
+    elif cmd == 'left_delete':
+        _left_delete(view, edit)
+    elif cmd == 'right_delete':
+        _right_delete(view, edit)
+    elif cmd in (
+            'glue_marked_undo_groups',
+            'mark_undo_groups_for_gluing',
+            'maybe_mark_undo_groups_for_gluing',
+            'unmark_undo_groups_for_gluing'):
+        pass
+    else:
+        unhandled_commands.append(cmd)
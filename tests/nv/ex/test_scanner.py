@@ -599,6 +599,11 @@ class Test_scan_command(unittest.TestCase):
         self.assertRoute(['sort u', 'sor u'], cmd('sort', params={'options': 'u'}, addressable=True))
         self.assertRoute(['sort ui', 'sor ui'], cmd('sort', params={'options': 'ui'}, addressable=True))
         self.assertRoute(['sort', 'sor'], cmd('sort', addressable=True))
+        self.assertRoute(['sort!', 'sor!'], cmd('sort', forced=True, addressable=True))
+        self.assertRoute(['sort! nu', 'sor!nu'], cmd('sort', params={'options': 'nu'}, forced=True, addressable=True))
+        self.assertRoute(['sort /a,b/', 'sor/a,b/'], cmd('sort', params={'pattern': 'a,b'}, addressable=True))
+        self.assertRoute(['sort n /\\d\\/x/ r', 'sor n/\\d\\/x/r'], cmd('sort', params={'options': 'nr', 'pattern': '\\d\\/x'}, addressable=True))  # noqa: E501
+        self.assertRoute(['sort #x#', 'sor #x# " comment'], cmd('sort', params={'pattern': 'x'}, addressable=True))
         self.assertRoute(['spellgood fizz', 'spe fizz'], cmd('spellgood', params={'word': 'fizz'}))
         self.assertRoute(['spellundo fizz', 'spellu fizz'], cmd('spellundo', params={'word': 'fizz'}))
         self.assertRoute(['split file.txt', 'sp file.txt'], cmd('split', params={'file': 'file.txt'}))
@@ -66,15 +66,27 @@ class TestCommandModeAware(unittest.ViewTestCase):
             self.assertEqual(False, self.events.on_query_context(panel, key, OP_EQUAL, True, True))
 
     @unittest.mock.patch('NeoVintageous.nv.events.is_view')
-    def test_is_command_mode_should_return_early_if_not_in_command_mode(self, is_view):
+    def test_is_command_mode_is_cached_until_settings_change(self, is_view):
         self.settings().set('command_mode', True)
         for key in self.KEYS:
             self.events.on_query_context(self.view, key, OP_EQUAL, True, True)
-        self.assertEqual(is_view.call_count, 2)
+        self.assertEqual(is_view.call_count, 1)
         self.settings().set('command_mode', False)
         for key in self.KEYS:
             self.events.on_query_context(self.view, key, OP_EQUAL, True, True)
-        self.assertEqual(is_view.call_count, 3)
+        self.assertEqual(is_view.call_count, 2)
+        self.assertEqual(False, self.events.on_query_context(self.view, 'vi_command_mode_aware', OP_EQUAL, True, True))
+
+    @unittest.mock.patch('NeoVintageous.nv.events.is_view')
+    def test_is_command_mode_is_cached_until_mode_change(self, is_view):
+        self.settings().set('command_mode', True)
+        for key in self.KEYS:
+            self.events.on_query_context(self.view, key, OP_EQUAL, True, True)
+        self.assertEqual(is_view.call_count, 1)
+        self.normal('f|izz')
+        for key in self.KEYS:
+            self.events.on_query_context(self.view, key, OP_EQUAL, True, True)
+        self.assertEqual(is_view.call_count, 2)
 
 
 class TestInsertModeAware(unittest.ViewTestCase):
@@ -121,15 +133,30 @@ class TestInsertModeAware(unittest.ViewTestCase):
             self.assertEqual(False, self.events.on_query_context(self.view, key, OP_REGEX_MATCH, False, True))  # noqa: E501
 
     @unittest.mock.patch('NeoVintageous.nv.events.is_view')
-    def test_is_insert_mode_should_return_early_if_not_command_mode(self, is_view):
+    def test_is_insert_mode_is_cached_until_settings_change(self, is_view):
         self.settings().set('command_mode', False)
+        for key in self.KEYS:
+            self.events.on_query_context(self.view, key, OP_EQUAL, True, False)
+        self.assertEqual(is_view.call_count, 1)
+        self.settings().set('command_mode', True)
         for key in self.KEYS:
             self.events.on_query_context(self.view, key, OP_EQUAL, True, False)
         self.assertEqual(is_view.call_count, 2)
+        self.assertEqual(False, self.events.on_query_context(self.view, 'vi_insert_mode_aware', OP_EQUAL, True, True))
+
+    @unittest.mock.patch('NeoVintageous.nv.events.is_view')
+    def test_query_contexts_are_cached_on_unrelated_settings_changes(self, is_view):
         self.settings().set('command_mode', True)
         for key in self.KEYS:
             self.events.on_query_context(self.view, key, OP_EQUAL, True, False)
-        self.assertEqual(is_view.call_count, 3)
+        self.settings().set('vintageous_fizz', 'buzz')
+        self.settings().set('command_mode', True)
+        for key in self.KEYS:
+            self.events.on_query_context(self.view, key, OP_EQUAL, True, False)
+        self.assertEqual(is_view.call_count, 1)
+        self.settings().set('__vi_external_disable', True)
+        self.events.on_query_context(self.view, 'vi_command_mode_aware', OP_EQUAL, True, False)
+        self.assertEqual(is_view.call_count, 2)
 
     def test_query_contexts_can_be_disabled_by_external_plugins(self):
         self.settings().set('command_mode', True)
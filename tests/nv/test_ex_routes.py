@@ -15,22 +15,27 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+from collections import OrderedDict
 import re
 
 import unittest
 
 from NeoVintageous.nv.ex.scanner import _ScannerState
+from NeoVintageous.nv.ex_routes import _compile_routes
 from NeoVintageous.nv.ex_routes import _ex_route_buffers
 from NeoVintageous.nv.ex_routes import _ex_route_cd
 from NeoVintageous.nv.ex_routes import _ex_route_close
 from NeoVintageous.nv.ex_routes import _ex_route_file
 from NeoVintageous.nv.ex_routes import _ex_route_global
 from NeoVintageous.nv.ex_routes import _ex_route_noremap
+from NeoVintageous.nv.ex_routes import _ex_route_nvprofile
+from NeoVintageous.nv.ex_routes import _ex_route_nvtrace
 from NeoVintageous.nv.ex_routes import _ex_route_only
 from NeoVintageous.nv.ex_routes import _ex_route_onoremap
 from NeoVintageous.nv.ex_routes import _ex_route_substitute
 from NeoVintageous.nv.ex_routes import _ex_route_tabnext
 from NeoVintageous.nv.ex_routes import ex_routes
+from NeoVintageous.nv.ex_routes import match_route
 from NeoVintageous.nv.ex_routes import TokenCommand
 
 
@@ -108,6 +113,34 @@ class Test_ex_route_noremap(unittest.TestCase):
         self.assertEqual(actual, TokenCommand('noremap', params={'lhs': 'w', 'rhs': '2w'}))
 
 
+class Test_ex_route_nvprofile(unittest.TestCase):
+
+    def test_can_scan(self):
+        actual = _ex_route_nvprofile(_ScannerState(''))
+        self.assertEqual(actual, TokenCommand('nvprofile'))
+
+        for action in ('start', 'stop', 'report', 'reset'):
+            actual = _ex_route_nvprofile(_ScannerState(' ' + action))
+            self.assertEqual(actual, TokenCommand('nvprofile', params={'action': action}))
+
+        # An unknown action is an error of the command.
+        actual = _ex_route_nvprofile(_ScannerState(' foo'))
+        self.assertEqual(actual, TokenCommand('nvprofile', params={'action': 'foo'}))
+
+
+class Test_ex_route_nvtrace(unittest.TestCase):
+
+    def test_can_scan(self):
+        actual = _ex_route_nvtrace(_ScannerState(''))
+        self.assertEqual(actual, TokenCommand('nvtrace'))
+
+        actual = _ex_route_nvtrace(_ScannerState(' start'))
+        self.assertEqual(actual, TokenCommand('nvtrace', params={'action': 'start', 'file_name': None}))
+
+        actual = _ex_route_nvtrace(_ScannerState(' stop /tmp/my trace.jsonl '))
+        self.assertEqual(actual, TokenCommand('nvtrace', params={'action': 'stop', 'file_name': '/tmp/my trace.jsonl'}))  # noqa: E501
+
+
 class Test_ex_route_only(unittest.TestCase):
 
     def test_can_scan(self):
@@ -219,16 +252,53 @@ class Test_ex_route_tabnext(unittest.TestCase):
         self.assertEqual(actual, TokenCommand('tabnext', forced=False))
 
 
+class Test_compile_routes(unittest.TestCase):
+
+    def _match(self, routes, string):
+        compiled = _compile_routes(OrderedDict(routes))
+        regex, functions = compiled.get(string[:1], compiled[''])
+        match = regex.match(string) if regex else None
+
+        return functions[match.lastgroup] if match else None
+
+    def test_first_route_that_matches_wins(self):
+        routes = [('ab', 'first'), ('[a-z]b', 'class'), ('a(b)?', 'last'), ('(?:x|yz)', 'branch'), ('\\d', 'digit')]
+        self.assertEqual(self._match(routes, 'ab'), 'first')
+        self.assertEqual(self._match(routes, 'cb'), 'class')
+        self.assertEqual(self._match(routes, 'a'), 'last')
+        self.assertEqual(self._match(routes, 'yz'), 'branch')
+        self.assertEqual(self._match(routes, 'xb'), 'class')
+        self.assertEqual(self._match(routes, '1'), 'digit')
+        self.assertEqual(self._match(routes, 'z'), None)
+        self.assertEqual(self._match(routes, ''), None)
+
+    def test_routes_that_can_start_with_any_character_keep_their_order(self):
+        routes = [('a', 'a'), ('.', 'any'), ('b', 'b')]
+        self.assertEqual(self._match(routes, 'a'), 'a')
+        self.assertEqual(self._match(routes, 'b'), 'any')
+        self.assertEqual(self._match(routes, 'c'), 'any')
+
+
 class TestRoutes(unittest.TestCase):
 
     def _matchRoute(self, string):
         for route, command in ex_routes.items():
             match = re.compile(route).match(string)
             if match:
+                self.assertRouteMatch(string, match, command)
+
                 return (match, route, command)
 
+        self.assertIsNone(match_route(string))
+
         return None
 
+    def assertRouteMatch(self, string, match, command):
+        # The compiled routes match the same route as trying them in order.
+        compiled_match, compiled_command = match_route(string)
+        self.assertEqual(compiled_command, command, 'failed at "{}"'.format(string))
+        self.assertEqual(compiled_match.group(), match.group(0), 'failed at "{}"'.format(string))
+
     def assertNotRoute(self, string):
         self.assertEquals(self._matchRoute(string), None, 'failed asserting no route for {}'.format(string))
 
@@ -273,6 +343,8 @@ class TestRoutes(unittest.TestCase):
         self.assertRoute('_ex_route_nohlsearch', ['nohlsearch', 'noh'])
         self.assertRoute('_ex_route_noremap', ['noremap', 'no'])
         self.assertRoute('_ex_route_nunmap', ['nunmap', 'nun'])
+        self.assertRoute('_ex_route_nvprofile', ['NVProfile'])
+        self.assertRoute('_ex_route_nvtrace', ['NVTrace'])
         self.assertRoute('_ex_route_only', ['only', 'on'])
         self.assertRoute('_ex_route_onoremap', ['onoremap', 'ono'])
         self.assertRoute('_ex_route_ounmap', ['ounmap', 'ou'])
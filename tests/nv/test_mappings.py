@@ -26,14 +26,17 @@ from NeoVintageous.nv.mappings import VISUAL
 from NeoVintageous.nv.mappings import VISUAL_BLOCK
 from NeoVintageous.nv.mappings import VISUAL_LINE
 from NeoVintageous.nv.mappings import _find_full_match
-from NeoVintageous.nv.mappings import _find_partial_matches
+from NeoVintageous.nv.mappings import _get_enabled_plugins
+from NeoVintageous.nv.mappings import _get_resolution_table
 from NeoVintageous.nv.mappings import _seq_to_command
 from NeoVintageous.nv.mappings import _seq_to_mapping
 from NeoVintageous.nv.mappings import mappings_add
 from NeoVintageous.nv.mappings import mappings_clear
 from NeoVintageous.nv.mappings import mappings_is_incomplete
 from NeoVintageous.nv.mappings import mappings_remove
+from NeoVintageous.nv.mappings import mappings_reset_resolution_tables
 from NeoVintageous.nv.mappings import mappings_resolve
+from NeoVintageous.nv.mappings import mappings_stats
 from NeoVintageous.nv.plugin_commentary import CommentaryLines
 from NeoVintageous.nv.plugin_sneak import SneakS
 from NeoVintageous.nv.plugin_surround import SurroundS
@@ -193,33 +196,30 @@ class TestMappings(unittest.ViewTestCase):
         self.assertIsNone(_seq_to_mapping(unittest.NORMAL, 'foobar'))
 
     @unittest.mock_mappings()
-    def test_find_partial_match(self):
-        self.assertEqual(_find_partial_matches(unittest.NORMAL, ''), [])
-        self.assertEqual(_find_partial_matches(unittest.NORMAL, 'foobar'), [])
+    def test_is_incomplete_on_partial_match(self):
+        self.assertFalse(mappings_is_incomplete(unittest.NORMAL, ''))
+        self.assertFalse(mappings_is_incomplete(unittest.NORMAL, 'foobar'))
 
         mappings_add(unittest.NORMAL, 'x', 'y')
 
-        self.assertEqual(_find_partial_matches(unittest.NORMAL, ''), ['x'])
-        self.assertEqual(_find_partial_matches(unittest.NORMAL, 'x'), ['x'])
-        self.assertEqual(_find_partial_matches(unittest.NORMAL, ' '), [])
-        self.assertEqual(_find_partial_matches(unittest.NORMAL, 'x '), [])
-        self.assertEqual(_find_partial_matches(unittest.NORMAL, ' x'), [])
-        self.assertEqual(_find_partial_matches(unittest.NORMAL, 'y'), [])
-        self.assertEqual(_find_partial_matches(unittest.NORMAL, 'xy'), [])
-        self.assertEqual(_find_partial_matches(unittest.NORMAL, 'foobar'), [])
+        self.assertTrue(mappings_is_incomplete(unittest.NORMAL, ''))
+        self.assertFalse(mappings_is_incomplete(unittest.NORMAL, 'x'))
+        self.assertFalse(mappings_is_incomplete(unittest.NORMAL, ' '))
+        self.assertFalse(mappings_is_incomplete(unittest.NORMAL, 'x '))
+        self.assertFalse(mappings_is_incomplete(unittest.NORMAL, ' x'))
+        self.assertFalse(mappings_is_incomplete(unittest.NORMAL, 'y'))
+        self.assertFalse(mappings_is_incomplete(unittest.NORMAL, 'xy'))
+        self.assertFalse(mappings_is_incomplete(unittest.NORMAL, 'foobar'))
 
         mappings_add(unittest.NORMAL, 'yc', 'g')
         mappings_add(unittest.NORMAL, 'yd', 'g')
-        mappings_add(unittest.NORMAL, 'ya', 'g')
-        mappings_add(unittest.NORMAL, 'yb', 'g')
-        mappings_add(unittest.NORMAL, 'Y', 'g')  # For case-sensitive test.
         mappings_add(unittest.NORMAL, 'Ya', 'g')  # For case-sensitive test.
 
-        # Should also be sorted.
-        self.assertEqual(sorted(_find_partial_matches(unittest.NORMAL, 'y')), ['ya', 'yb', 'yc', 'yd'])
-        self.assertEqual(sorted(_find_partial_matches(unittest.NORMAL, '')), ['Y', 'Ya', 'x', 'ya', 'yb', 'yc', 'yd'])
-        self.assertEqual(sorted(_find_partial_matches(unittest.NORMAL, 'yd')), ['yd'])
-        self.assertEqual(sorted(_find_partial_matches(unittest.NORMAL, 'x')), ['x'])
+        self.assertTrue(mappings_is_incomplete(unittest.NORMAL, 'y'))
+        self.assertTrue(mappings_is_incomplete(unittest.NORMAL, 'Y'))
+        self.assertFalse(mappings_is_incomplete(unittest.NORMAL, 'yd'))
+        self.assertFalse(mappings_is_incomplete(unittest.NORMAL, 'yD'))
+        self.assertFalse(mappings_is_incomplete(unittest.NORMAL, 'ya'))
 
     @unittest.mock_mappings()
     def test_find_full_match(self):
@@ -269,6 +269,43 @@ class TestMappings(unittest.ViewTestCase):
         self.assertEquals(mappings_is_incomplete(unittest.NORMAL, 'dd'), True)
         self.assertFalse(mappings_is_incomplete(NORMAL, 'f'))
 
+    @unittest.mock_mappings()
+    def test_is_incomplete_is_token_aware(self):
+        mappings_add(unittest.NORMAL, '<Space>a', 'x')
+        mappings_add(unittest.NORMAL, '<C-w>b', 'x')
+        self.assertTrue(mappings_is_incomplete(unittest.NORMAL, '<space>'))
+        self.assertFalse(mappings_is_incomplete(unittest.NORMAL, '<space>a'))
+        self.assertTrue(mappings_is_incomplete(unittest.NORMAL, '<C-w>'))
+        self.assertFalse(mappings_is_incomplete(unittest.NORMAL, '<space>b'))
+        self.assertTrue(mappings_is_incomplete(unittest.NORMAL, '<sp'))
+        self.assertTrue(mappings_is_incomplete(unittest.NORMAL, '<C-'))
+
+    @unittest.mock_mappings()
+    def test_is_incomplete_after_remove(self):
+        mappings_add(unittest.NORMAL, 'abc', 'x')
+        mappings_add(unittest.NORMAL, 'abd', 'x')
+        self.assertTrue(mappings_is_incomplete(unittest.NORMAL, 'ab'))
+        mappings_remove(unittest.NORMAL, 'abc')
+        self.assertTrue(mappings_is_incomplete(unittest.NORMAL, 'ab'))
+        mappings_remove(unittest.NORMAL, 'abd')
+        self.assertFalse(mappings_is_incomplete(unittest.NORMAL, 'ab'))
+        self.assertFalse(mappings_is_incomplete(unittest.NORMAL, 'a'))
+
+    @unittest.mock_mappings()
+    def test_stats(self):
+        mappings_add(unittest.NORMAL, 'abc', 'x')
+        mappings_add(unittest.NORMAL, 'abd', 'x')
+        mappings_add(unittest.INSERT, 'jk', '<Esc>')
+        stats = mappings_stats()
+        self.assertEqual(stats['modes'][NORMAL], {'mappings': 2, 'nodes': 4})
+        self.assertEqual(stats['modes'][INSERT], {'mappings': 1, 'nodes': 2})
+        self.assertEqual(stats['modes'][VISUAL], {'mappings': 0, 'nodes': 0})
+        partial_lookups = stats['partial_lookups']
+        mappings_is_incomplete(unittest.NORMAL, 'ab')
+        self.assertEqual(mappings_stats()['partial_lookups'], partial_lookups + 1)
+        mappings_remove(unittest.NORMAL, 'abd')
+        self.assertEqual(mappings_stats()['modes'][NORMAL], {'mappings': 1, 'nodes': 3})
+
 
 class TestResolve(unittest.ViewTestCase):
 
@@ -350,9 +387,27 @@ class TestResolve(unittest.ViewTestCase):
         self.setVisualMode()
         self.assertIsInstance(mappings_resolve(self.view, 'S', VISUAL), SurroundS)
 
+    def test_enabled_plugins_are_kept_on_unrelated_setting_changes(self):
+        self.set_setting('enable_sneak', True)
+        enabled = _get_enabled_plugins(self.view)
+        self.assertIn('sneak', enabled)
+        self.setVisualMode()
+        self.view.settings().set('command_mode', True)
+        self.assertIs(enabled, _get_enabled_plugins(self.view))
+        self.set_setting('enable_sneak', False)
+        self.assertNotIn('sneak', _get_enabled_plugins(self.view))
+
 
 class TestSeqToCommand(unittest.TestCase):
 
+    def setUp(self):
+        super().setUp()
+        mappings_reset_resolution_tables()
+
+    def tearDown(self):
+        mappings_reset_resolution_tables()
+        super().tearDown()
+
     @unittest.mock.patch.dict('NeoVintageous.nv.vi.keys.mappings', {
         'a': {'s': 'asv'},
         'b': {'s': 'bsv', 't': 'tsv', 'ep': 'ep', 'dp2': 'dp2'}
@@ -374,7 +429,16 @@ class TestSeqToCommand(unittest.TestCase):
             def get(self, name, default=None):
                 return True
 
+            def add_on_change(self, tag, callback):
+                pass
+
+            def clear_on_change(self, tag):
+                pass
+
         class View():
+            def id(self):
+                return -1
+
             def settings(self):
                 return Settings()
 
@@ -399,3 +463,13 @@ class TestSeqToCommand(unittest.TestCase):
             def settings(self):
                 pass
         self.assertIsInstance(_seq_to_command(seq='foobar', view=View(), mode='a'), ViMissingCommandDef)
+
+    def test_resolution_table_is_built_once_per_plugin_configuration(self):
+        table = _get_resolution_table(())
+        self.assertIs(_get_resolution_table(()), table)
+        self.assertIsNot(_get_resolution_table(('sneak',)), table)
+        self.assertIsInstance(table[NORMAL]['w'], ViMoveByWords)
+        self.assertIsInstance(table[NORMAL]['S'], ViSubstituteByLines)
+        self.assertIsInstance(_get_resolution_table(('sneak',))[NORMAL]['S'], SneakS)
+        self.assertNotIn('gcc', table[NORMAL])
+        self.assertIsInstance(_get_resolution_table(('commentary',))[NORMAL]['gcc'], CommentaryLines)
@@ -0,0 +1,178 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+import re
+
+from sublime import IGNORECASE
+from sublime import LITERAL
+
+from NeoVintageous.tests import unittest
+
+from NeoVintageous.nv.pattern import compile_pattern
+from NeoVintageous.nv.pattern import UnsupportedPatternError
+from NeoVintageous.nv.pattern import translate_pattern
+
+
+def _translate(pattern: str, ignorecase: bool = False, smartcase: bool = False, magic: bool = True,
+               last_substitute: str = None) -> tuple:
+    return translate_pattern(pattern, ignorecase, smartcase, magic, last_substitute)
+
+
+class TestTranslatePattern(unittest.TestCase):
+
+    def test_literal(self):
+        self.assertEqual(('fizz', LITERAL), _translate('fizz'))
+        self.assertEqual(('fizz buzz', LITERAL), _translate('fizz buzz'))
+        self.assertEqual(('a\\b', LITERAL), _translate('a\\\\b'))
+        self.assertEqual(('a/b', LITERAL), _translate('a\\/b'))
+
+    def test_perl_compatible_default(self):
+        self.assertEqual(('(x|y)+', 0), _translate('(x|y)+'))
+        self.assertEqual(('x*?', 0), _translate('x*?'))
+        self.assertEqual(('x{2,3}', 0), _translate('x{2,3}'))
+        self.assertEqual(('foo(?=bar)', 0), _translate('foo(?=bar)'))
+        self.assertEqual(('\\d\\s\\w', 0), _translate('\\d\\s\\w'))
+        self.assertEqual(('[\\d]+', 0), _translate('[\\d]+'))
+        self.assertEqual(('x{', LITERAL), _translate('x{'))
+        self.assertEqual(('(x', LITERAL), _translate('(x'))
+        self.assertEqual(('x)', LITERAL), _translate('x)'))
+        self.assertEqual(('[x', LITERAL), _translate('[x'))
+
+    def test_magic_levels(self):
+        self.assertEqual(('(a|b)+', 0), _translate('\\m\\(a\\|b\\)\\+'))
+        self.assertEqual(('(a|b)+', 0), _translate('\\v(a|b)+'))
+        self.assertEqual(('a*b', LITERAL), _translate('\\Ma*b'))
+        self.assertEqual(('a.*b', 0), _translate('\\Ma\\.\\*b'))
+        self.assertEqual(('a.b', LITERAL), _translate('\\Va.b'))
+        self.assertEqual(('^a\\.b$', 0), _translate('\\V\\^a.b\\$'))
+        self.assertEqual(('(x)', LITERAL), _translate('\\v\\(x\\)'))
+        self.assertEqual(('a|b', LITERAL), _translate('a|b', magic=False))
+        self.assertEqual(('a|b', 0), _translate('a\\|b', magic=False))
+        self.assertEqual(('a|b', LITERAL), _translate('\\Ma|b', magic=True))
+
+    def test_magic_level_can_change_within_pattern(self):
+        self.assertEqual(('a\\.b.', 0), _translate('\\Va.b\\m.'))
+
+    def test_start_and_end_of_line(self):
+        self.assertEqual(('^a|^b', 0), _translate('\\v^a|^b'))
+        self.assertEqual(('foo$|bar', 0), _translate('\\mfoo$\\|bar'))
+        self.assertEqual(('a^b$c', LITERAL), _translate('\\ma^b$c'))
+
+    def test_word_boundaries(self):
+        self.assertEqual(('\\b(?=\\w)foo\\b(?<=\\w)', 0), _translate('\\<foo\\>'))
+        self.assertEqual(('\\b(?=\\w)foo\\b(?<=\\w)', 0), _translate('\\v<foo>'))
+
+    def test_multis(self):
+        self.assertEqual(('a{2,3}', 0), _translate('a\\{2,3}'))
+        self.assertEqual(('a{2}', 0), _translate('a\\{2}'))
+        self.assertEqual(('a{0,3}', 0), _translate('a\\{,3}'))
+        self.assertEqual(('a{1,3}', 0), _translate('a\\{3,1}'))
+        self.assertEqual(('a{1,}?', 0), _translate('a\\{-1,}'))
+        self.assertEqual(('a*?', 0), _translate('a\\{-}'))
+        self.assertEqual(('a*', 0), _translate('a\\{}'))
+        self.assertEqual(('a{2,3}', 0), _translate('\\va{2,3}'))
+        self.assertEqual(('a?', 0), _translate('a\\='))
+        self.assertEqual(('a?', 0), _translate('\\va='))
+        self.assertEqual(('*a', LITERAL), _translate('\\m*a'))
+
+    def test_zs_and_ze(self):
+        self.assertEqual(('(?<=foo)bar', 0), _translate('foo\\zsbar'))
+        self.assertEqual(('foo(?=bar)', 0), _translate('foo\\zebar'))
+        self.assertEqual(('(?<=foo)bar(?=baz)', 0), _translate('foo\\zsbar\\zebaz'))
+        self.assertEqual(('(?<=(?:ab){2})c', 0), _translate('\\m\\%(ab\\)\\{2}\\zsc'))
+        self.assertEqual(('fo*\\Kbar', 0), _translate('fo*\\zsbar'))
+
+    def test_lookarounds(self):
+        self.assertEqual(('foo(?=(bar))', 0), _translate('\\vfoo(bar)@='))
+        self.assertEqual(('foo(?!(bar))', 0), _translate('\\vfoo(bar)@!'))
+        self.assertEqual(('(?<=(foo))bar', 0), _translate('\\m\\(foo\\)\\@<=bar'))
+        self.assertEqual(('(?<!(foo))bar', 0), _translate('\\m\\(foo\\)\\@<!bar'))
+
+    def test_character_classes(self):
+        self.assertEqual(('[A-Za-z]+', 0), _translate('\\v\\a+'))
+        self.assertEqual(('[A-Za-z_][0-9A-Za-z_]*', 0), _translate('\\h\\w\\*', magic=False))
+        self.assertEqual(('[ \\t]+[0-9]{2,}', 0), _translate('\\v\\s+\\d{2,}'))
+        self.assertEqual(('[^ \\t\\n]', 0), _translate('\\m\\S'))
+        self.assertEqual(('[ \\t\\n]', 0), _translate('\\m\\_s'))
+        self.assertEqual(('[\\s\\S]*?end', 0), _translate('\\m\\_.\\{-}end'))
+        self.assertEqual(('[a-z][A-Z][0-9A-Fa-f]', 0), _translate('\\l\\u\\x'))
+
+    def test_collections(self):
+        self.assertEqual(('[A-Za-z]+', 0), _translate('[[:alpha:]]+'))
+        self.assertEqual(('[^\\]a]', 0), _translate('\\m[^]a]'))
+        self.assertEqual(('[\\n\\t]', 0), _translate('\\m[\\n\\t]'))
+        self.assertEqual(('[\\\\d]', 0), _translate('\\v[\\d]'))
+        self.assertEqual(('[abc\\n]', 0), _translate('\\m\\_[abc]'))
+        self.assertEqual(('[abc', LITERAL), _translate('\\m[abc'))
+        self.assertEqual(('[0-9]', LITERAL), _translate('\\M[0-9]'))
+        self.assertEqual(('[0-9]', 0), _translate('\\M\\[0-9]'))
+
+    def test_number_atoms(self):
+        self.assertEqual(('xA', LITERAL), _translate('x\\%d65'))
+        self.assertEqual(('xA', LITERAL), _translate('x\\%x41'))
+        self.assertEqual(('x€', LITERAL), _translate('x\\%u20AC'))
+
+    def test_tilde_matches_last_substitute_string(self):
+        self.assertEqual(('~x', LITERAL), _translate('~x'))
+        self.assertEqual(('a.bx', LITERAL), _translate('~x', last_substitute='a.b'))
+        self.assertEqual(('a\\.bx+', 0), _translate('~x+', last_substitute='a.b'))
+        self.assertEqual(('~x', LITERAL), _translate('\\~x', last_substitute='a.b'))
+        self.assertEqual(('~x', LITERAL), _translate('\\M~x', last_substitute='a.b'))
+
+    def test_case(self):
+        self.assertEqual(('fizz', LITERAL | IGNORECASE), _translate('fizz', ignorecase=True))
+        self.assertEqual(('Fizz', LITERAL), _translate('Fizz', ignorecase=True, smartcase=True))
+        self.assertEqual(('fizz', LITERAL | IGNORECASE), _translate('fizz', ignorecase=True, smartcase=True))
+        self.assertEqual(('[^ \\t\\n]izz', IGNORECASE), _translate('\\m\\Sizz', ignorecase=True, smartcase=True))
+        self.assertEqual(('fizz', LITERAL | IGNORECASE), _translate('fizz\\c'))
+        self.assertEqual(('fizz', LITERAL), _translate('\\Cfizz', ignorecase=True))
+        self.assertEqual(('fizz', LITERAL | IGNORECASE), _translate('fi\\Czz\\c'))
+
+    def test_unsupported_syntax_is_matched_literally(self):
+        self.assertEqual(('x\\%V', LITERAL), _translate('\\mx\\%V'))
+        self.assertEqual(('x**', LITERAL), _translate('\\vx**'))
+
+    def test_translations_are_cached(self):
+        self.assertIs(_translate('\\v(a|b)+'), _translate('\\v(a|b)+'))
+
+
+class TestCompilePattern(unittest.TestCase):
+
+    def test_compile_pattern(self):
+        self.assertEqual(re.compile('a.b', re.MULTILINE), compile_pattern('a.b', 0))
+        self.assertEqual(re.compile('a\\.b', re.MULTILINE), compile_pattern('a.b', LITERAL))
+        self.assertEqual(re.compile('a', re.MULTILINE | re.IGNORECASE), compile_pattern('a', IGNORECASE))
+        self.assertIs(compile_pattern('a.b', 0), compile_pattern('a.b', 0))
+
+    def test_translated_patterns_compile(self):
+        for pattern in ('\\<foo\\>', '\\v(a|b)+', 'foo\\zsbar\\zebaz', '\\m\\_.\\{-}end', '[[:punct:]]', '\\f\\+'):
+            compile_pattern(*_translate(pattern))
+
+    def test_python_target_uses_a_fixed_width_lookbehind_for_zs(self):
+        self.assertEqual(('(?<=foo)bar', 0), translate_pattern('foo\\zsbar', False, False, True, python=True))
+        self.assertEqual(('(?<=fo{3})bar', 0), translate_pattern('fo\\{3}\\zsbar', False, False, True, python=True))
+
+    def test_python_target_raises_for_unsupported_syntax(self):
+        for pattern in ('fo*\\zsbar', '\\vfoo+\\zsbar', '\\m\\(f\\+\\)\\@<=bar', '\\m\\(f\\+\\)\\@<!bar'):
+            with self.assertRaisesRegex(UnsupportedPatternError, '^E383: Invalid search string: '):
+                translate_pattern(pattern, False, False, True, python=True)
+
+    @unittest.mock.patch('NeoVintageous.nv.pattern._PYTHON_ATOMIC_GROUPS', False)
+    def test_python_target_raises_for_atomic_groups_before_python_3_11(self):
+        for pattern in ('\\v(a*)@>b', 'x*+'):
+            with self.assertRaisesRegex(UnsupportedPatternError, 'requires Python 3.11'):
+                translate_pattern(pattern, False, False, True, python=True)
@@ -16,10 +16,25 @@
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
 
+from types import SimpleNamespace
+import re
+
+try:
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_parse  # type: ignore
+
+from sublime import IGNORECASE
+from sublime import LITERAL
+
 from NeoVintageous.tests import unittest
 
+from NeoVintageous.nv.polyfill import iter_find_in_range
+from NeoVintageous.nv.polyfill import iter_rfind_in_range
 from NeoVintageous.nv.polyfill import view_find
+from NeoVintageous.nv.polyfill import view_find_all_in_range
 from NeoVintageous.nv.polyfill import view_find_in_range
+from NeoVintageous.nv.polyfill import view_rfind_all
 
 
 class TestViewFind(unittest.ViewTestCase):
@@ -54,3 +69,135 @@ class TestViewFindInRange(unittest.ViewTestCase):
         self.normal('|fizz buzz')
         self.assertIsNone(view_find_in_range(self.view, 'x', 0, 9))
         self.assertIsNone(view_find_in_range(self.view, 'u', 1, 6))
+
+
+class TestIterFindInRange(unittest.ViewTestCase):
+
+    def test_find_all_in_range(self):
+        self.normal('|fizz buzz fizz buzz fizz')
+        self.assertEqual([(10, 14), (20, 24)], [(r.a, r.b) for r in view_find_all_in_range(self.view, 'fizz', 1, 24)])
+        self.assertEqual([(10, 14)], [(r.a, r.b) for r in view_find_all_in_range(self.view, 'fizz', 1, 23)])
+        self.assertEqual([], view_find_all_in_range(self.view, 'x', 0, 24))
+
+    def test_zero_length_matches(self):
+        self.normal('|a\nb\n')
+        self.assertEqual([(1, 1), (3, 3), (4, 4)], [(r.a, r.b) for r in iter_find_in_range(self.view, '$', 0, 4)])
+
+    def test_is_lazy(self):
+        self.normal('|fizz buzz fizz buzz fizz')
+        with unittest.mock.patch.object(self.view, 'find', wraps=self.view.find) as find:
+            matches = iter_find_in_range(self.view, 'fizz', 0, 24)
+            self.assertEqual(0, find.call_count)
+            self.assertRegion(next(matches), (0, 4))
+            self.assertEqual(1, find.call_count)
+
+    def test_limit(self):
+        self.normal('|fizz buzz fizz buzz fizz')
+        with unittest.mock.patch.object(self.view, 'find', wraps=self.view.find) as find:
+            self.assertEqual([(0, 4), (10, 14)], [(r.a, r.b) for r in iter_find_in_range(self.view, 'fizz', 0, 24, limit=2)])  # noqa: E501
+            self.assertEqual(2, find.call_count)
+
+        self.assertEqual([], list(iter_find_in_range(self.view, 'fizz', 0, 24, limit=0)))
+
+
+class TestIterRfindInRange(unittest.ViewTestCase):
+
+    def test_rfind_in_range(self):
+        self.normal('|fizz buzz fizz buzz fizz')
+        self.assertEqual([(10, 14), (0, 4)], [(r.a, r.b) for r in iter_rfind_in_range(self.view, 'fizz', 0, 23)])
+        self.assertEqual([(10, 14)], [(r.a, r.b) for r in iter_rfind_in_range(self.view, 'fizz', 1, 23)])
+        self.assertEqual([(20, 24)], [(r.a, r.b) for r in iter_rfind_in_range(self.view, 'fizz', 0, 24, limit=1)])
+        self.assertEqual([], list(iter_rfind_in_range(self.view, 'fizz', 0, 3)))
+
+
+class TestViewRfindAll(unittest.ViewTestCase):
+
+    def rfind_all(self, pattern, start_pt, flags=0, stop_pt=0):
+        return [(r.a, r.b) for r in view_rfind_all(self.view, pattern, start_pt, flags, stop_pt)]
+
+    def test_match(self):
+        self.write('fizz buzz fizz buzz')
+        self.assertEqual(self.rfind_all('fizz', 19), [(10, 14), (0, 4)])
+        self.assertEqual(self.rfind_all('fizz', 13), [(0, 4)])
+        self.assertEqual(self.rfind_all('fizz', 3), [])
+        self.assertEqual(self.rfind_all('z+', 19), [(17, 19), (12, 14), (7, 9), (2, 4)])
+        self.assertEqual(self.rfind_all('z+', 18), [(12, 14), (7, 9), (2, 4)])
+        self.assertEqual(self.rfind_all('fizz', 19, stop_pt=1), [(10, 14)])
+
+    def test_flags(self):
+        self.write('Fizz f.zz fizz')
+        self.assertEqual(self.rfind_all('f.zz', 14, LITERAL), [(5, 9)])
+        self.assertEqual(self.rfind_all('fizz', 14, IGNORECASE), [(10, 14), (0, 4)])
+        self.assertEqual(self.rfind_all('F.ZZ', 14, LITERAL | IGNORECASE), [(5, 9)])
+
+    def test_anchors_see_the_buffer_context(self):
+        self.write('fizz\nbuzz fizz\nfizz')
+        self.assertEqual(self.rfind_all('^fizz', 19), [(15, 19), (0, 4)])
+        self.assertEqual(self.rfind_all('fizz$', 19), [(15, 19), (10, 14), (0, 4)])
+        self.assertEqual(self.rfind_all('^fizz', 19, stop_pt=11), [(15, 19)])
+        self.assertEqual(self.rfind_all('^buzz', 19, stop_pt=6), [])
+
+    @unittest.mock.patch('NeoVintageous.nv.polyfill._RFIND_CHUNK_SIZE', 2)
+    def test_scans_backwards_in_chunks(self):
+        self.write('fizz\n' * 50)
+        expected = [(i * 5, i * 5 + 4) for i in reversed(range(50))]
+        self.assertEqual(self.rfind_all('fizz', 250), expected)
+        self.assertEqual(self.rfind_all('fizz', 248), expected[1:])
+
+    @unittest.mock.patch('NeoVintageous.nv.polyfill._RFIND_CHUNK_SIZE', 2)
+    def test_matches_spanning_chunk_boundaries(self):
+        self.write('a\nb\na\nb\nx\na\nb')
+        self.assertEqual(self.rfind_all('a\\nb', 13), [(10, 13), (4, 7), (0, 3)])
+        self.assertEqual(self.rfind_all('(?:a\\nb\\n)+', 13), [(0, 8)])
+
+    @unittest.mock.patch('NeoVintageous.nv.polyfill._RFIND_CHUNK_SIZE', 2)
+    def test_multiline_matches_beginning_before_a_chunk(self):
+        # A chunk that begins at a line would find (4, 7) and (7, 10), which
+        # aren't matches of a forward search.
+        self.write('abc\nabc\nabc')
+        self.assertEqual(self.rfind_all('[^x]{3}', 11), [(6, 9), (3, 6), (0, 3)])
+        self.assertEqual(self.rfind_all('(?s)c.a', 11), [(6, 9), (2, 5)])
+        self.assertEqual(self.rfind_all('b\\sa|c', 11), [(10, 11), (6, 7), (2, 3)])
+
+    @unittest.mock.patch('NeoVintageous.nv.polyfill._RFIND_CHUNK_SIZE', 2)
+    def test_single_line_matches_are_not_deferred_across_chunks(self):
+        text = 'ab ab\nab\n\nab ab'
+        self.write(text)
+        for pattern in ('ab', 'b?', '^|$', '(?<=b) ', ' (?=a)'):
+            expected = [(m.start(), m.end()) for m in re.finditer(pattern, text, re.MULTILINE)]
+            self.assertEqual(self.rfind_all(pattern, len(text)), expected[::-1], pattern)
+
+    @unittest.mock.patch('NeoVintageous.nv.polyfill._RFIND_CHUNK_SIZE', 2)
+    def test_buffer_anchors_only_match_at_the_start_of_the_buffer(self):
+        self.write('foo\nfoo\nfoo')
+        with unittest.mock.patch.object(self.view, 'find_all', return_value=[self.Region(0, 3)]) as find_all:
+            self.assertEqual(self.rfind_all('\\Afoo', 11), [(0, 3)])
+            self.assertEqual(find_all.call_count, 1)
+
+    def test_groups(self):
+        self.write('fizz buzz fizz')
+        self.assertEqual(self.rfind_all('(fizz)', 14), [(10, 14), (0, 4)])
+        self.assertEqual(self.rfind_all('(?:fi)(zz)', 14), [(10, 14), (0, 4)])
+
+    def test_groups_are_parsed_without_scoped_flags_before_python_3_6(self):
+        # Before Python 3.6 a parsed group is (group, p) instead of (group,
+        # add_flags, del_flags, p).
+        def parse_without_scoped_flags(*args):
+            return [(op, (av[0], av[-1]) if op is sre_parse.SUBPATTERN else av) for op, av in sre_parse.parse(*args)]
+
+        parser = SimpleNamespace(**vars(sre_parse))
+        parser.parse = parse_without_scoped_flags
+
+        self.write('a\nb fizzbuzz fizzbuzz')
+        with unittest.mock.patch('NeoVintageous.nv.polyfill.sre_parse', parser):
+            self.assertEqual(self.rfind_all('(fizz)buzz', 22), [(13, 21), (4, 12)])
+            self.assertEqual(self.rfind_all('(a\\n)b', 22), [(0, 3)])
+
+    def test_unsupported_python_syntax_falls_back_to_sublime_search(self):
+        self.write('fizz buzz fizz')
+        occurrences = [self.Region(0, 4), self.Region(10, 14)]
+        with unittest.mock.patch.object(self.view, 'find_all', return_value=occurrences) as find_all:
+            self.assertEqual(self.rfind_all('\\<fizz\\>', 14), [(10, 14), (0, 4)])
+            self.assertEqual(self.rfind_all('\\<fizz\\>', 13, stop_pt=0), [(0, 4)])
+            self.assertEqual(self.rfind_all('[[:alpha:]]+', 14, stop_pt=1), [(10, 14)])
+            self.assertEqual(find_all.call_count, 3)
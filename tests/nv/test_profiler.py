@@ -0,0 +1,111 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from unittest.mock import patch
+import unittest
+
+from NeoVintageous.nv import profiler
+from NeoVintageous.nv import regexes
+from NeoVintageous.nv.regexes import register_regex
+
+
+class TestProfiler(unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        profiler.profiler_reset()
+        profiler.profiler_start()
+
+    def tearDown(self):
+        profiler.profiler_stop()
+        profiler.profiler_reset()
+        super().tearDown()
+
+    def test_disabled_profiler_records_nothing(self):
+        profiler.profiler_stop()
+        self.assertEqual(0, profiler.profile_clock())
+        profiler.profile_key_begin()
+        profiler.profile_stage(profiler.STAGE_SELECTION_FIX, 0)
+        profiler.profile_key_end('x')
+        self.assertEqual({}, profiler._samples)
+        self.assertIn('no samples', profiler.profiler_report())
+
+    @patch('NeoVintageous.nv.profiler.perf_counter_ns')
+    def test_records_stages_per_command(self, perf_counter_ns):
+        perf_counter_ns.side_effect = [1000, 2000, 5000, 6000, 6000, 10000]
+        profiler.profile_key_begin()
+        start = profiler.profile_clock()
+        profiler.profile_stage(profiler.STAGE_MAPPING_RESOLUTION, start)
+        profiler.profile_command('ViMoveByWords')
+        start = profiler.profile_clock()
+        profiler.profile_stage(profiler.STAGE_RUN_COMMAND, start)
+        profiler.profile_key_end('w')
+
+        samples = profiler._samples['ViMoveByWords']
+        self.assertEqual([3000], list(samples[profiler.STAGE_MAPPING_RESOLUTION].percentiles(50)))
+        self.assertEqual([0], list(samples[profiler.STAGE_RUN_COMMAND].percentiles(50)))
+        self.assertEqual([9000], list(samples[profiler.STAGE_TOTAL].percentiles(50)))
+
+    def test_key_is_used_when_no_command_resolved(self):
+        profiler.profile_key_begin()
+        profiler.profile_key_end('2')
+        self.assertIn('2', profiler._samples)
+        self.assertIn(profiler.STAGE_TOTAL, profiler._samples['2'])
+
+    def test_nested_keys(self):
+        profiler.profile_key_begin()
+        profiler.profile_command('Mapping')
+        profiler.profile_key_begin()
+        profiler.profile_command('ViMoveLeftByChars')
+        profiler.profile_key_end('h')
+        profiler.profile_key_end('x')
+        self.assertEqual(['Mapping', 'ViMoveLeftByChars'], sorted(profiler._samples))
+
+    def test_ring_buffer(self):
+        buffer = profiler._RingBuffer(size=4)
+        for value in (1, 2, 3, 4, 5, 6):
+            buffer.add(value * 1000000)
+
+        self.assertEqual(6, buffer.count)
+        self.assertEqual([3000000, 6000000], buffer.percentiles(0, 99))
+        self.assertEqual(0, buffer.over_budget())
+        buffer.add(17000000)
+        self.assertEqual(1, buffer.over_budget())
+
+    def test_report(self):
+        profiler.profile_key_begin()
+        profiler.profile_command('ViMoveByWords')
+        profiler.profile_key_end('w')
+        report = profiler.profiler_report()
+        self.assertIn('ViMoveByWords', report)
+        self.assertIn('p99', report)
+        profiler.profiler_reset()
+        self.assertIn('no samples', profiler.profiler_report())
+
+    def test_report_regex_counts(self):
+        regex = register_regex('test.profiler', 'x')
+        self.addCleanup(regexes._registry.pop, 'test.profiler')
+        profiler.profiler_reset()
+        self.assertNotIn('test.profiler', profiler.profiler_report())
+        regex.match('x')
+        regex.match('y')
+        self.assertRegex(profiler.profiler_report(), 'test\\.profiler +2')
+        profiler.profiler_reset()
+        self.assertNotIn('test.profiler', profiler.profiler_report())
+        profiler.profiler_stop()
+        regex.match('x')
+        self.assertNotIn('test.profiler', profiler.profiler_report())
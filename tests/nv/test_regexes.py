@@ -0,0 +1,157 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+import ast
+import os
+import re
+import sys
+import unittest
+
+from NeoVintageous.nv import regexes
+from NeoVintageous.nv.regexes import get_regex_counts
+from NeoVintageous.nv.regexes import register_regex
+from NeoVintageous.nv.regexes import reset_regex_counts
+from NeoVintageous.nv.regexes import set_regex_counting
+
+
+_NV_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'nv')
+
+# The modules that aren't on the key press path, which may pass literal patterns
+# to the re module e.g. the ex commands, which are only run on <CR>.
+_NOT_KEY_PRESS_PATH = (
+    'ex',
+    'ex_cmds.py',
+    'modeline.py',
+    'rc.py',
+    'regexes.py',
+)
+
+# The re functions that take a pattern as their first argument.
+_RE_FUNCTIONS = ('compile', 'findall', 'finditer', 'fullmatch', 'match', 'search', 'split', 'sub', 'subn')
+
+
+def _literal_str(node):
+    # Python < 3.8 parses string literals as ast.Str nodes.
+    if sys.version_info < (3, 8):
+        return node.s if isinstance(node, ast.Str) else None
+
+    return node.value if isinstance(node, ast.Constant) and isinstance(node.value, str) else None
+
+
+def _iter_module_paths(path: str):
+    for root, dirs, files in os.walk(path):
+        for name in files:
+            if name.endswith('.py'):
+                yield os.path.join(root, name)
+
+
+def _find_literal_pattern_calls(source: str) -> list:
+    calls = []
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+            func = node.func
+            if isinstance(func.value, ast.Name) and func.value.id == 're' and func.attr in _RE_FUNCTIONS:
+                pattern = node.args[0] if node.args else None
+                for keyword in node.keywords:
+                    if keyword.arg == 'pattern':
+                        pattern = keyword.value
+
+                value = _literal_str(pattern)
+                if value is not None:
+                    calls.append((node.lineno, 're.%s(%r)' % (func.attr, value)))
+
+    return calls
+
+
+class TestRegisterRegex(unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.registry = dict(regexes._registry)
+        set_regex_counting(True)
+
+    def tearDown(self):
+        set_regex_counting(False)
+        regexes._registry.clear()
+        regexes._registry.update(self.registry)
+        super().tearDown()
+
+    def test_counts_uses(self):
+        regex = register_regex('test.digits', '\\d+')
+        self.assertEqual(0, get_regex_counts()['test.digits'])
+        self.assertEqual('42', regex.match('42x').group(0))
+        self.assertIsNone(regex.match('x42'))
+        self.assertEqual('42', regex.search('x42').group(0))
+        self.assertEqual(['1', '2'], regex.findall('1x2'))
+        self.assertEqual(['1', '2'], [m.group(0) for m in regex.finditer('1x2')])
+        self.assertEqual(['a', 'b'], regex.split('a1b'))
+        self.assertEqual('a_b_', regex.sub('_', 'a1b2'))
+        self.assertEqual('a_b2', regex.sub('_', 'a1b2', 1))
+        self.assertEqual(8, get_regex_counts()['test.digits'])
+        self.assertEqual('\\d+', regex.pattern)
+
+    def test_does_not_count_uses_when_counting_is_disabled(self):
+        regex = register_regex('test.disabled', 'a')
+        set_regex_counting(False)
+        self.assertEqual(regex.regex.match, regex.match)
+        self.assertIsNotNone(regex.match('a'))
+        self.assertEqual(0, get_regex_counts()['test.disabled'])
+        set_regex_counting(True)
+        self.assertIsNotNone(regex.match('a'))
+        self.assertEqual(1, get_regex_counts()['test.disabled'])
+
+    def test_registered_when_counting_is_disabled(self):
+        set_regex_counting(False)
+        regex = register_regex('test.registered', 'a')
+        self.assertIsNotNone(regex.search('ba'))
+        self.assertEqual(0, get_regex_counts()['test.registered'])
+
+    def test_flags(self):
+        regex = register_regex('test.flags', 'x.y', re.DOTALL)
+        self.assertIsNotNone(regex.match('x\ny'))
+
+    def test_register_again_replaces(self):
+        register_regex('test.replaced', 'a').match('a')
+        regex = register_regex('test.replaced', 'b')
+        self.assertEqual(0, get_regex_counts()['test.replaced'])
+        self.assertIsNotNone(regex.match('b'))
+
+    def test_reset_counts(self):
+        register_regex('test.reset', 'a').match('a')
+        reset_regex_counts()
+        self.assertEqual(0, get_regex_counts()['test.reset'])
+
+
+class TestKeyPressPathRegexes(unittest.TestCase):
+
+    def test_find_literal_pattern_calls(self):
+        self.assertEqual([
+            (1, "re.match('a')"),
+            (2, "re.sub('b')"),
+            (3, "re.compile('c')"),
+        ], _find_literal_pattern_calls("re.match('a', x)\nre.sub(pattern='b', repl='', string=x)\nX = re.compile('c')\n"))  # noqa: E501
+        self.assertEqual([], _find_literal_pattern_calls("re.escape('a')\nre.match(pattern, x)\nregex.match('a')\n"))
+
+    def test_modules_on_the_key_press_path_use_registered_regexes(self):
+        # Register the regex with nv.regexes.register_regex() instead.
+        for path in sorted(_iter_module_paths(_NV_PATH)):
+            name = os.path.relpath(path, _NV_PATH)
+            if name.split(os.sep)[0] in _NOT_KEY_PRESS_PATH:
+                continue
+
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual([], _find_literal_pattern_calls(f.read()), name)
@@ -17,8 +17,17 @@
 
 from NeoVintageous.tests import unittest
 
+from NeoVintageous.nv.search import add_incremental_search_highlighting
+from NeoVintageous.nv.search import add_search_highlighting
+from NeoVintageous.nv.search import clear_search_highlighting
+from NeoVintageous.nv.search import find_search_occurrences
+from NeoVintageous.nv.search import get_cached_search_occurrences
+from NeoVintageous.nv.search import get_search_occurrences
 from NeoVintageous.nv.search import process_search_pattern
 from NeoVintageous.nv.search import process_word_search_pattern
+from NeoVintageous.nv.search import search_on_close
+from NeoVintageous.nv.search import search_on_post_text_command
+from NeoVintageous.nv.search import show_search_count
 
 
 class Test_flags(unittest.ViewTestCase):
@@ -71,3 +80,379 @@ class Test_flags(unittest.ViewTestCase):
         self.set_option('magic', False)
         self.set_option('ignorecase', True)
         self.assertEqual(('\\bfizz\\b', 2), process_word_search_pattern(self.view, 'fizz'))
+
+
+class TestIncrementalSearchHighlighting(unittest.ViewTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.set_option('hlsearch', True)
+        self.set_option('incsearch', True)
+        self.callbacks = []
+        self.main_callbacks = []
+        patcher = unittest.mock.patch('NeoVintageous.nv.search.set_timeout_async', side_effect=self.schedule)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = unittest.mock.patch('NeoVintageous.nv.search.set_timeout', side_effect=self.schedule_main)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def schedule(self, callback, delay=0):
+        self.callbacks.append(callback)
+
+    def schedule_main(self, callback, delay=0):
+        self.main_callbacks.append(callback)
+
+    def run_callbacks(self):
+        while self.callbacks or self.main_callbacks:
+            while self.callbacks:
+                self.callbacks.pop(0)()
+
+            while self.main_callbacks:
+                self.main_callbacks.pop(0)()
+
+    def highlight(self, text, pattern, visible):
+        self.normal(text)
+        match = self.view.find(pattern, self.view.sel()[0].b + 1)
+        with unittest.mock.patch('NeoVintageous.nv.search._get_incsearch_region', return_value=visible):
+            add_incremental_search_highlighting(self.view, pattern, 0, match)
+
+    def test_highlights_all_occurrences_synchronously_below_threshold(self):
+        self.set_setting('incsearch_async_threshold', 1000)
+        self.highlight('|x fizz\nfizz\nfizz\n', 'fizz', self.Region(0, 7))
+        self.assertEqual(self.callbacks, [])
+        self.assertSearch('x |fizz|\n|fizz|\n|fizz|\n')
+        self.assertSearchIncremental('x |fizz|\nfizz\nfizz\n')
+
+    @unittest.mock.patch('NeoVintageous.nv.search._INCSEARCH_CHUNK_SIZE', 4)
+    def test_highlights_visible_region_first_and_the_rest_in_chunks(self):
+        self.set_setting('incsearch_async_threshold', 10)
+        self.highlight('fizz\nfizz\n|x fizz\nfizz\nfizz\n', 'fizz', self.Region(10, 21))
+        self.assertSearch('fizz\nfizz\nx |fizz|\n|fizz|\nfizz\n')
+        self.assertSearchIncremental('fizz\nfizz\nx |fizz|\nfizz\nfizz\n')
+        self.assertEqual(len(self.callbacks), 1)
+        self.callbacks.pop(0)()
+        self.assertSearch('fizz\nfizz\nx |fizz|\n|fizz|\nfizz\n')
+        self.main_callbacks.pop(0)()
+        self.assertSearch('fizz\nfizz\nx |fizz|\n|fizz|\n|fizz|\n')
+        self.run_callbacks()
+        self.assertSearch('|fizz|\n|fizz|\nx |fizz|\n|fizz|\n|fizz|\n')
+
+    @unittest.mock.patch('NeoVintageous.nv.search._INCSEARCH_CHUNK_SIZE', 4)
+    def test_chunks_scanned_between_main_thread_ticks_are_added_at_once(self):
+        self.set_setting('incsearch_async_threshold', 10)
+        self.highlight('fizz\nfizz\n|x fizz\nfizz\nfizz\n', 'fizz', self.Region(10, 21))
+        while self.callbacks:
+            self.callbacks.pop(0)()
+
+        self.assertEqual(1, len(self.main_callbacks))
+        with unittest.mock.patch.object(self.view, 'add_regions', wraps=self.view.add_regions) as add_regions:
+            self.main_callbacks.pop(0)()
+            self.assertEqual(1, add_regions.call_count)
+
+        self.assertSearch('|fizz|\n|fizz|\nx |fizz|\n|fizz|\n|fizz|\n')
+
+    def test_pending_chunks_are_cancelled_by_clearing(self):
+        self.set_setting('incsearch_async_threshold', 10)
+        self.highlight('fizz\nfizz\n|x fizz\nfizz\nfizz\n', 'fizz', self.Region(10, 21))
+        clear_search_highlighting(self.view)
+        self.run_callbacks()
+        self.assertSearch('fizz\nfizz\nx fizz\nfizz\nfizz\n')
+
+    def test_pending_chunks_are_cancelled_by_next_pattern(self):
+        self.set_setting('incsearch_async_threshold', 10)
+        self.highlight('fizz\nfizz\n|x fizz\nfizz\nfizz\n', 'fizz', self.Region(10, 21))
+        callbacks = self.callbacks[:]
+        clear_search_highlighting(self.view)
+        self.highlight('fizz\nfizz\n|x fizz\nfizz\nfizz\n', 'fiz', self.Region(10, 21))
+        for callback in callbacks:
+            callback()
+
+        self.assertSearch('fizz\nfizz\nx |fiz|z\n|fiz|z\nfizz\n')
+        self.run_callbacks()
+        self.assertSearch('|fiz|z\n|fiz|z\nx |fiz|z\n|fiz|z\n|fiz|z\n')
+
+
+class TestSearchOccurrencesCache(unittest.ViewTestCase):
+
+    def test_find_search_occurrences(self):
+        self.write('fizz buzz fizz buzz fizz')
+        self.assertIsNone(get_cached_search_occurrences(self.view, 'fizz', 0))
+        expected = [self.Region(0, 4), self.Region(10, 14), self.Region(20, 24)]
+        self.assertEqual(expected, find_search_occurrences(self.view, 'fizz', 0))
+        starts, ends = get_cached_search_occurrences(self.view, 'fizz', 0)
+        self.assertEqual([0, 10, 20], list(starts))
+        self.assertEqual([4, 14, 24], list(ends))
+        self.assertIsNone(get_cached_search_occurrences(self.view, 'buzz', 0))
+        self.assertIsNone(get_cached_search_occurrences(self.view, 'fizz', 2))
+
+    def test_find_search_occurrences_is_cached(self):
+        self.write('fizz buzz fizz buzz fizz')
+        find_search_occurrences(self.view, 'fizz', 0)
+        with unittest.mock.patch.object(self.view, 'find_all') as find_all:
+            self.assertEqual(3, len(find_search_occurrences(self.view, 'fizz', 0)))
+            self.assertMockNotCalled(find_all)
+
+    def test_cache_is_evicted_on_modification(self):
+        self.write('fizz buzz fizz buzz fizz')
+        find_search_occurrences(self.view, 'fizz', 0)
+        self.view.run_command('insert', {'characters': 'fizz'})
+        self.assertIsNone(get_cached_search_occurrences(self.view, 'fizz', 0))
+        self.assertEqual(4, len(find_search_occurrences(self.view, 'fizz', 0)))
+
+    def test_cache_is_evicted_on_close(self):
+        self.write('fizz buzz fizz buzz fizz')
+        find_search_occurrences(self.view, 'fizz', 0)
+        search_on_close(self.view)
+        self.assertIsNone(get_cached_search_occurrences(self.view, 'fizz', 0))
+
+
+class TestSearchHighlighting(unittest.ViewTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.set_option('hlsearch', True)
+
+    def test_current_occurrences(self):
+        self.normal('fizz |fizz fizz f|izz |fizz fizz')
+        add_search_highlighting(self.view, self.view.find_all('fizz'))
+        self.assertSearch('|fizz| |fizz| |fizz| |fizz| |fizz| |fizz|')
+        self.assertSearchCurrent('fizz |fizz| fizz |fizz| |fizz| fizz')
+
+    def test_current_occurrences_in_reverse_order(self):
+        self.normal('fizz |fizz fizz f|izz fizz fizz')
+        add_search_highlighting(self.view, list(reversed(self.view.find_all('fizz'))))
+        self.assertSearchCurrent('fizz |fizz| fizz |fizz| fizz fizz')
+
+    def test_cached_occurrences_are_not_sorted_again(self):
+        self.normal('fizz |fizz fizz')
+        occurrences = find_search_occurrences(self.view, 'fizz', 0)
+        self.assertIs(occurrences, find_search_occurrences(self.view, 'fizz', 0))
+        with unittest.mock.patch('NeoVintageous.nv.search.sorted', create=True, wraps=sorted) as sorted_:
+            add_search_highlighting(self.view, occurrences)
+            self.assertEqual([], [c for c in sorted_.call_args_list if c[0][0] is occurrences])
+
+        self.assertSearch('|fizz| |fizz| |fizz|')
+        self.assertSearchCurrent('fizz |fizz| fizz')
+
+    def test_current_occurrences_must_contain_the_selection(self):
+        self.visual('fi|zz fi|zz fizz')
+        add_search_highlighting(self.view, self.view.find_all('fizz'))
+        self.assertSearchCurrent('fizz fizz fizz')
+        self.visual('fizz |fiz|z fizz')
+        add_search_highlighting(self.view, self.view.find_all('fizz'))
+        self.assertSearchCurrent('fizz |fizz| fizz')
+
+
+class TestSearchHighlightingUpdates(unittest.ViewTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.set_option('hlsearch', True)
+        self.callbacks = []
+        self.delays = []
+        patcher = unittest.mock.patch('NeoVintageous.nv.search.set_timeout', side_effect=self.schedule)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def schedule(self, callback, delay=0):
+        self.callbacks.append(callback)
+        self.delays.append(delay)
+
+    def run_callbacks(self):
+        callbacks = self.callbacks[:]
+        self.callbacks.clear()
+        for callback in callbacks:
+            callback()
+
+    def assertRegionsAdded(self, expected: list, add_regions) -> None:
+        self.assertEqual(expected, [c[0][0] for c in add_regions.call_args_list])
+
+    def test_unchanged_regions_are_not_added_again(self):
+        self.normal('|fizz fizz fizz')
+        add_search_highlighting(self.view, self.view.find_all('fizz'))
+        with unittest.mock.patch.object(self.view, 'add_regions', wraps=self.view.add_regions) as add_regions:
+            add_search_highlighting(self.view, self.view.find_all('fizz'))
+            self.assertMockNotCalled(add_regions)
+
+        self.assertSearch('|fizz| |fizz| |fizz|')
+        self.assertSearchCurrent('|fizz| fizz fizz')
+
+    def test_only_the_current_occurrence_is_updated_when_the_selection_moves(self):
+        self.normal('|fizz fizz fizz')
+        add_search_highlighting(self.view, self.view.find_all('fizz'))
+        self.select(5)
+        with unittest.mock.patch.object(self.view, 'add_regions', wraps=self.view.add_regions) as add_regions:
+            add_search_highlighting(self.view, self.view.find_all('fizz'))
+            self.assertRegionsAdded(['_nv_search_cur'], add_regions)
+
+        self.assertSearch('|fizz| |fizz| |fizz|')
+        self.assertSearchCurrent('fizz |fizz| fizz')
+
+    def test_regions_are_added_again_after_modifications(self):
+        self.normal('|fizz fizz fizz')
+        add_search_highlighting(self.view, self.view.find_all('fizz'))
+        self.view.run_command('insert', {'characters': 'x'})
+        self.select(1)
+        with unittest.mock.patch.object(self.view, 'add_regions', wraps=self.view.add_regions) as add_regions:
+            add_search_highlighting(self.view, self.view.find_all('fizz'))
+            self.assertRegionsAdded(['_nv_search_occ', '_nv_search_cur'], add_regions)
+
+    def test_cleared_regions_are_added_again(self):
+        self.normal('|fizz fizz fizz')
+        add_search_highlighting(self.view, self.view.find_all('fizz'))
+        clear_search_highlighting(self.view)
+        add_search_highlighting(self.view, self.view.find_all('fizz'))
+        self.assertSearch('|fizz| |fizz| |fizz|')
+        self.assertSearchCurrent('|fizz| fizz fizz')
+
+    def test_above_the_maximum_only_occurrences_around_the_visible_region_are_highlighted(self):
+        self.set_setting('hlsearch_max_regions', 10)
+        self.normal('|' + 'fizz\n' * 20)
+        self.view.set_viewport_extent((1000, 32))
+        add_search_highlighting(self.view, self.view.find_all('fizz'))
+        self.assertSearch('|fizz|\n|fizz|\n|fizz|\n|fizz|\n' + 'fizz\n' * 16)
+        self.assertSearchCurrent('|fizz|\n' + 'fizz\n' * 19)
+        self.assertEqual(20, len(get_search_occurrences(self.view)))
+
+    def test_occurrences_around_the_visible_region_are_refreshed_on_scroll(self):
+        self.set_setting('hlsearch_max_regions', 10)
+        self.normal('|' + 'fizz\n' * 20)
+        self.view.set_viewport_extent((1000, 32))
+        add_search_highlighting(self.view, self.view.find_all('fizz'))
+        self.view.set_viewport_position((0, 160))
+        self.run_callbacks()
+        self.assertSearch('fizz\n' * 8 + '|fizz|\n' * 6 + 'fizz\n' * 6)
+        self.assertEqual(1, len(self.callbacks))
+
+    def test_refreshing_slows_down_when_the_visible_region_is_unchanged(self):
+        self.set_setting('hlsearch_max_regions', 10)
+        self.normal('|' + 'fizz\n' * 20)
+        self.view.set_viewport_extent((1000, 32))
+        add_search_highlighting(self.view, self.view.find_all('fizz'))
+        self.assertEqual([200], self.delays)
+        with unittest.mock.patch.object(self.view, 'add_regions', wraps=self.view.add_regions) as add_regions:
+            self.run_callbacks()
+            self.run_callbacks()
+            self.assertMockNotCalled(add_regions)
+
+        self.assertEqual([200, 1000, 1000], self.delays)
+
+    def test_occurrences_are_refreshed_on_scroll_after_being_idle(self):
+        self.set_setting('hlsearch_max_regions', 10)
+        self.normal('|' + 'fizz\n' * 20)
+        self.view.set_viewport_extent((1000, 32))
+        add_search_highlighting(self.view, self.view.find_all('fizz'))
+        self.run_callbacks()
+        self.run_callbacks()
+        self.view.set_viewport_position((0, 160))
+        self.run_callbacks()
+        self.assertSearch('fizz\n' * 8 + '|fizz|\n' * 6 + 'fizz\n' * 6)
+        self.assertEqual([200, 1000, 1000, 200], self.delays)
+
+    def test_occurrences_are_refreshed_after_text_commands(self):
+        self.set_setting('hlsearch_max_regions', 10)
+        self.normal('|' + 'fizz\n' * 20)
+        self.view.set_viewport_extent((1000, 32))
+        add_search_highlighting(self.view, self.view.find_all('fizz'))
+        self.view.set_viewport_position((0, 160))
+        search_on_post_text_command(self.view)
+        self.assertSearch('fizz\n' * 8 + '|fizz|\n' * 6 + 'fizz\n' * 6)
+        self.assertEqual(1, len(self.callbacks))
+
+    def test_refreshing_stops_after_modifications(self):
+        self.set_setting('hlsearch_max_regions', 10)
+        self.normal('|' + 'fizz\n' * 20)
+        self.view.set_viewport_extent((1000, 32))
+        add_search_highlighting(self.view, self.view.find_all('fizz'))
+        self.view.run_command('insert', {'characters': 'x'})
+        self.run_callbacks()
+        self.assertEqual([], self.callbacks)
+
+    def test_refreshing_stops_after_clearing(self):
+        self.set_setting('hlsearch_max_regions', 10)
+        self.normal('|' + 'fizz\n' * 20)
+        self.view.set_viewport_extent((1000, 32))
+        add_search_highlighting(self.view, self.view.find_all('fizz'))
+        clear_search_highlighting(self.view)
+        self.run_callbacks()
+        self.assertEqual([], self.callbacks)
+        self.assertEqual([], get_search_occurrences(self.view))
+
+
+class TestSearchCount(unittest.ViewTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.set_setting('search_count_max', 999)
+        self.callbacks = []
+        patcher = unittest.mock.patch('NeoVintageous.nv.search.set_timeout_async', side_effect=self.callbacks.append)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_callbacks(self):
+        while self.callbacks:
+            self.callbacks.pop(0)()
+
+    @unittest.mock_status_message()
+    def test_count_is_a_bisect_of_cached_occurrences(self):
+        self.normal('fizz buzz fizz buzz |fizz buzz fizz')
+        find_search_occurrences(self.view, 'fizz', 0)
+        with unittest.mock.patch.object(self.view, 'find_all') as find_all:
+            with unittest.mock.patch.object(self.view, 'find') as find:
+                show_search_count(self.view, 'fizz', 0)
+                self.assertMockNotCalled(find_all)
+                self.assertMockNotCalled(find)
+
+        self.assertEqual([], self.callbacks)
+        self.assertStatusMessage('[3/4]')
+
+    @unittest.mock_status_message()
+    def test_count_before_first_occurrence(self):
+        self.normal('|x fizz fizz')
+        find_search_occurrences(self.view, 'fizz', 0)
+        show_search_count(self.view, 'fizz', 0)
+        self.assertStatusMessage('[0/2]')
+
+    @unittest.mock_status_message()
+    def test_count_is_capped(self):
+        self.set_setting('search_count_max', 3)
+        self.normal('x x |x x x x')
+        find_search_occurrences(self.view, 'x', 0)
+        show_search_count(self.view, 'x', 0)
+        self.assertStatusMessage('[3/>3]')
+        self.normal('x x x x |x x')
+        find_search_occurrences(self.view, 'x', 0)
+        show_search_count(self.view, 'x', 0)
+        self.assertStatusMessage('[>3/>3]', count=1)
+
+    @unittest.mock_status_message()
+    def test_uncached_occurrences_are_counted_in_the_background(self):
+        self.set_setting('search_count_max', 3)
+        self.normal('x |x x x x x')
+        show_search_count(self.view, 'x', 0)
+        self.assertNoStatusMessage()
+        with unittest.mock.patch.object(self.view, 'find', wraps=self.view.find) as find:
+            self.run_callbacks()
+            self.assertEqual(4, find.call_count)
+
+        self.assertStatusMessage('[2/>3]')
+
+    @unittest.mock_status_message()
+    def test_background_count_is_cancelled_by_another_count(self):
+        self.normal('x |x x')
+        show_search_count(self.view, 'x', 0)
+        find_search_occurrences(self.view, 'x', 0)
+        show_search_count(self.view, 'x', 0)
+        self.assertStatusMessage('[2/3]')
+        self.run_callbacks()
+        self.assertStatusMessageCount(1)
+
+    @unittest.mock_status_message()
+    def test_disabled(self):
+        self.set_setting('search_count_max', 0)
+        self.normal('|x x x')
+        find_search_occurrences(self.view, 'x', 0)
+        show_search_count(self.view, 'x', 0)
+        self.run_callbacks()
+        self.assertNoStatusMessage()
@@ -0,0 +1,82 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from NeoVintageous.tests import unittest
+
+from NeoVintageous.nv.session import ViewState
+from NeoVintageous.nv.session import get_session_view_value
+from NeoVintageous.nv.session import get_view_state
+from NeoVintageous.nv.session import session_on_close
+from NeoVintageous.nv.session import set_session_view_value
+
+
+class TestViewState(unittest.ViewTestCase):
+
+    def test_defaults(self):
+        state = ViewState()
+        self.assertEqual(state.mode, unittest.UNKNOWN)
+        self.assertEqual(state.sequence, '')
+        self.assertEqual(state.partial_sequence, '')
+        self.assertEqual(state.action_count, '')
+        self.assertEqual(state.motion_count, '')
+        self.assertEqual(state.register, '"')
+        self.assertEqual(state.xpos, 0)
+        self.assertEqual(state.normal_insert_count, 1)
+        self.assertIsNone(state.action)
+        self.assertIsNone(state.motion)
+        self.assertIsNone(state.repeat_data)
+        self.assertTrue(state.interactive)
+        self.assertFalse(state.glue_until_normal_mode)
+        self.assertFalse(state.must_capture_register_name)
+        self.assertFalse(state.processing_notation)
+
+    def test_slots(self):
+        with self.assertRaises(AttributeError):
+            ViewState().foobar = 1
+
+    def test_reset_command(self):
+        state = ViewState()
+        state.mode = unittest.VISUAL
+        state.sequence = '"a2d'
+        state.partial_sequence = 'd'
+        state.action_count = '2'
+        state.motion_count = '3'
+        state.register = 'a'
+        state.must_capture_register_name = True
+        state.xpos = 4
+        state.reset_command()
+        self.assertEqual(state.mode, unittest.VISUAL)
+        self.assertEqual(state.sequence, '')
+        self.assertEqual(state.partial_sequence, '')
+        self.assertEqual(state.action_count, '')
+        self.assertEqual(state.motion_count, '')
+        self.assertEqual(state.register, '"')
+        self.assertFalse(state.must_capture_register_name)
+        self.assertEqual(state.xpos, 4)
+
+    def test_get_view_state_is_per_view(self):
+        state = get_view_state(self.view)
+        self.assertIs(get_view_state(self.view), state)
+        set_session_view_value(self.view, 'xpos', 7)
+        self.assertEqual(state.xpos, 7)
+        self.assertEqual(get_session_view_value(self.view, 'xpos'), 7)
+        self.assertEqual(get_session_view_value(self.view, 'foobar', 'x'), 'x')
+
+    def test_freed_on_close(self):
+        state = get_view_state(self.view)
+        session_on_close(self.view)
+        self.assertIsNot(get_view_state(self.view), state)
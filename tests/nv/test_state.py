@@ -113,6 +113,38 @@ class TestState(unittest.ViewTestCase):
         self.assertTrue(_must_scroll_into_view(get_motion(self.view), get_action(self.view)))
 
 
+class TestStateDefinitions(unittest.ViewTestCase):
+
+    def test_get_returns_live_instance(self):
+        motion = cmd_defs.ViGotoSymbolInFile()
+        set_motion(self.view, motion)
+        self.assertIs(get_motion(self.view), motion)
+        self.assertIs(get_motion(self.view), get_motion(self.view))
+        action = cmd_defs.ViDeleteByChars()
+        set_action(self.view, action)
+        self.assertIs(get_action(self.view), action)
+
+    def test_definitions_that_accept_input_are_copied(self):
+        action = cmd_defs.ViReplaceCharacters()
+        set_action(self.view, action)
+        stored = get_action(self.view)
+        self.assertIsNot(stored, action)
+        self.assertIsInstance(stored, cmd_defs.ViReplaceCharacters)
+        stored.accept('x')
+        set_action(self.view, stored)
+        self.assertIs(get_action(self.view), stored)
+        self.assertEqual(get_action(self.view).inp, 'x')
+        self.assertEqual(action.inp, '')
+
+    def test_can_unset(self):
+        set_action(self.view, cmd_defs.ViDeleteByChars())
+        set_motion(self.view, cmd_defs.ViGotoSymbolInFile())
+        set_action(self.view, None)
+        set_motion(self.view, None)
+        self.assertIsNone(get_action(self.view))
+        self.assertIsNone(get_motion(self.view))
+
+
 class TestStateResettingState(unittest.ViewTestCase):
 
     def test_reset_command_data(self):
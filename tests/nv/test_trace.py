@@ -0,0 +1,88 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import tempfile
+
+from NeoVintageous.tests import unittest
+
+from NeoVintageous.nv.trace import TRACE_KEY
+from NeoVintageous.nv.trace import buffer_hash
+from NeoVintageous.nv.trace import is_tracing
+from NeoVintageous.nv.trace import load_trace
+from NeoVintageous.nv.trace import trace_enter
+from NeoVintageous.nv.trace import trace_exit
+from NeoVintageous.nv.trace import trace_start
+from NeoVintageous.nv.trace import trace_stop
+from NeoVintageous.nv.trace import trace_text_command
+from NeoVintageous.tests.benchmarks.replay import replay_trace
+
+
+class TestTrace(unittest.FunctionalTestCase):
+
+    def setUp(self):
+        super().setUp()
+        fd, self.file_name = tempfile.mkstemp(suffix='.jsonl')
+        os.close(fd)
+
+    def tearDown(self):
+        if is_tracing():
+            trace_stop(self.file_name)
+
+        os.remove(self.file_name)
+        super().tearDown()
+
+    def test_record_and_replay(self):
+        self.normal('fi|zz buzz\nfizz buzz\n')
+        trace_start(self.view)
+        self.assertTrue(is_tracing())
+        self.view.window().run_command('nv_feed_key', {'key': 'w'})
+        self.view.window().run_command('nv_feed_key', {'key': 'x'})
+        self.view.window().run_command('nv_process_notation', {'keys': 'jdwiabc<Esc>'})
+        # The key that opens the command-line to run :NVTrace stop is dropped.
+        trace_enter(self.view.window(), TRACE_KEY, ':', None, True)
+        trace_exit()
+        self.assertEqual(trace_stop(self.file_name), 3)
+        self.assertFalse(is_tracing())
+
+        trace = load_trace(self.file_name)
+        self.assertEqual(trace['header']['text'], 'fizz buzz\nfizz buzz\n')
+        self.assertEqual(trace['header']['sel'], [[2, 2]])
+        self.assertEqual(trace['header']['mode'], unittest.NORMAL)
+        self.assertEqual([e[0] for e in trace['events']], ['k', 'k', 'n'])
+        self.assertEqual(trace['events'][0][2:], [unittest.NORMAL, 'w', None, True])
+        self.assertEqual(trace['events'][2][2:], [unittest.NORMAL, 'jdwiabc<Esc>', None, True])
+        self.assertEqual(trace['footer'], {'hash': buffer_hash(self.view), 'size': self.view.size()})
+
+        results = replay_trace(trace, self.view.window())
+        self.assertEqual(results['hash'], trace['footer']['hash'])
+        self.assertEqual(results['events'], 3)
+
+    def test_text_commands(self):
+        self.insert('fizz|')
+        trace_start(self.view)
+        trace_text_command(self.view, 'insert', {'characters': 'a'})
+        trace_text_command(self.view, 'drag_select', {})
+        other_view = self.view.window().new_file()
+        other_view.set_scratch(True)
+        trace_text_command(other_view, 'insert', {'characters': 'b'})
+        other_view.close()
+        trace_stop(self.file_name)
+
+        events = load_trace(self.file_name)['events']
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0][2:], [unittest.INSERT, 'insert', {'characters': 'a'}])
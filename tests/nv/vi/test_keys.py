@@ -180,3 +180,20 @@ class TestFunctions(unittest.TestCase):
         self.assertEquals('daw', to_bare_command_name('d2aw'))
         self.assertEquals('daw', to_bare_command_name('daw'))
         self.assertEquals('dd', to_bare_command_name('d2d'))
+
+    def test_to_bare_command_name_expands_current_leader(self):
+        with mock.patch.dict('NeoVintageous.nv.variables._variables', {'mapleader': ','}, clear=True):
+            self.assertEqual(',d', to_bare_command_name('2<leader>d'))
+            self.assertEqual(['<C-w>', ','], list(tokenize_keys('<C-w><leader>')))
+
+        with mock.patch.dict('NeoVintageous.nv.variables._variables', {'mapleader': '<space>'}, clear=True):
+            self.assertEqual('<space>d', to_bare_command_name('2<leader>d'))
+            self.assertEqual(['<C-w>', '<space>'], list(tokenize_keys('<C-w><leader>')))
+
+    def test_tokenize_keys_matches_tokenizer(self):
+        for source in ('', 'pp', '<C-w><Bar>', '<leader>d', '<lt><lt>', '<c-m-s-a>', '<DoWn>abc.', '>-<C-->'):
+            self.assertEqual(list(KeySequenceTokenizer(source)._iter_tokenize()), list(tokenize_keys(source)))
+
+        for source in ('<', 'x<C-', '<foobar>', '<c-c-x>', '<a>'):
+            with self.assertRaises(ValueError):
+                tokenize_keys(source)
@@ -17,6 +17,7 @@
 
 from NeoVintageous.tests import unittest
 
+from NeoVintageous.nv.search import find_search_occurrences
 from NeoVintageous.nv.vi.search import find_wrapping
 
 
@@ -40,3 +41,25 @@ class Test_find_wrapping(unittest.ViewTestCase):
         self.write('xxx\naaa aaa xxx aaa')
         self.select(4)
         self.assertEqual(self.Region(12, 15), find_wrapping(self.view, 'xxx', 4, self.view.size()))
+
+    @unittest.mock.patch('NeoVintageous.nv.vi.search.find_in_range')
+    def test_can_find_next_cached_occurrence(self, find_in_range):
+        self.write('xxx\naaa aaa xxx aaa')
+        self.select(4)
+        find_search_occurrences(self.view, 'xxx', 0)
+        self.assertEqual(self.Region(12, 15), find_wrapping(self.view, 'xxx', 4, self.view.size()))
+        self.assertEqual(self.Region(0, 3), find_wrapping(self.view, 'xxx', 4, self.view.size(), times=2))
+        self.assertMockNotCalled(find_in_range)
+
+    def test_ignores_cached_occurrences_when_buffer_is_modified(self):
+        self.write('xxx\naaa aaa xxx aaa')
+        self.select(4)
+        find_search_occurrences(self.view, 'xxx', 0)
+        self.view.run_command('insert', {'characters': 'xxx '})
+        self.assertEqual(self.Region(16, 19), find_wrapping(self.view, 'xxx', 8, self.view.size()))
+
+    def test_searches_buffer_when_cached_occurrence_spans_start(self):
+        self.write('aaaa')
+        self.select(0)
+        find_search_occurrences(self.view, 'aa', 0)
+        self.assertEqual(self.Region(1, 3), find_wrapping(self.view, 'aa', 1, self.view.size()))
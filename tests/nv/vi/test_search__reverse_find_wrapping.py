@@ -17,6 +17,7 @@
 
 from NeoVintageous.tests import unittest
 
+from NeoVintageous.nv.search import find_search_occurrences
 from NeoVintageous.nv.vi.search import reverse_find_wrapping
 
 
@@ -28,3 +29,11 @@ class Test_reverse_find_wrapping(unittest.ViewTestCase):
         self.assertIsNone(reverse_find_wrapping(self.view, 'foo', 15, self.view.size()))
         self.assertEqual(reverse_find_wrapping(self.view, 'buzz', 10, self.view.size()), self.Region(5, 9))
         self.assertEqual(reverse_find_wrapping(self.view, 'zz', 10, self.view.size()), self.Region(7, 9))
+
+    @unittest.mock.patch('NeoVintageous.nv.vi.search.reverse_search')
+    def test_reverse_find_wrapping_cached_occurrences(self, reverse_search):
+        self.normal('fizz buzz | one buzz\nthree buzz')
+        find_search_occurrences(self.view, 'buzz', 0)
+        self.assertEqual(reverse_find_wrapping(self.view, 'buzz', 0, 10), self.Region(5, 9))
+        self.assertEqual(reverse_find_wrapping(self.view, 'buzz', 0, 10, times=2), self.Region(26, 30))
+        self.assertMockNotCalled(reverse_search)
@@ -0,0 +1,192 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+import unittest
+
+from NeoVintageous.tests.headless import sublime
+from NeoVintageous.tests.headless import sublime_plugin
+
+
+def _view(text: str):
+    view = sublime.Window().new_file()
+    view.run_command('insert', {'characters': text})
+    view.sel().clear()
+    view.sel().add(0)
+
+    return view
+
+
+class TestRegion(unittest.TestCase):
+
+    def test_region(self):
+        self.assertEqual(sublime.Region(3, 1).begin(), 1)
+        self.assertEqual(sublime.Region(3, 1).end(), 3)
+        self.assertEqual(sublime.Region(3, 1).size(), 2)
+        self.assertEqual(sublime.Region(2), sublime.Region(2, 2))
+        self.assertTrue(sublime.Region(1, 3).contains(3))
+        self.assertTrue(sublime.Region(1, 3).intersects(sublime.Region(2, 5)))
+        self.assertFalse(sublime.Region(1, 3).intersects(sublime.Region(3, 5)))
+        self.assertEqual(sublime.Region(1, 3).intersection(sublime.Region(2, 5)), sublime.Region(2, 3))
+        self.assertEqual(sublime.Region(1, 3).cover(sublime.Region(2, 5)), sublime.Region(1, 5))
+        self.assertEqual(sorted([sublime.Region(5, 4), sublime.Region(1)]), [sublime.Region(1), sublime.Region(5, 4)])
+
+
+class TestSelection(unittest.TestCase):
+
+    def test_regions_are_sorted_and_merged(self):
+        sel = sublime.Selection()
+        sel.add(sublime.Region(5, 8))
+        sel.add(sublime.Region(1))
+        sel.add(sublime.Region(6))
+        sel.add(sublime.Region(7, 10))
+        sel.add(sublime.Region(1))
+        self.assertEqual(list(sel), [sublime.Region(1), sublime.Region(5, 10)])
+
+    def test_returns_copies(self):
+        sel = sublime.Selection()
+        sel.add(sublime.Region(1, 2))
+        sel[0].a = 0
+        for region in sel:
+            region.b = 0
+
+        self.assertEqual(list(sel), [sublime.Region(1, 2)])
+
+
+class TestSettings(unittest.TestCase):
+
+    def test_settings(self):
+        calls = []
+        settings = sublime.Settings(parent=sublime.Settings())
+        settings._parent.set('a', 'parent')
+        settings.add_on_change('x', lambda: calls.append(1))
+        self.assertEqual(settings.get('a'), 'parent')
+        settings.set('a', 'child')
+        self.assertEqual(settings.get('a'), 'child')
+        settings.erase('a')
+        self.assertEqual(settings.get('a'), 'parent')
+        self.assertEqual(settings.get('b', 'default'), 'default')
+        settings.clear_on_change('x')
+        settings.set('a', 'child')
+        self.assertEqual(calls, [1, 1])
+
+
+class TestView(unittest.TestCase):
+
+    def setUp(self):
+        self.view = _view('ab\n\ncde\nf')
+
+    def test_rowcol_and_text_point(self):
+        for pt, rowcol in enumerate([(0, 0), (0, 1), (0, 2), (1, 0), (2, 0), (2, 1), (2, 2), (2, 3), (3, 0), (3, 1)]):
+            self.assertEqual(self.view.rowcol(pt), rowcol)
+            self.assertEqual(self.view.text_point(*rowcol), pt)
+
+        self.assertEqual(self.view.rowcol(100), (3, 1))
+        self.assertEqual(self.view.text_point(100, 0), 9)
+
+    def test_lines(self):
+        self.assertEqual(self.view.line(1), sublime.Region(0, 2))
+        self.assertEqual(self.view.line(3), sublime.Region(3, 3))
+        self.assertEqual(self.view.line(10), sublime.Region(8, 9))
+        self.assertEqual(self.view.full_line(1), sublime.Region(0, 3))
+        self.assertEqual(self.view.full_line(9), sublime.Region(8, 9))
+        self.assertEqual(self.view.line(sublime.Region(1, 5)), sublime.Region(0, 7))
+        self.assertEqual(self.view.lines(sublime.Region(1, 5)), [
+            sublime.Region(0, 2), sublime.Region(3, 3), sublime.Region(4, 7)])
+        self.assertEqual(self.view.split_by_newlines(sublime.Region(1, 5)), [
+            sublime.Region(1, 2), sublime.Region(4, 5)])
+
+    def test_find(self):
+        self.assertEqual(self.view.find('c', 0), sublime.Region(4, 5))
+        self.assertEqual(self.view.find('C', 0, sublime.IGNORECASE), sublime.Region(4, 5))
+        self.assertEqual(self.view.find('.', 0, sublime.LITERAL), sublime.Region(-1, -1))
+        self.assertEqual(self.view.find('^$', 0), sublime.Region(3, 3))
+        extractions = []
+        self.assertEqual(self.view.find_all(r'\w+', 0, '<\\0>', extractions), [
+            sublime.Region(0, 2), sublime.Region(4, 7), sublime.Region(8, 9)])
+        self.assertEqual(extractions, ['<ab>', '<cde>', '<f>'])
+
+    def test_classes(self):
+        view = _view('fizz.buzz  x\n\ny')
+        self.assertEqual(view.find_by_class(0, True, sublime.CLASS_WORD_START), 5)
+        self.assertEqual(view.find_by_class(0, True, sublime.CLASS_PUNCTUATION_START), 4)
+        self.assertEqual(view.find_by_class(11, True, sublime.CLASS_EMPTY_LINE), 13)
+        self.assertEqual(view.find_by_class(11, False, sublime.CLASS_WORD_END), 9)
+        self.assertEqual(view.find_by_class(5, False, sublime.CLASS_LINE_START), 0)
+        self.assertEqual(view.word(6), sublime.Region(5, 9))
+        self.assertEqual(view.expand_by_class(6, sublime.CLASS_WORD_START | sublime.CLASS_WORD_END), sublime.Region(5, 9))  # noqa: E501
+
+    def test_edits_update_the_line_index_and_regions(self):
+        self.view.sel().clear()
+        self.view.sel().add(sublime.Region(8, 9))
+        self.view.add_regions('test', [sublime.Region(4, 7)])
+        self.view.replace(sublime.Edit(), sublime.Region(0, 3), 'x\ny\nz\n')
+        self.assertEqual(self.view.substr(sublime.Region(0, self.view.size())), 'x\ny\nz\n\ncde\nf')
+        self.assertEqual(self.view.rowcol(11), (5, 0))
+        self.assertEqual(list(self.view.sel()), [sublime.Region(11, 12)])
+        self.assertEqual(self.view.get_regions('test'), [sublime.Region(7, 10)])
+        self.view.erase(sublime.Edit(), sublime.Region(0, 8))
+        self.assertEqual(self.view.substr(sublime.Region(0, self.view.size())), 'de\nf')
+        self.assertEqual(self.view.get_regions('test'), [sublime.Region(0, 2)])
+        self.assertEqual(self.view.change_count(), 3)
+
+    def test_builtin_commands(self):
+        view = _view('ab')
+        view.sel().clear()
+        view.sel().add(1)
+        view.sel().add(2)
+        view.run_command('insert', {'characters': 'x'})
+        self.assertEqual(view.substr(sublime.Region(0, view.size())), 'axbx')
+        self.assertEqual(list(view.sel()), [sublime.Region(2), sublime.Region(4)])
+        view.run_command('left_delete')
+        self.assertEqual(view.substr(sublime.Region(0, view.size())), 'ab')
+        view.run_command('headless_unknown_command')
+        self.assertIn('headless_unknown_command', sublime_plugin.unhandled_commands)
+
+    def test_visible_region(self):
+        view = _view('x\n' * 100)
+        view.set_viewport_extent((100.0, 10 * view.line_height()))
+        self.assertEqual(view.visible_region(), sublime.Region(0, 19))
+        view.show(view.text_point(50, 0))
+        self.assertEqual(view.rowcol(view.visible_region().end()), (50, 1))
+        view.show_at_center(view.text_point(20, 0))
+        self.assertEqual(view.rowcol(view.visible_region().begin()), (15, 0))
+
+
+class headless_test_insert(sublime_plugin.TextCommand):
+
+    def run(self, edit, characters):
+        self.view.insert(edit, 0, characters)
+
+
+class TestCommands(unittest.TestCase):
+
+    def test_command_name(self):
+        self.assertEqual(sublime_plugin._command_name(type('FooBarCommand', (), {})), 'foo_bar')
+        self.assertEqual(sublime_plugin._command_name(type('nv_vi_w', (), {})), 'nv_vi_w')
+
+    def test_run_command(self):
+        window = sublime.Window()
+        view = window.new_file()
+        window.run_command('headless_test_insert', {'characters': 'fizz'})
+        self.assertEqual(view.substr(sublime.Region(0, view.size())), 'fizz')
+
+    def test_set_timeout(self):
+        calls = []
+        sublime.set_timeout(lambda: sublime.set_timeout_async(lambda: calls.append(2)))
+        sublime.set_timeout(lambda: calls.append(1))
+        self.assertEqual(sublime.run_timeouts(), 3)
+        self.assertEqual(calls, [1, 2])
@@ -1216,14 +1216,17 @@ def mock_mappings(*mappings):
     """
     def wrapper(f):
 
+        from NeoVintageous.nv.mappings import _MappingTrie
         from NeoVintageous.nv.mappings import _mappings
+        from NeoVintageous.nv.mappings import _tries
         from NeoVintageous.nv.mappings import mappings_add
 
         @unittest.mock.patch.dict('NeoVintageous.nv.mappings._mappings', {k: {} for k in _mappings}, clear=True)
         def wrapped(self, *args, **kwargs):
-            for mapping in mappings:
-                mappings_add(*mapping)
-            return f(self, *args[:-1], **kwargs)
+            with unittest.mock.patch.dict(_tries, {k: _MappingTrie() for k in _tries}, clear=True):
+                for mapping in mappings:
+                    mappings_add(*mapping)
+                return f(self, *args[:-1], **kwargs)
         return wrapped
     return wrapper
 
@@ -1424,6 +1427,9 @@ _SEQ2CMD = {
     '/abc\\C':      {'command': 'nv_vi_slash_impl', 'args': {'pattern': 'abc\\C'}},  # noqa: E241
     '/abc\\c':      {'command': 'nv_vi_slash_impl', 'args': {'pattern': 'abc\\c'}},  # noqa: E241
     '/x':           {'command': 'nv_vi_slash_impl', 'args': {'pattern': 'x'}},  # noqa: E241
+    '/\\<fizz\\>':   {'command': 'nv_vi_slash_impl', 'args': {'pattern': '\\<fizz\\>'}},  # noqa: E241
+    '/\\va{3}':      {'command': 'nv_vi_slash_impl', 'args': {'pattern': '\\va{3}'}},  # noqa: E241
+    '/fizz\\zsbuzz': {'command': 'nv_vi_slash_impl', 'args': {'pattern': 'fizz\\zsbuzz'}},  # noqa: E241
     '0':            {'command': 'nv_feed_key'},  # noqa: E241
     ';':            {'command': 'nv_feed_key'},  # noqa: E241
     '<':            {'command': 'nv_feed_key'},  # noqa: E241